@@ -0,0 +1,54 @@
+"""Benchmark: modo batch (run_batch) com blocos grandes e linhas que estouram o tempo.
+
+Antes de medir, confere que o tempo limite vale por linha: um bloco com várias
+linhas lentas, mas cada uma dentro do limite, sai inteiro, e só as linhas que
+estouram (9**9**9) saem como "Erro", sem atrasar nem refazer as outras.
+
+Uso: python Calculadora/benchmarks/bench_batch.py [linhas]
+"""
+
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+from core import evaluate, run_batch  # noqa: E402
+from worker import EVAL_TIMEOUT  # noqa: E402
+
+SLOW = "7**(10**6)//7**(10**6-1)"  # Cerca de meio segundo: cinco delas somam mais que EVAL_TIMEOUT
+HANG = "9**9**9"  # Não termina: estoura o tempo
+
+
+def batch(lines, workers=1):
+	output = io.StringIO()
+	inicio = time.perf_counter()
+	run_batch((line + "\n" for line in lines), output, workers)
+	return output.getvalue().splitlines(), time.perf_counter() - inicio
+
+
+def check_timeouts():
+	"""Linhas lentas no mesmo bloco não dividem um só tempo limite; só a que estoura vira "Erro"."""
+	inicio = time.perf_counter()
+	evaluate(SLOW)
+	slow = time.perf_counter() - inicio
+	lines = ["1+1"] + [SLOW] * 5 + [HANG, "2+2", HANG]
+	results, seconds = batch(lines)
+	assert results == ["2"] + ["7"] * 5 + ["Erro", "4", "Erro"], results
+	expected = 5 * slow + 2 * EVAL_TIMEOUT  # Um bloco refeito depois de estourar o tempo somaria mais EVAL_TIMEOUT
+	assert seconds < expected + EVAL_TIMEOUT / 2, f"{seconds:.2f} s, esperado cerca de {expected:.2f} s"
+	return seconds
+
+
+def main(linhas=200_000):
+	seconds = check_timeouts()
+	print(f"bloco com 5 linhas lentas e 2 que estouram: {seconds:.2f} s (limite de {EVAL_TIMEOUT:g} s por linha)")
+	lines = [f"{numero}*2+1" for numero in range(linhas)]
+	results, seconds = batch(lines)
+	assert results == [str(numero * 2 + 1) for numero in range(linhas)]
+	print(f"{linhas:,} linhas: {seconds:.2f} s ({linhas / seconds:,.0f} linhas/s)")
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
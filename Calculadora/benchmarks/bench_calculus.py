@@ -0,0 +1,98 @@
+"""Benchmark: cálculo numérico vetorizado (calculus) contra um laço escalar ingênuo.
+
+O laço escalar usa os mesmos algoritmos (Gauss–Kronrod adaptativo, diferença
+central com Richardson, Newton protegido por bisseção), mas chama a expressão
+compilada pelo motor um ponto por vez, como um laço sobre eval faria.
+
+Uso: python Calculadora/benchmarks/bench_calculus.py [quantidade]
+"""
+
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+import numpy as np  # noqa: E402
+
+import calculus  # noqa: E402
+from engine import compile_expression  # noqa: E402
+
+NODES = calculus._NODES.tolist()
+WEIGHTS_K = calculus._WEIGHTS_K.tolist()
+WEIGHTS_G = calculus._WEIGHTS_G.tolist()
+
+
+def scalar_integrate(f, a, b, tolerance, scale=None, span=None):
+	center, half = (a + b) / 2, (b - a) / 2
+	ys = [f(x=center + half * node) for node in NODES]
+	kronrod = half * sum(w * y for w, y in zip(WEIGHTS_K, ys))
+	error = abs(kronrod - half * sum(w * y for w, y in zip(WEIGHTS_G, ys)))
+	if scale is None:
+		scale, span = max(abs(kronrod), 1.0), abs(b - a)
+	if error <= tolerance * scale * abs(b - a) / span or abs(b - a) < 1e-12 * span:
+		return kronrod
+	return scalar_integrate(f, a, center, tolerance, scale, span) + scalar_integrate(f, center, b, tolerance, scale, span)
+
+
+def scalar_derivative(f, x):
+	h = 1e-3 * max(abs(x), 1.0)
+	coarse = (f(x=x + h) - f(x=x - h)) / (2 * h)
+	fine = (f(x=x + h / 2) - f(x=x - h / 2)) / h
+	return (4 * fine - coarse) / 3
+
+
+def scalar_root(f, low, high, tolerance):
+	f_low = f(x=low)
+	x = (low + high) / 2
+	for _ in range(calculus.MAX_ITERATIONS):
+		h = 1e-7 * max(abs(x), 1.0)
+		fx = f(x=x)
+		slope = (f(x=x + h) - f(x=x - h)) / (2 * h)
+		if (fx > 0) == (f_low > 0):
+			low, f_low = x, fx
+		else:
+			high = x
+		step = x - fx / slope if slope else math.inf
+		if fx == 0 or abs(step - x) <= tolerance * max(abs(x), 1.0):
+			return step if low < step < high else x
+		x = step if low < step < high else (low + high) / 2
+	return math.nan
+
+
+def timed(function, *args):
+	inicio = time.perf_counter()
+	result = function(*args)
+	return time.perf_counter() - inicio, result
+
+
+def report(name, vector, scalar):
+	print(f"{name:28}: vetorizado {vector * 1000:8.1f} ms, laço escalar {scalar * 1000:9.1f} ms ({scalar / vector:5.1f}x)")
+
+
+def main(count=2000):
+	rng = np.random.default_rng(0)
+	f = compile_expression("math.sin(x)*math.exp(-x/5)", ("x",))
+	upper = rng.uniform(1, 20, count)
+	vector, integrals = timed(calculus.integrate, "math.sin(x)*math.exp(-x/5)", 0.0, upper)
+	scalar, expected = timed(lambda: [scalar_integrate(f, 0.0, b, calculus.TOLERANCE) for b in upper])
+	assert np.allclose(integrals, expected, rtol=1e-8, atol=1e-10)
+	report(f"{count} integrais", vector, scalar)
+
+	points = rng.uniform(-10, 10, count * 50)
+	vector, slopes = timed(calculus.derivative, "math.sin(x)*math.exp(-x/5)", points)
+	scalar, expected = timed(lambda: [scalar_derivative(f, x) for x in points])
+	assert np.allclose(slopes, expected)
+	report(f"{len(points)} derivadas", vector, scalar)
+
+	g = compile_expression("x**3-2*x-c", ("c", "x"))
+	constants = rng.uniform(-5, 5, count * 10)
+	vector, roots = timed(lambda: calculus.find_root("x**3-2*x-c", -3.0, 3.0, values={"c": constants}))
+	scalar, expected = timed(lambda: [scalar_root(lambda x, c=c: g(c=c, x=x), -3.0, 3.0, calculus.TOLERANCE) for c in constants])
+	assert np.allclose(roots ** 3 - 2 * roots - constants, 0, atol=1e-8)
+	report(f"{len(constants)} raízes", vector, scalar)
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,57 @@
+"""Benchmark: modo ℂ (complexos e matrizes) reaproveitando o compilado do modo real.
+
+Mede: (1) que trocar de modo não recompila (o cache do motor é o mesmo);
+(2) uma expressão sobre um array de complexos avaliada de uma vez, contra um
+laço que avalia elemento a elemento; (3) expressões matriciais com A e B.
+
+Uso: python Calculadora/benchmarks/bench_complex.py [elementos]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+import numpy as np  # noqa: E402
+
+import engine  # noqa: E402
+from complex_mode import NAMESPACE, Matrix, evaluate_complex  # noqa: E402
+
+EXPRESSION = "math.sqrt(x**2-4)*math.exp(1j*x)/(1+abs(x))"
+
+
+def timed(function, *args, **kwargs):
+	inicio = time.perf_counter()
+	result = function(*args, **kwargs)
+	return (time.perf_counter() - inicio) * 1000, result
+
+
+def main(count=200000):
+	engine.clear_cache()
+	engine.evaluate("math.sqrt(x**2+4)", x=3.0)  # Modo real
+	evaluate_complex("math.sqrt(x**2+4)", x=3.0)  # Modo ℂ: mesmo compilado
+	evaluate_complex("math.sqrt(x**2+4)", x=Matrix([[1.0, 2.0], [3.0, 4.0]]))  # Matriz: mesmo compilado
+	info = engine.cache_info()
+	print(f"compilações ao trocar de modo/tipo: {info.misses} (acertos no cache: {info.hits})")
+
+	rng = np.random.default_rng(0)
+	x = rng.normal(size=count) + 1j * rng.normal(size=count)
+	compiled = engine.compile_expression(EXPRESSION, ("x",))
+	ms_array, result = timed(lambda: compiled.run(NAMESPACE, {"x": x}))
+	sample = x[:count // 20].tolist()
+	ms_loop, expected = timed(lambda: [evaluate_complex(EXPRESSION, x=value) for value in sample])
+	assert np.allclose(result[:len(sample)], expected)
+	per_element = ms_loop / len(sample)
+	print(f"{count} complexos de uma vez : {ms_array:8.1f} ms")
+	print(f"elemento a elemento       : {per_element * count:8.1f} ms (estimado de {len(sample)} elementos, {per_element * count / ms_array:.0f}x)")
+
+	for size in (10, 100, 300):
+		a = Matrix(rng.normal(size=(size, size)))
+		b = Matrix(rng.normal(size=(size, size)))
+		ms, _ = timed(evaluate_complex, "A*B-1/A+A**3/2", A=a, B=b)
+		print(f"{f'A*B-1/A+A**3/2 ({size}x{size})':26}: {ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
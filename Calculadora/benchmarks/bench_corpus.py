@@ -0,0 +1,485 @@
+"""Corpus de expressões do teclado: vazão, latência e conferência com eval.
+
+Gera (com semente fixa) sequências de teclas que cobrem todos os botões da
+matriz BUTTONS, em várias profundidades de aninhamento e tamanhos de número,
+e as reproduz sobre o ExpressionBuffer como Calculator.on_button_click: "C"
+limpa, "Rad" troca o modo de ângulo, "ℝ", "i" e "[A]" ligam o modo ℂ, "="
+no meio da sequência carrega o resultado como em poll_result. As teclas x,
+f(x), ∫, d/dx e raiz geram expressões em x, avaliadas em um ponto (o mesmo
+caminho que o gráfico e o cálculo numérico percorrem para cada amostra).
+
+Cada motor recebe (expressão, variáveis, ângulo, modo ℂ), como o processo de
+avaliação recebe de Calculator.calculate:
+- calculate: worker._evaluate no próprio processo (motor com cache);
+- processo: EvaluationWorker, com a ida e volta entre processos;
+- eval: eval puro no mesmo vocabulário, a referência de correção;
+- --motor modulo:funcao acrescenta outro motor com a mesma assinatura.
+
+Mede a vazão e a latência (p50/p90/p99) com o cache frio e quente, por modo,
+profundidade e tamanho, e confere cada resultado com o eval. Os números vão
+para um JSON; os limites de corpus_thresholds.json (absolutos e, com --base,
+relativos a uma execução anterior) fazem o script sair com código 1, assim
+como os casos fixos de KNOWN_CASES (o eval não acusa um erro na montagem da
+expressão, porque avalia a mesma string).
+
+Uso: python Calculadora/benchmarks/bench_corpus.py [--casos N] [--saida arquivo] [--base anterior.json]
+"""
+
+import argparse
+import cmath
+import importlib
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+import numpy as np  # noqa: E402
+
+import engine  # noqa: E402
+from complex_mode import COMPLEX_BUILTINS, COMPLEX_FUNCTIONS, Matrix, parse_matrix  # noqa: E402
+from engine import BUILTIN_FUNCTIONS, DEGREES, FINANCIAL_FUNCTIONS, MATH_FUNCTIONS, RADIANS, make_globals  # noqa: E402
+from expression_buffer import BUTTONS, ExpressionBuffer  # noqa: E402
+from presentation import ResultView  # noqa: E402
+from worker import EvaluationWorker, _evaluate  # noqa: E402
+
+HERE = Path(__file__).resolve().parent
+THRESHOLDS = HERE / "corpus_thresholds.json"
+SEED = 2026
+SIZES = {"pequeno": (1, 2), "medio": (3, 6), "grande": (12, 30)}  # Algarismos de cada número digitado
+MAX_DEPTH = 4  # Funções ou parênteses aninhados
+MODES = (  # (modo, peso no corpus)
+	("rad", 40), ("deg", 15), ("complexo", 12), ("matriz", 6), ("x", 10), ("encadeado", 10), ("aleatorio", 7),
+)
+FUNCTION_KEYS = ("sin", "cos", "tan", "√", "ln", "log", "eˣ", "|x|", "(")
+OPERATOR_KEYS = ("+", "-", "×", "÷", "xʸ")
+X_KEYS = ("f(x)", "∫", "d/dx", "raiz")  # Teclas que usam a expressão em x
+RANDOM_KEYS = [key for row in BUTTONS for key in row if key not in ("xʸ", "x²", "=", *X_KEYS)]  # Sem potências: 9**9**9 não termina
+MATRICES = {"A": parse_matrix("1 2\n3 4"), "B": parse_matrix("2 1j\n-1j 3")}
+REL_TOL = 1e-9  # Tolerância da comparação com o eval (o otimizador pode reordenar contas em float)
+ABS_TOL = 1e-12
+KNOWN_CASES = (  # (teclas, valor esperado): conferidos com valores escritos à mão, não com o eval da mesma string
+	(("ℝ", "2", "i"), 2j),
+	(("ℝ", "i", "5"), 5j),
+	(("ℝ", "0", ".", "5", "i"), 0.5j),
+	(("2", "π"), 2 * math.pi),
+	(("0", "-", "5", "=", "x²"), 25),  # O resultado -5 é carregado como (-5), não como "-5**2"
+	(("(", "2", ")", "5"), 10),  # Dígito depois de ")" ou de um sufixo: multiplicação implícita
+	(("3", "x²", "2"), 18),
+	(("1", "0", "xʸ", "5", "0", "0", "0", "=", "5"), 5 * 10 ** 5000),  # Resultado guardado por valor (ans): não vira "ans5"
+)
+
+
+class Case(NamedTuple):
+	"""Uma expressão do corpus, já no formato recebido pelo processo de avaliação."""
+	keys: tuple
+	expression: str
+	values: dict
+	angle: str
+	complex_mode: bool
+	mode: str
+	depth: int
+	size: str
+
+
+# Geração das sequências de teclas
+
+def number(rng, size):
+	low, high = SIZES[size]
+	keys = [rng.choice("123456789")] + [rng.choice("0123456789") for _ in range(rng.randint(low, high) - 1)]
+	if size != "grande" and rng.random() < 0.4:  # Números grandes ficam inteiros (aritmética exata)
+		keys.insert(rng.randint(1, len(keys)), ".")
+	return keys
+
+
+def financial(rng, size):
+	key = rng.choice(("VF", "PGTO", "VPL", "TIR"))
+	rate = ["0", ".", "0", rng.choice("123456789")]
+	flows = [number(rng, size) for _ in range(rng.randint(2, 4))]
+	if key in ("VF", "PGTO"):
+		args = [rate, list(str(rng.randint(1, 60))), number(rng, size) + ["+/-"]]
+	elif key == "VPL":
+		args = [rate, *flows]
+	else:
+		args = [flows[0] + ["+/-"], *flows[1:]]
+	keys = [key]
+	for position, arg in enumerate(args):
+		keys += ([","] if position else []) + arg
+	return keys + [")"]
+
+
+def operand(rng, depth, size, extra=(), nest=False):
+	"""Teclas de um operando; nest força uma função ou parêntese com profundidade depth."""
+	roll = 0.0 if nest else rng.random()
+	if depth > 0 and roll < 0.4:
+		keys = [rng.choice(FUNCTION_KEYS)] + expression(rng, depth - 1, size, extra) + [")"]
+	elif depth > 0 and roll < 0.5:
+		keys = financial(rng, size)
+	elif roll < 0.6:
+		keys = [rng.choice(("π", "e") + extra)]
+	elif roll < 0.65:
+		keys = ["1/x"] + number(rng, size)
+	else:
+		keys = number(rng, size)
+	if keys[-1] != ")" and rng.random() < 0.15:
+		keys.append("+/-")
+	if rng.random() < 0.15:
+		keys.append(rng.choice(("x²", "%")))
+	return keys
+
+
+def expression(rng, depth, size, extra=()):
+	"""Operandos ligados por operadores; só o primeiro chega à profundidade pedida."""
+	keys = operand(rng, depth, size, extra, nest=depth > 0)
+	for _ in range(rng.randint(0, 2)):
+		key = rng.choice(OPERATOR_KEYS if keys[-2:-1] != ["xʸ"] else OPERATOR_KEYS[:-1])  # a**9**9 já teria milhões de algarismos
+		if key == "xʸ":  # Expoente de um algarismo: o resultado continua calculável
+			keys += ["xʸ", rng.choice("0123456789")]
+		else:
+			keys += [key] + operand(rng, rng.randint(0, depth), size, extra)
+	return keys
+
+
+def sequence(rng, mode, depth, size):
+	"""Teclas de um caso do corpus (sem o "=" final, implícito)."""
+	if mode == "aleatorio":
+		return [rng.choice(RANDOM_KEYS) for _ in range(rng.randint(1, 12))]
+	if mode == "matriz":
+		keys = ["[A]", rng.choice(("×", "+", "-")), "[A]"]
+		if rng.random() < 0.5:
+			keys += ["+", "|x|", "[A]"] if rng.random() < 0.5 else ["×"]
+			keys += [")"] if keys[-1] == "[A]" else number(rng, "pequeno")
+		return keys
+	extra = {"complexo": ("i",), "x": ("x", "x", "x")}.get(mode, ())
+	keys = expression(rng, depth, size, extra)
+	if mode == "deg":
+		keys = ["Rad"] + keys
+	elif mode == "complexo":
+		keys = ["ℝ"] + keys + ["+", "i", "×"] + number(rng, "pequeno")
+	elif mode == "x":
+		keys = ["x", "×"] + keys + [rng.choice(X_KEYS)]
+	elif mode == "encadeado":  # Resultado anterior reaproveitado (ans)
+		keys = keys + ["="] + [rng.choice(("+", "-", "×", "÷"))] + operand(rng, 0, size)
+	if rng.random() < 0.05:  # Algo digitado e apagado antes
+		keys = number(rng, size) + ["C"] + keys
+	return keys
+
+
+def play(keys, x):
+	"""Reproduz as teclas como a interface; devolve (expressão, variáveis, ângulo, modo ℂ)."""
+	buffer = ExpressionBuffer()
+	angle, complex_mode, matrices = RADIANS, False, {}
+	for key in keys:
+		if key == "C":
+			buffer.clear()
+		elif key == "Rad":
+			angle = DEGREES if angle == RADIANS else RADIANS
+		elif key == "ℝ":
+			complex_mode = not complex_mode
+		elif key == "[A]":  # O painel insere A na primeira vez e B depois
+			name = "B" if "A" in matrices else "A"
+			matrices[name] = MATRICES[name]
+			complex_mode = True
+			buffer.press(name)
+		elif key == "+/-":
+			buffer.toggle_sign()
+		elif key == "=":  # Como poll_result: o resultado vira o novo operando
+			try:
+				result = reference(buffer.expression, {**matrices, **buffer.values()}, angle, complex_mode)
+			except Exception:
+				buffer.clear()
+				continue
+			view = ResultView(result)
+			if view.by_reference:
+				buffer.load_value(result, view.summary())
+			else:
+				buffer.load(view.summary())
+		elif key in X_KEYS:
+			break
+		else:
+			buffer.press(key)
+			if key == "i":
+				complex_mode = True
+	values = {**matrices, **buffer.values()}
+	if "x" in keys:
+		values["x"] = x
+	return buffer.expression, values, angle, complex_mode
+
+
+def corpus(count, seed=SEED):
+	rng = random.Random(seed)
+	names, weights = zip(*MODES)
+	cases = []
+	for _ in range(count):
+		mode = rng.choices(names, weights)[0]
+		depth = rng.randint(0, MAX_DEPTH)
+		size = rng.choice(tuple(SIZES))
+		keys = sequence(rng, mode, depth, size)
+		expression_text, values, angle, complex_mode = play(keys, round(rng.uniform(-2, 2), 3))
+		cases.append(Case(tuple(keys), expression_text, values, angle, complex_mode, mode, depth, size))
+	return cases
+
+
+def coverage(cases):
+	pressed = {key for case in cases for key in case.keys}
+	buttons = {key for row in BUTTONS for key in row}
+	return {"keys": len(buttons), "missing": sorted(buttons - pressed), "fraction": len(buttons & pressed) / len(buttons)}
+
+
+# Motores
+
+def _in_degrees(function):
+	return lambda angle: function(angle * (math.pi / 180))
+
+
+def _folded(name, function):
+	"""No modo ℂ, o otimizador do motor já calcula com math as funções de constantes inteiras."""
+	def call(value):
+		if isinstance(value, int):
+			try:
+				return MATH_FUNCTIONS[name](value)
+			except (ValueError, OverflowError):  # Fora do domínio real: fica para o NumPy
+				pass
+		return function(value)
+	return call
+
+
+def _reference_globals(functions, builtins, angle):
+	if functions is COMPLEX_FUNCTIONS:
+		functions = {name: _folded(name, function) for name, function in functions.items()}
+	if angle == DEGREES:
+		functions = {**functions, **{name: _in_degrees(functions[name]) for name in ("sin", "cos", "tan")}}
+	return make_globals(functions, builtins, FINANCIAL_FUNCTIONS)
+
+
+REFERENCE = {  # (ângulo, modo ℂ) -> ambiente do eval de referência
+	(angle, complex_mode): _reference_globals(*(COMPLEX_FUNCTIONS, COMPLEX_BUILTINS) if complex_mode else (MATH_FUNCTIONS, BUILTIN_FUNCTIONS), angle)
+	for angle in (RADIANS, DEGREES) for complex_mode in (False, True)
+}
+
+
+def reference(expression_text, values, angle, complex_mode):
+	"""eval puro, sem análise, cache nem otimizador."""
+	if complex_mode:
+		with np.errstate(all="ignore"):
+			return eval(expression_text, REFERENCE[angle, True], dict(values))
+	return eval(expression_text, REFERENCE[angle, False], dict(values))
+
+
+def calculate(expression_text, values, angle, complex_mode):
+	return _evaluate(expression_text, values, angle, complex_mode)
+
+
+class ProcessEngine:
+	"""Mesmo caminho, com a ida e volta ao processo auxiliar de Calculator.calculate."""
+
+	def __init__(self):
+		self.worker = EvaluationWorker()
+
+	def __call__(self, expression_text, values, angle, complex_mode):
+		self.worker.submit(expression_text, values, angle, complex_mode)
+		return self.worker.wait()
+
+	def close(self):
+		self.worker.close()
+
+
+def load_engine(spec):
+	module, _, name = spec.partition(":")
+	return getattr(importlib.import_module(module), name or "evaluate")
+
+
+# Medição
+
+def outcome(function, case):
+	try:
+		return True, function(case.expression, case.values, case.angle, case.complex_mode)
+	except Exception as exc:  # Erros fazem parte do corpus (domínio, estouro, sintaxe)
+		return False, type(exc).__name__
+
+
+def agree(expected, got):
+	"""Os dois levantaram erro, ou os valores coincidem dentro da tolerância."""
+	(expected_ok, expected), (got_ok, got) = expected, got
+	if not (expected_ok and got_ok):
+		return expected_ok == got_ok
+	if isinstance(expected, Matrix) or isinstance(got, Matrix):
+		return isinstance(expected, Matrix) and isinstance(got, Matrix) and expected.array.shape == got.array.shape and \
+			np.allclose(expected.array, got.array, rtol=REL_TOL, atol=ABS_TOL, equal_nan=True)
+	if isinstance(expected, int) and isinstance(got, int):
+		return expected == got
+	try:
+		expected, got = complex(expected), complex(got)
+	except (OverflowError, TypeError):
+		return False
+	if cmath.isnan(expected) or cmath.isnan(got):
+		return cmath.isnan(expected) and cmath.isnan(got)
+	return expected == got or cmath.isclose(expected, got, rel_tol=REL_TOL, abs_tol=ABS_TOL)
+
+
+def latency(samples_ns):
+	"""Quantis de uma lista de latências em nanossegundos, em microssegundos."""
+	samples = sorted(samples_ns)
+	if not samples:
+		return {}
+	pick = lambda q: samples[min(int(q * len(samples)), len(samples) - 1)] / 1000  # noqa: E731
+	return {"p50_us": pick(0.5), "p90_us": pick(0.9), "p99_us": pick(0.99), "max_us": samples[-1] / 1000,
+		"mean_us": sum(samples) / len(samples) / 1000}
+
+
+def timed_pass(function, cases):
+	samples = []
+	for case in cases:
+		start = time.perf_counter_ns()
+		try:
+			function(case.expression, case.values, case.angle, case.complex_mode)
+		except Exception:
+			pass
+		samples.append(time.perf_counter_ns() - start)
+	return samples
+
+
+def throughput(function, cases, repeats):
+	start = time.perf_counter()
+	for _ in range(repeats):
+		for case in cases:
+			try:
+				function(case.expression, case.values, case.angle, case.complex_mode)
+			except Exception:
+				pass
+	return len(cases) * repeats / (time.perf_counter() - start)
+
+
+def measure(function, cases, expected, repeats):
+	engine.clear_cache()
+	cold = timed_pass(function, cases)  # Primeira passada: compila cada expressão
+	hot = []
+	for _ in range(repeats):
+		hot += timed_pass(function, cases)
+	classes = defaultdict(list)
+	for position, sample in enumerate(hot):
+		case = cases[position % len(cases)]
+		for key in (f"mode:{case.mode}", f"depth:{case.depth}", f"size:{case.size}"):
+			classes[key].append(sample)
+	mismatches = []
+	errors = 0
+	for case, reference_outcome in zip(cases, expected):
+		result = outcome(function, case)
+		errors += not result[0]
+		if not agree(reference_outcome, result):
+			mismatches.append({"expression": case.expression, "mode": case.mode, "expected": repr(reference_outcome[1])[:80], "got": repr(result[1])[:80]})
+	return {
+		"cases": len(cases),
+		"throughput": throughput(function, cases, repeats),
+		"cold_throughput": len(cold) / (sum(cold) / 1e9),
+		"latency": {"cold": latency(cold), "hot": latency(hot)},
+		"classes": {key: {"count": len(samples) // repeats, "throughput": len(samples) / (sum(samples) / 1e9), **latency(samples)}
+			for key, samples in sorted(classes.items())},
+		"errors": errors,
+		"mismatches": len(mismatches),
+		"mismatch_examples": mismatches[:20],
+	}
+
+
+# Limites de regressão
+
+def known_cases():
+	"""Reproduz KNOWN_CASES e avalia com o motor; devolve os casos que não deram o valor esperado."""
+	problems = []
+	for keys, value in KNOWN_CASES:
+		expression_text, values, angle, complex_mode = play(keys, 0.0)
+		result = outcome(calculate, Case(keys, expression_text, values, angle, complex_mode, "fixo", 0, "pequeno"))
+		if not agree((True, value), result):
+			problems.append(f"teclas {' '.join(keys)}: {expression_text!r} deu {result[1]!r}, esperado {value!r}")
+	return problems
+
+def check(results, thresholds, base=None):
+	"""Lista de regressões (vazia se tudo estiver dentro dos limites)."""
+	problems = []
+	if results["coverage"]["fraction"] < thresholds.get("min_coverage", 1.0):
+		problems.append(f"cobertura {results['coverage']['fraction']:.0%}: faltam {results['coverage']['missing']}")
+	for name, data in results["engines"].items():
+		if data["mismatches"] > thresholds.get("max_mismatches", 0):
+			problems.append(f"{name}: {data['mismatches']} resultados diferentes do eval")
+		limits = thresholds.get("engines", {}).get(name, {})
+		if data["throughput"] < limits.get("min_throughput", 0):
+			problems.append(f"{name}: vazão {data['throughput']:.0f}/s abaixo de {limits['min_throughput']}/s")
+		if data["latency"]["hot"]["p99_us"] > limits.get("max_p99_us", math.inf):
+			problems.append(f"{name}: p99 {data['latency']['hot']['p99_us']:.1f} µs acima de {limits['max_p99_us']} µs")
+		previous = (base or {}).get("engines", {}).get(name)
+		if previous is None:
+			continue
+		relative = thresholds.get("relative", {})
+		drop = 1 - data["throughput"] / previous["throughput"]
+		if drop > relative.get("max_throughput_drop", math.inf):
+			problems.append(f"{name}: vazão caiu {drop:.0%} em relação à base")
+		growth = data["latency"]["hot"]["p99_us"] / previous["latency"]["hot"]["p99_us"] - 1
+		if growth > relative.get("max_p99_increase", math.inf):
+			problems.append(f"{name}: p99 subiu {growth:.0%} em relação à base")
+	return problems
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Corpus de expressões do teclado: vazão, latência e correção.")
+	parser.add_argument("--casos", type=int, default=3000, help="expressões no corpus")
+	parser.add_argument("--repeticoes", type=int, default=5, help="passadas com o cache quente")
+	parser.add_argument("--semente", type=int, default=SEED)
+	parser.add_argument("--motor", action="append", default=[], help="outro motor, como modulo:funcao(expressao, valores, angulo, modo_complexo)")
+	parser.add_argument("--amostra-processo", type=int, default=500, help="casos medidos pelo processo auxiliar (0 desliga)")
+	parser.add_argument("--saida", default=str(HERE / "corpus_results.json"), help="JSON com os resultados")
+	parser.add_argument("--limites", default=str(THRESHOLDS), help="JSON com os limites de regressão")
+	parser.add_argument("--base", help="resultados de uma execução anterior, para os limites relativos")
+	args = parser.parse_args(argv)
+
+	cases = corpus(args.casos, args.semente)
+	expected = [outcome(reference, case) for case in cases]
+	results = {
+		"created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"python": platform.python_version(),
+		"cpus": os.cpu_count(),
+		"seed": args.semente,
+		"cases": len(cases),
+		"coverage": coverage(cases),
+		"modes": dict(Counter(case.mode for case in cases)),
+		"reference_errors": sum(not ok for ok, _ in expected),
+		"engines": {},
+	}
+	engines = [("eval", reference), ("calculate", calculate)] + [(spec, load_engine(spec)) for spec in args.motor]
+	for name, function in engines:
+		results["engines"][name] = measure(function, cases, expected, args.repeticoes)
+	if args.amostra_processo:
+		process = ProcessEngine()
+		try:
+			sample = cases[:args.amostra_processo]
+			results["engines"]["processo"] = measure(process, sample, expected[:len(sample)], 1)
+		finally:
+			process.close()
+
+	print(f"{len(cases)} casos, cobertura de teclas {results['coverage']['fraction']:.0%}, "
+		f"{results['reference_errors']} com erro no eval, {os.cpu_count()} CPUs")
+	print(f"{'motor':12} {'expr/s':>10} {'frio/s':>10} {'p50 µs':>8} {'p99 µs':>8} {'diverg.':>8}")
+	for name, data in results["engines"].items():
+		hot = data["latency"]["hot"]
+		print(f"{name:12} {data['throughput']:10.0f} {data['cold_throughput']:10.0f} {hot['p50_us']:8.1f} {hot['p99_us']:8.1f} {data['mismatches']:8d}")
+	for key, data in results["engines"]["calculate"]["classes"].items():
+		print(f"  calculate {key:16} {data['count']:6d} casos {data['throughput']:10.0f}/s p99 {data['p99_us']:8.1f} µs")
+
+	thresholds = json.loads(Path(args.limites).read_text(encoding="utf-8")) if Path(args.limites).exists() else {}
+	base = json.loads(Path(args.base).read_text(encoding="utf-8")) if args.base else None
+	results["regressions"] = known_cases() + check(results, thresholds, base)
+	Path(args.saida).write_text(json.dumps(results, indent=1, ensure_ascii=False), encoding="utf-8")
+	print(f"resultados em {args.saida}")
+	for problem in results["regressions"]:
+		print("REGRESSÃO:", problem)
+	return 1 if results["regressions"] else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,53 @@
+"""Benchmark: motor compilado com cache (engine.evaluate) contra eval puro.
+
+Reproduz um volume grande de expressões do teclado, com repetição, como nos
+replays de produção. Uso: python Calculadora/benchmarks/bench_engine.py [repeticoes]
+"""
+
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+from engine import clear_cache, evaluate  # noqa: E402
+
+CORPUS = [  # Expressões no formato gerado por on_button_click
+	"1+2*3",
+	"12.5/100",
+	"math.sqrt(16)+math.log10(1000)",
+	"math.sin(" + str(math.pi) + "/2)**2+math.cos(0)**2",
+	"abs(-7.25)*3-1/4",
+	"math.exp(1)-" + str(math.e),
+	"(1+2)*(3+4)/(5-6)",
+	"2**10-1",
+	"math.log(" + str(math.e) + "**3)",
+	"math.tan(0.5)*1/3",
+]
+
+
+def run(function, expressions):
+	inicio = time.perf_counter()
+	for expression in expressions:
+		function(expression)
+	return time.perf_counter() - inicio
+
+
+def main(repeticoes=20000):
+	expressions = CORPUS * repeticoes
+	for expression in CORPUS:  # Confere que os dois caminhos concordam antes de medir
+		assert evaluate(expression) == eval(expression), expression
+
+	clear_cache()
+	tempo_eval = run(eval, expressions)
+	tempo_engine = run(evaluate, expressions)
+	total = len(expressions)
+	print(f"{total} avaliações")
+	print(f"eval puro      : {tempo_eval:.3f} s ({total / tempo_eval:,.0f} expr/s)")
+	print(f"engine.evaluate: {tempo_engine:.3f} s ({total / tempo_engine:,.0f} expr/s)")
+	print(f"ganho          : {tempo_eval / tempo_engine:.1f}x")
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
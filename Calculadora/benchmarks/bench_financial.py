@@ -0,0 +1,76 @@
+"""Benchmark: funções financeiras vetorizadas contra o laço escalar de financial.
+
+Gera séries de fluxo de caixa aleatórias (um investimento seguido de retornos) e
+mede séries por segundo da TIR em lote, conferindo com a versão escalar.
+Confere também que um fluxo em que a TIR não converge dá erro no escalar e nan
+no vetorizado.
+
+Uso: python Calculadora/benchmarks/bench_financial.py [séries] [períodos]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+import numpy as np  # noqa: E402
+
+import financial  # noqa: E402
+import financial_vectorized  # noqa: E402
+
+SCALAR_SAMPLE = 5000  # Séries resolvidas pelo laço escalar (a taxa é extrapolada)
+NOT_CONVERGING = np.polynomial.polynomial.polyfromroots([0.5] * 15).tolist()  # Raiz de multiplicidade 15 em t = 0,5: Newton avança devagar demais
+
+
+def scalar_irr(row):
+	try:
+		return financial.irr(*row)
+	except ValueError:  # Sem troca de sinal ou sem convergência: a versão vetorizada devolve nan
+		return float("nan")
+
+
+def check_not_converging():
+	"""Os dois modos tratam a falta de convergência como a falta de troca de sinal."""
+	try:
+		value = financial.irr(*NOT_CONVERGING)
+	except ValueError:
+		pass
+	else:
+		raise AssertionError(f"financial.irr deveria levantar ValueError, devolveu {value}")
+	assert np.isnan(financial_vectorized.irr([NOT_CONVERGING])[0])
+
+
+def timed(function, *args):
+	inicio = time.perf_counter()
+	result = function(*args)
+	return time.perf_counter() - inicio, result
+
+
+def main(series=300000, periods=12):
+	check_not_converging()
+	rng = np.random.default_rng(0)
+	flows = np.column_stack((-rng.uniform(50, 150, series), rng.uniform(-5, 40, (series, periods - 1))))
+	rates = rng.uniform(0, 0.3, series)
+
+	vector, irrs = timed(financial_vectorized.irr, flows)
+	sample = flows[:SCALAR_SAMPLE].tolist()
+	scalar, expected = timed(lambda: [scalar_irr(row) for row in sample])
+	assert np.allclose(irrs[:SCALAR_SAMPLE], expected, rtol=1e-9, equal_nan=True)
+	moderate = irrs > -0.5  # Perto de -100% o VPL tem termos enormes e o resíduo absoluto não diz nada
+	assert np.max(np.abs(financial_vectorized.npv(irrs[moderate], flows[moderate]))) < 1e-6
+	scalar_rate = SCALAR_SAMPLE / scalar
+	print(f"TIR  ({periods} períodos): {series / vector:12,.0f} séries/s vetorizado, {scalar_rate:10,.0f} séries/s escalar ({series / vector / scalar_rate:.1f}x)")
+
+	vector, _ = timed(financial_vectorized.npv, rates, flows)
+	scalar, _ = timed(lambda: [financial.npv(rate, *row) for rate, row in zip(rates[:SCALAR_SAMPLE].tolist(), sample)])
+	print(f"VPL  ({periods} períodos): {series / vector:12,.0f} séries/s vetorizado, {SCALAR_SAMPLE / scalar:10,.0f} séries/s escalar")
+
+	nper = rng.integers(1, 360, series)
+	vector, _ = timed(financial_vectorized.pmt, rates / 12, nper, 1000.0)
+	scalar, _ = timed(lambda: [financial.pmt(rate, n, 1000.0) for rate, n in zip((rates[:SCALAR_SAMPLE] / 12).tolist(), nper[:SCALAR_SAMPLE].tolist())])
+	print(f"PGTO               : {series / vector:12,.0f} valores/s vetorizado, {SCALAR_SAMPLE / scalar:10,.0f} valores/s escalar")
+
+
+if __name__ == "__main__":
+	main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,78 @@
+"""Benchmark: abertura e buscas no histórico com centenas de milhares de entradas.
+
+Antes de medir, confere que uma expressão órfã no fim do .txt (gravação
+interrompida antes do .idx) não aparece nas buscas nem se junta à anterior.
+
+Uso: python Calculadora/benchmarks/bench_history.py [entradas]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+from history import History  # noqa: E402
+
+FUNCTIONS = ["math.sin(", "math.cos(", "math.log10(", "math.sqrt(", "abs(", ""]
+QUERIES = ["math.sqrt(", "12", "**2", "math.log10(9", "(-7", "fin.npv("]  # Trechos (os dois últimos não aparecem)
+PREFIXES = ["math.sin(1", "abs(", "3", "9*", "math.tan("]  # Prefixos
+
+
+def random_expression(rng):
+	function = rng.choice(FUNCTIONS)
+	return f"{function}{rng.randint(0, 9999)}{rng.choice('+-*/')}{rng.randint(0, 999)}{')' if function else ''}{rng.choice(['', '**2', '/100'])}"
+
+
+def timed(function, *args):
+	inicio = time.perf_counter()
+	result = function(*args)
+	return (time.perf_counter() - inicio) * 1000, result
+
+
+def check_orphan(pasta):
+	"""Expressão gravada no .txt sem entrada no .idx (gravação interrompida) não aparece nas buscas."""
+	path = Path(pasta) / "orfa"
+	history = History(path)
+	history.append("1+2", "3")
+	history.close()
+	with open(path.with_suffix(".txt"), "ab") as text:
+		text.write(b"\nmath.exp(7)")
+	history = History(path)
+	assert history.search("exp(") == [] and history.search_prefix("math.exp(") == []
+	history.append("4*5", "20")
+	assert [entry[0] for entry in history.search("+")] == ["1+2"]
+	assert [entry[0] for entry in history.search_prefix("4*")] == ["4*5"]
+	history.close()
+
+
+def main(entradas=300000):
+	rng = random.Random(0)
+	with tempfile.TemporaryDirectory() as pasta:
+		check_orphan(pasta)
+		path = Path(pasta) / "historico"
+		history = History(path)
+		for _ in range(entradas):
+			history.append(random_expression(rng), str(rng.random()))
+		history.close()
+
+		ms, history = timed(History, path)
+		print(f"{entradas:,} entradas")
+		print(f"abertura                     : {ms:.2f} ms")
+		ms, _ = timed(history.search, "1")
+		print(f"1ª busca (lê o .blm)         : {ms:.2f} ms")
+		for query in QUERIES:
+			ms, found = timed(history.search, query)
+			print(f"trecho  {query!r:16}: {ms:.3f} ms ({len(found)} resultados)")
+		for prefix in PREFIXES:
+			ms, found = timed(history.search_prefix, prefix)
+			print(f"prefixo {prefix!r:16}: {ms:.3f} ms ({len(found)} resultados)")
+		ms, _ = timed(history.append, "1+1", "2")
+		print(f"acréscimo com índice montado : {ms:.3f} ms")
+		history.close()
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 300000)
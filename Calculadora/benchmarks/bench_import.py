@@ -0,0 +1,47 @@
+"""Benchmark: custo de importação do núcleo headless contra a interface gráfica.
+
+Executa `python -X importtime` em processos novos e soma o tempo cumulativo das
+importações de primeiro nível. Uso: python Calculadora/benchmarks/bench_import.py
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+CALCULADORA = Path(__file__).resolve().parent.parent
+TARGETS = {  # Descrição -> módulo importado
+	"núcleo (core)": "core",
+	"modo batch (main)": "main",
+	"interface (gui)": "gui",
+}
+RUNS = 5
+
+
+def import_time_us(module):
+	"""Tempo cumulativo (µs) das importações de primeiro nível ao importar o módulo."""
+	stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=CALCULADORA, capture_output=True, text=True, check=True).stderr
+	total = 0
+	for line in stderr.splitlines():
+		if not line.startswith("import time:") or "|" not in line:
+			continue
+		_, cumulative, name = line.split("|")
+		if cumulative.strip().isdigit() and not name.startswith("  "):  # Só importações de primeiro nível
+			total += int(cumulative)
+	return total
+
+
+def modules_loaded(module):
+	"""Indica se importar o módulo também carrega customtkinter/tkinter."""
+	code = f"import sys, {module}; print('customtkinter' in sys.modules, 'tkinter' in sys.modules)"
+	return subprocess.run([sys.executable, "-c", code], cwd=CALCULADORA, capture_output=True, text=True, check=True).stdout.split()
+
+
+def main():
+	for label, module in TARGETS.items():
+		tempos = sorted(import_time_us(module) for _ in range(RUNS))
+		ctk, tk = modules_loaded(module)
+		print(f"{label:20}: {tempos[len(tempos) // 2] / 1000:7.1f} ms (mediana)  customtkinter={ctk} tkinter={tk}")
+
+
+if __name__ == "__main__":
+	main()
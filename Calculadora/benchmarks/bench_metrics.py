@@ -0,0 +1,60 @@
+"""Benchmark: custo da instrumentação (metrics) no motor, desligada e ligada.
+
+Avalia o corpus de bench_engine com a instrumentação desligada (o padrão) e
+dentro de metrics.profile(), e mostra um relatório do profile: tempos de
+análise, compilação e avaliação, acerto do cache e chamadas por função. O
+relatório inclui avaliações vetorizadas (CompiledExpression.run), que também
+precisam aparecer nos números.
+
+Uso: python Calculadora/benchmarks/bench_metrics.py [repeticoes]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+import numpy as np  # noqa: E402
+
+import metrics  # noqa: E402
+from bench_engine import CORPUS  # noqa: E402
+from engine import clear_cache, evaluate  # noqa: E402
+from vectorized import evaluate_array  # noqa: E402
+
+
+def run(expressions):
+	inicio = time.perf_counter()
+	for expression in expressions:
+		evaluate(expression)
+	return time.perf_counter() - inicio
+
+
+def main(repeticoes=20000):
+	expressions = CORPUS * repeticoes
+	total = len(expressions)
+	tempos = {}
+	for _ in range(3):  # Alterna os modos para diluir o ruído da máquina
+		clear_cache()
+		tempos.setdefault("desligada", []).append(run(expressions))
+		clear_cache()
+		with metrics.profile():
+			tempos.setdefault("ligada", []).append(run(expressions))
+	for mode, medidas in tempos.items():
+		melhor = min(medidas)
+		print(f"instrumentação {mode:9}: {melhor / total * 1e9:7.0f} ns/avaliação")
+	print(f"custo da instrumentação: {(min(tempos['ligada']) / min(tempos['desligada']) - 1):.0%}")
+	print()
+	with metrics.profile() as report:  # Corpus (constantes dobradas na compilação), uma expressão em x e a mesma vetorizada
+		run(expressions[:len(CORPUS) * 100])
+		for x in range(10000):
+			evaluate("math.sin(x)**2+math.cos(x)**2-abs(x)/(x+1)", x=x)
+		for _ in range(100):
+			evaluate_array("math.sin(x)**2+math.cos(x)**2-abs(x)/(x+1)", np.arange(10000.0))
+	print(report)
+	assert report.calls["math.sin"] == 10000 + 100, report.calls  # Cada avaliação vetorizada chama a ufunc uma vez
+	assert report.histogram("evaluate").count >= 10000 + 100
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
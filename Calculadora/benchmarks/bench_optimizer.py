@@ -0,0 +1,62 @@
+"""Benchmark: a mesma expressão avaliada muitas vezes, com e sem o otimizador.
+
+A expressão imita o que o teclado gera (π e e colados como literais, "%" como
+"/100", "x²" como "**2"). Uso: python Calculadora/benchmarks/bench_optimizer.py [repeticoes]
+"""
+
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+from engine import compile_expression, evaluate  # noqa: E402
+
+EXPRESSION = "x**2*" + str(math.pi) + "/4+math.sqrt(2)*x/100-" + str(math.e) + "**2*math.sin(" + str(math.pi) + "/6)"
+
+
+def run(compiled, xs):
+	inicio = time.perf_counter()
+	for x in xs:
+		compiled(x=x)
+	return time.perf_counter() - inicio
+
+
+def main(repeticoes=1000000):
+	xs = [i * 0.001 for i in range(repeticoes)]
+	original = compile_expression(EXPRESSION, ("x",), optimized=False)
+	otimizada = compile_expression(EXPRESSION, ("x",))
+	for x in xs[:1000]:  # Mesmo resultado, a menos do arredondamento de a/c -> a*(1/c)
+		assert math.isclose(original(x=x), otimizada(x=x), rel_tol=1e-12, abs_tol=1e-12)
+	for expression in ("x**2", "x**3"):  # Estouro em float continua sendo erro, como sem otimização
+		try:
+			evaluate(expression, x=1e200)
+		except OverflowError:
+			pass
+		else:
+			raise AssertionError(f"{expression} com x=1e200 deveria levantar OverflowError")
+	tempo_original = run(original, xs)
+	tempo_otimizada = run(otimizada, xs)
+	print(f"{repeticoes:,} avaliações")
+	print(f"sem otimização: {tempo_original:.3f} s")
+	print(f"com otimização: {tempo_otimizada:.3f} s")
+	print(f"ganho         : {tempo_original / tempo_otimizada:.2f}x")
+
+	try:
+		import numpy as np
+		from vectorized import NAMESPACE, evaluate_array
+	except ImportError:  # NumPy é opcional
+		return
+	array = np.array(xs)
+	inicio = time.perf_counter()
+	original.run(NAMESPACE, {"x": array})
+	tempo_original = time.perf_counter() - inicio
+	inicio = time.perf_counter()
+	evaluate_array(EXPRESSION, array)
+	tempo_otimizada = time.perf_counter() - inicio
+	print(f"NumPy sem/com otimização: {tempo_original:.3f} s / {tempo_otimizada:.3f} s")
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
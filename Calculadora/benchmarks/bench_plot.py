@@ -0,0 +1,64 @@
+"""Benchmark: amostragem do modo gráfico ao abrir, arrastar e aplicar zoom.
+
+Simula a sequência de vistas de uma interação (arrastes curtos e passos de zoom)
+e mede, por quadro, o tempo do AdaptiveSampler e quantos pontos ele avaliou,
+comparando com reavaliar a vista inteira em uma grade uniforme fina a cada quadro.
+Não precisa de display.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+import numpy as np  # noqa: E402
+
+from sampler import AdaptiveSampler  # noqa: E402
+from vectorized import evaluate_array  # noqa: E402
+
+WIDTH = 600  # Pixels da tela simulada
+UNIFORM_POINTS = WIDTH * 16  # Grade uniforme com resolução parecida com a do refinamento
+EXPRESSIONS = ["math.sin(x)", "math.tan(x)", "math.sqrt(x)*math.sin(1/x)", "x//1+math.log(abs(x))"]
+
+
+def views():
+	"""Vistas de uma interação: 60 arrastes de 5 pixels e 20 passos de zoom para dentro e para fora."""
+	x_min, x_max = -10.0, 10.0
+	for _ in range(60):
+		shift = 5 * (x_max - x_min) / WIDTH
+		x_min, x_max = x_min + shift, x_max + shift
+		yield x_min, x_max
+	for factor in [1 / 1.25] * 10 + [1.25] * 10:
+		middle = (x_min + x_max) / 2
+		x_min, x_max = middle + (x_min - middle) * factor, middle + (x_max - middle) * factor
+		yield x_min, x_max
+
+
+def main():
+	for expression in EXPRESSIONS:
+		sampler = AdaptiveSampler(expression)
+		inicio = time.perf_counter()
+		sampler.sample(-10.0, 10.0, WIDTH)
+		first = (time.perf_counter() - inicio) * 1000
+		opened = sampler.evaluated
+		tempos = []
+		for x_min, x_max in views():
+			inicio = time.perf_counter()
+			sampler.sample(x_min, x_max, WIDTH)
+			tempos.append((time.perf_counter() - inicio) * 1000)
+		uniform = []
+		for x_min, x_max in views():
+			inicio = time.perf_counter()
+			evaluate_array(expression, np.linspace(x_min, x_max, UNIFORM_POINTS))
+			uniform.append((time.perf_counter() - inicio) * 1000)
+		frames = len(tempos)
+		print(f"{expression}")
+		print(f"  abertura       : {first:.2f} ms, {opened} pontos")
+		print(f"  adaptativo     : {np.median(tempos):.3f} ms/quadro (mediana), {max(tempos):.2f} ms (pior), "
+			f"{(sampler.evaluated - opened) / frames:.0f} pontos novos/quadro")
+		print(f"  grade uniforme : {np.median(uniform):.3f} ms/quadro (mediana), {UNIFORM_POINTS} pontos/quadro")
+
+
+if __name__ == "__main__":
+	main()
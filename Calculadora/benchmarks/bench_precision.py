@@ -0,0 +1,51 @@
+"""Benchmark: custo do modo de precisão (precision) em relação ao modo float.
+
+Três classes de expressão, avaliadas com x variando (sem repetir argumentos, para
+que o cache das funções transcendentes não esconda o custo):
+só inteiros (atalho pelo motor), racionais (frações exatas) e transcendentes
+(decimal com N algarismos). Mostra o tempo por avaliação e a razão sobre o float.
+
+Uso: python Calculadora/benchmarks/bench_precision.py [avaliacoes]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+from engine import evaluate  # noqa: E402
+from precision import evaluate_precise  # noqa: E402
+
+CLASSES = {
+	"inteiros": ["x*x-3*x+7", "(x+1)**3//7", "abs(x-100)*2**10"],
+	"racionais": ["x/3+0.1", "(x+0.25)/(x+1.5)", "1/(1/x+1/7)"],
+	"transcendentes": ["math.sin(x)+math.cos(x)", "math.log(x+1)*math.exp(0.5)", "math.sqrt(x+2)**0.3"],
+}
+DIGITS = (20, 50, 100)
+
+
+def timed(function, expressions, xs, **options):
+	inicio = time.perf_counter()
+	for x in xs:
+		for expression in expressions:
+			function(expression, x=x, **options)
+	return (time.perf_counter() - inicio) / (len(xs) * len(expressions))
+
+
+def main(count=2000):
+	print(f"{'classe':15} {'float':>9}" + "".join(f" {f'{digits} alg.':>17}" for digits in DIGITS))
+	for name, expressions in CLASSES.items():
+		xs = list(range(1, count + 1))  # Inteiros: o atalho do motor vale para a classe "inteiros"
+		if name != "inteiros":
+			xs = [x + 0.5 for x in xs]  # Argumentos diferentes a cada avaliação
+		base = timed(evaluate, expressions, xs)
+		line = f"{name:15} {base * 1e6:7.2f}µs"
+		for digits in DIGITS:
+			cost = timed(evaluate_precise, expressions, [x + digits for x in xs], digits=digits)
+			line += f" {cost * 1e6:8.1f}µs {cost / base:6.1f}x"
+		print(line)
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,107 @@
+"""Teste de carga do serviço local de avaliação (main.py --serve).
+
+Sobe o serviço em um processo separado (socket Unix) e o bombardeia com
+clientes concorrentes em conexões keep-alive, cada um enviando pedidos em
+sequência. Mede a latência de cada pedido (p50/p99) e a vazão, com o
+agrupamento em lotes e sem ele (janela zero, um pedido por lote).
+
+Uso: python Calculadora/benchmarks/bench_service.py [clientes] [pedidos por cliente]
+"""
+
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MIX = [  # (expressão, gera variáveis?) — pedidos típicos de outra ferramenta
+	("x*2+1", True),
+	("(x-3)/(x+7)+abs(x)", True),
+	("math.sqrt(x**2+1)", True),
+	("2**64+math.sin(3.141592653589793/6)", False),
+	("fin.pmt(0.01,360,-200000)", False),
+]
+CONFIGS = [
+	("com lotes", []),
+	("sem lotes", ["--janela-ms", "0", "--max-lote", "1"]),
+]
+
+
+async def request(reader, writer, body):
+	data = json.dumps(body).encode()
+	writer.write(b"POST /evaluate HTTP/1.1\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n" % len(data) + data)
+	await writer.drain()
+	status = await reader.readline()
+	length = 0
+	while True:
+		line = await reader.readline()
+		if line == b"\r\n":
+			break
+		if line.lower().startswith(b"content-length:"):
+			length = int(line.split(b":")[1])
+	await reader.readexactly(length)
+	return status.split()[1]
+
+
+async def client(path, count, latencies, seed):
+	rng = random.Random(seed)
+	reader, writer = await asyncio.open_unix_connection(path)
+	for _ in range(count):
+		expression, variable = rng.choice(MIX)
+		body = {"expression": expression, "values": {"x": rng.uniform(-100, 100)} if variable else {}}
+		inicio = time.perf_counter()
+		status = await request(reader, writer, body)
+		latencies.append(time.perf_counter() - inicio)
+		assert status == b"200", status
+	writer.close()
+
+
+async def load(path, clients, count):
+	latencies = []
+	inicio = time.perf_counter()
+	await asyncio.gather(*(client(path, count, latencies, seed) for seed in range(clients)))
+	elapsed = time.perf_counter() - inicio
+	reader, writer = await asyncio.open_unix_connection(path)
+	writer.write(b"GET /stats HTTP/1.1\r\nConnection: close\r\n\r\n")
+	stats = json.loads((await reader.read()).split(b"\r\n\r\n", 1)[1])
+	writer.close()
+	return latencies, elapsed, stats
+
+
+def start_server(path, options):
+	process = subprocess.Popen([sys.executable, str(ROOT / "main.py"), "--serve", "--unix", path, *options])
+	for _ in range(200):  # Espera o socket aparecer
+		if os.path.exists(path):
+			return process
+		time.sleep(0.05)
+	process.kill()
+	raise RuntimeError("o serviço não iniciou")
+
+
+def main(clients=64, count=200):
+	print(f"{clients} clientes x {count} pedidos, {os.cpu_count()} CPUs")
+	for name, options in CONFIGS:
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, "calculadora.sock")
+			process = start_server(path, options)
+			try:
+				asyncio.run(load(path, 4, 20))  # Aquece os processos de avaliação e o cache
+				latencies, elapsed, stats = asyncio.run(load(path, clients, count))
+			finally:
+				process.terminate()
+				process.wait()
+		latencies.sort()
+		total = len(latencies)
+		p50 = latencies[total // 2] * 1000
+		p99 = latencies[int(total * 0.99)] * 1000
+		print(f"{name:10}: {total / elapsed:8.0f} pedidos/s, p50 {p50:6.2f} ms, p99 {p99:6.2f} ms, "
+			f"lote médio {stats['batched_requests'] / stats['batches']:.1f} (maior {stats['largest_batch']})")
+
+
+if __name__ == "__main__":
+	main(*(int(argument) for argument in sys.argv[1:3]))
@@ -0,0 +1,71 @@
+"""Benchmark: tempo até o primeiro quadro e memória do teclado da calculadora.
+
+Compara o teclado antigo (34 CTkButton na grade) com o CanvasKeypad. Cada
+variante roda em um processo novo para medir a abertura a frio. Precisa de um
+display; em servidores sem interface use: xvfb-run python Calculadora/benchmarks/bench_startup.py
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+BUTTONS = [  # Mesma matriz de Calculator.__init__
+	["sin", "cos", "tan", "Rad", "√", "C", "(", ")"],
+	["ln", "log", "1/x", "%", "7", "8", "9", "÷"],
+	["eˣ", "x²", "xʸ", "|x|", "4", "5", "6", "×"],
+	["π", "e", "+/-", ".", "1", "2", "3", "-"],
+	["x", "f(x)", "∫", "d/dx", "0", "=", "+", "raiz"],
+	["VF", "PGTO", "VPL", "TIR", ",", "ℝ", "i", "[A]"]
+]
+RUNS = 5  # Processos por variante
+
+
+def build_buttons(window):  # Teclado antigo: um CTkButton por tecla
+	import customtkinter as ctk
+	for r, row in enumerate(BUTTONS, 1):
+		for c, text in enumerate(row):
+			if text:
+				if text == "=":
+					btn = ctk.CTkButton(window, text=text, width=60, height=50, fg_color="#a06a6a", text_color="white", font=("Arial", 20, "bold"))
+				else:
+					btn = ctk.CTkButton(window, text=text, width=60, height=50, fg_color="#222", text_color="white", font=("Arial", 18))
+				btn.grid(row=r, column=c, padx=6, pady=6)
+
+
+def build_canvas(window):  # Teclado novo: um único canvas
+	from keypad import CanvasKeypad
+	CanvasKeypad(window, BUTTONS, lambda text: None).grid(row=1, column=0)
+
+
+def measure(variant):  # Executado no processo filho: imprime "ms rss_kb"
+	import resource
+	inicio = time.perf_counter()
+	import customtkinter as ctk
+	window = ctk.CTk()
+	{"buttons": build_buttons, "canvas": build_canvas}[variant](window)
+	window.update()  # Primeiro quadro desenhado
+	elapsed = (time.perf_counter() - inicio) * 1000
+	rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	window.destroy()
+	print(f"{elapsed:.1f} {rss}")
+
+
+def main():
+	for variant in ("buttons", "canvas"):
+		tempos, memorias = [], []
+		for _ in range(RUNS):
+			saida = subprocess.run([sys.executable, __file__, "--child", variant], capture_output=True, text=True, check=True).stdout.split()
+			tempos.append(float(saida[0]))
+			memorias.append(int(saida[1]))
+		tempos.sort()
+		print(f"{variant:8}: primeiro quadro {tempos[len(tempos) // 2]:.1f} ms (mediana), pico de memória {max(memorias) / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+	if sys.argv[1:2] == ["--child"]:
+		measure(sys.argv[2])
+	else:
+		main()
@@ -0,0 +1,49 @@
+"""Benchmark: varredura de parâmetros escalar (um eval por valor) contra evaluate_array.
+
+Uso: python Calculadora/benchmarks/bench_vectorized.py [tamanho]
+"""
+
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos da calculadora
+
+import numpy as np  # noqa: E402
+
+from engine import DEGREES, RADIANS  # noqa: E402
+from vectorized import evaluate_array  # noqa: E402
+
+EXPRESSION = "math.sin(x)**2+math.log10(abs(x)+1)*math.sqrt(abs(x))/100"
+TRIG_EXPRESSION = "math.sin(x)*math.cos(x)+math.tan(x/2)"
+SCALAR_SAMPLE = 100000  # O laço escalar é medido em uma amostra e extrapolado
+
+
+def main(tamanho=2000000):
+	xs = np.linspace(-50.0, 50.0, tamanho)
+
+	amostra = xs[:SCALAR_SAMPLE].tolist()
+	inicio = time.perf_counter()
+	escalar = [eval(EXPRESSION, {"math": math, "abs": abs, "x": x}) for x in amostra]
+	tempo_escalar = (time.perf_counter() - inicio) * tamanho / len(amostra)
+
+	inicio = time.perf_counter()
+	vetor = evaluate_array(EXPRESSION, xs)
+	tempo_vetor = time.perf_counter() - inicio
+
+	assert np.allclose(vetor[:SCALAR_SAMPLE], escalar)
+	print(f"{tamanho:,} valores de x")
+	print(f"eval escalar (extrapolado): {tempo_escalar:.3f} s")
+	print(f"evaluate_array            : {tempo_vetor:.3f} s")
+	print(f"ganho                     : {tempo_escalar / tempo_vetor:.0f}x")
+
+	for angle in (RADIANS, DEGREES):  # A conversão de graus fica na árvore compilada: custo de uma multiplicação
+		evaluate_array(TRIG_EXPRESSION, xs[:10], angle=angle)  # Compila fora da medição
+		inicio = time.perf_counter()
+		evaluate_array(TRIG_EXPRESSION, xs, angle=angle)
+		print(f"{'trigonométricas (' + angle + ')':26}: {time.perf_counter() - inicio:.3f} s")
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000000)
@@ -0,0 +1,188 @@
+"""Cálculo numérico vetorizado: integral, derivada e raízes de expressões em x.
+
+As expressões usam o vocabulário do teclado ("math.sin(", "**", "abs("...) com
+a variável x e são compiladas uma vez pelo motor. Todas as funções aceitam
+arrays (de limites, de pontos ou de chutes iniciais) e avaliam a expressão
+para todos eles de uma vez com o NumPy, em vez de chamar a expressão escalar
+em um laço do Python: cada passada do algoritmo é uma única avaliação.
+Parâmetros passados como arrays em `values` (ex.: c em "x**3-c") entram no mesmo
+lote, o que resolve muitas integrandas ou equações diferentes de uma vez.
+"""
+
+import numpy as np  # Dependência opcional: só os recursos vetorizados precisam dela
+
+from engine import RADIANS, compile_expression  # Mesmo parser/cache do modo escalar
+from vectorized import NAMESPACE  # Ufuncs no lugar das funções de math
+
+VARIABLE = "x"  # Variável de integração/derivação
+TOLERANCE = 1e-10  # Erro relativo desejado
+MAX_PASSES = 30  # Divisões de intervalo na integral (cada passada divide ao meio os que não convergiram)
+MAX_INTERVALS = 200_000  # Intervalos ativos por passada antes de aceitar as estimativas
+MAX_ITERATIONS = 100  # Iterações na busca de raízes
+
+# Gauss–Kronrod 7-15 (QUADPACK qk15): nós em [-1, 1] e pesos de Kronrod e de Gauss
+_KRONROD_NODES = np.array([
+	0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+	0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+	0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+	0.207784955007898467600689403773245, 0.0,
+])
+_KRONROD_WEIGHTS = np.array([
+	0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+	0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+	0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+	0.204432940075298892414161999234649, 0.209482141084727828012999174891714,
+])
+_GAUSS_WEIGHTS = np.array([  # Nos nós de índice ímpar de _KRONROD_NODES (1, 3, 5 e o centro)
+	0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+	0.381830050505118944950369775488975, 0.417959183673469387755102040816327,
+])
+_NODES = np.concatenate((-_KRONROD_NODES[:-1], _KRONROD_NODES[::-1]))  # 15 nós em ordem crescente
+_WEIGHTS_K = np.concatenate((_KRONROD_WEIGHTS[:-1], _KRONROD_WEIGHTS[::-1]))
+_WEIGHTS_G = np.zeros(15)
+_WEIGHTS_G[[1, 3, 5, 7, 9, 11, 13]] = np.concatenate((_GAUSS_WEIGHTS[:-1], _GAUSS_WEIGHTS[::-1]))
+
+
+def _batch(expression, angle, values, *arrays):
+	"""Compila a expressão e alinha os arrays de entrada e os parâmetros que forem arrays em um só lote.
+
+	Retorna (f, formato do lote, arrays achatados). f(x, rows) avalia a expressão
+	para as linhas `rows` do lote: x tem uma linha por elemento (e colunas opcionais,
+	como os 15 nós da integral), e cada parâmetro array é alinhado às linhas de x.
+	"""
+	values = dict(values or {})
+	compiled = compile_expression(expression, tuple(sorted({VARIABLE, *values})), angle)
+	names = [name for name, value in values.items() if np.ndim(value)]  # Parâmetros que variam no lote (várias integrandas)
+	broadcast = np.broadcast_arrays(*(np.asarray(array, dtype=float) for array in arrays), *(np.asarray(values[name]) for name in names))
+	flat = [array.ravel() for array in broadcast]
+	parameters = dict(zip(names, flat[len(arrays):]))
+
+	def f(x, rows):
+		local = dict(values)
+		for name, column in parameters.items():
+			local[name] = column[rows].reshape((len(rows),) + (1,) * (x.ndim - 1))
+		local[VARIABLE] = x
+		with np.errstate(all="ignore"):
+			y = np.asarray(compiled.run(NAMESPACE, local), dtype=float)
+		if y.shape != x.shape:  # Expressão sem x: replica a constante
+			return np.broadcast_to(y, x.shape).copy()
+		return y
+
+	return f, broadcast[0].shape, flat[:len(arrays)]
+
+
+def _result(array, shape):
+	"""Escalar se a entrada era escalar; senão, array no formato da entrada."""
+	return array.reshape(shape) if shape else float(array[0])
+
+
+def integrate(expression, a, b, *, angle=RADIANS, tolerance=TOLERANCE, values=None):
+	"""Integral da expressão em x de a até b (Gauss–Kronrod adaptativo).
+
+	a e b podem ser arrays (com broadcast): todas as integrais avançam juntas, e
+	cada passada avalia os 15 nós de todos os intervalos ativos em uma só chamada.
+	Intervalos cujo erro estimado passa da sua parte da tolerância são divididos
+	ao meio na passada seguinte. Integrais que não convergem retornam a melhor estimativa.
+	"""
+	f, shape, (a, b) = _batch(expression, angle, values, a, b)
+	total = np.zeros(len(a))
+	span = np.abs(b - a)
+	scale = None  # Tamanho de cada integral (primeira estimativa), para a tolerância relativa
+	owner = np.arange(len(a))  # Integral a que cada intervalo ativo pertence
+	low, high = a, b
+	for passes in range(MAX_PASSES + 1):
+		center = (low + high) / 2
+		half = (high - low) / 2
+		y = f(center[:, None] + half[:, None] * _NODES, owner)
+		kronrod = half * (y @ _WEIGHTS_K)
+		error = np.abs(kronrod - half * (y @ _WEIGHTS_G))
+		if scale is None:
+			scale = np.maximum(np.abs(kronrod), 1.0)
+		with np.errstate(invalid="ignore", divide="ignore"):
+			allowed = tolerance * scale[owner] * np.abs(high - low) / span[owner]  # Parte da tolerância proporcional ao intervalo
+		done = ~(error > allowed) | (passes == MAX_PASSES) | (len(low) > MAX_INTERVALS)  # nan também encerra
+		np.add.at(total, owner[done], kronrod[done])
+		if done.all():
+			break
+		rest = ~done
+		owner = np.concatenate((owner[rest], owner[rest]))
+		low, high = np.concatenate((low[rest], center[rest])), np.concatenate((center[rest], high[rest]))
+	return _result(total, shape)
+
+
+def derivative(expression, x, *, angle=RADIANS, values=None):
+	"""Derivada da expressão em x (diferença central com extrapolação de Richardson).
+
+	Os quatro pontos de cada x (±h e ±h/2) são avaliados em uma só chamada.
+	O erro de truncamento é O(h**4); h acompanha a magnitude de x.
+	"""
+	f, shape, (x,) = _batch(expression, angle, values, x)
+	h = 1e-3 * np.maximum(np.abs(x), 1.0)
+	offsets = np.array([-1.0, 1.0, -0.5, 0.5])
+	y = f(x[:, None] + h[:, None] * offsets, np.arange(len(x)))
+	coarse = (y[:, 1] - y[:, 0]) / (2 * h)
+	fine = (y[:, 3] - y[:, 2]) / h
+	return _result((4 * fine - coarse) / 3, shape)
+
+
+def find_root(expression, a, b=None, *, angle=RADIANS, tolerance=TOLERANCE, values=None):
+	"""Raiz da expressão em x: Newton a partir de a, ou Newton protegido por bisseção em [a, b].
+
+	Com b, f(a) e f(b) precisam ter sinais opostos; cada iteração tenta o passo de
+	Newton e, se ele sair do intervalo, usa o ponto médio, de modo que a raiz nunca
+	se perde (a mesma garantia do método de Brent). Sem b, é Newton puro.
+	a e b podem ser arrays: todas as buscas avançam juntas. Retorna nan onde não há
+	raiz no intervalo ou o método não converge.
+	"""
+	if b is None:
+		f, shape, (x,) = _batch(expression, angle, values, a)
+		return _result(_newton(f, x, tolerance), shape)
+	f, shape, (a, b) = _batch(expression, angle, values, a, b)
+	low, high = np.minimum(a, b), np.maximum(a, b)
+	rows = np.arange(len(low))
+	f_low = f(low, rows)
+	f_high = f(high, rows)
+	valid = np.sign(f_low) * np.sign(f_high) <= 0
+	x = (low + high) / 2
+	root = np.full(len(x), np.nan)
+	active = np.flatnonzero(valid)
+	for _ in range(MAX_ITERATIONS):
+		if not len(active):
+			break
+		xa, lo, hi, f_lo = x[active], low[active], high[active], f_low[active]
+		h = 1e-7 * np.maximum(np.abs(xa), 1.0)
+		y = f(np.stack((xa, xa - h, xa + h), axis=1), active)  # Valor e derivada numérica em uma só chamada
+		fx, slope = y[:, 0], (y[:, 2] - y[:, 1]) / (2 * h)
+		same = np.sign(fx) == np.sign(f_lo)  # A raiz está do lado de hi
+		lo = np.where(same, xa, lo)
+		hi = np.where(same, hi, xa)
+		f_low[active] = np.where(same, fx, f_lo)
+		with np.errstate(all="ignore"):
+			step = xa - fx / slope
+		inside = (step > lo) & (step < hi)
+		new = np.where(inside, step, (lo + hi) / 2)
+		converged = (fx == 0) | (np.abs(step - xa) <= tolerance * np.maximum(np.abs(xa), 1.0)) | (hi - lo <= tolerance * np.maximum(np.abs(lo), 1.0))
+		root[active[converged]] = np.where(inside[converged], step[converged], xa[converged])
+		x[active], low[active], high[active] = new, lo, hi
+		active = active[~converged]
+	return _result(root, shape)
+
+
+def _newton(f, x, tolerance):
+	x = x.copy()
+	root = np.full(len(x), np.nan)
+	active = np.arange(len(x))
+	for _ in range(MAX_ITERATIONS):
+		if not len(active):
+			break
+		xa = x[active]
+		h = 1e-7 * np.maximum(np.abs(xa), 1.0)
+		y = f(np.stack((xa, xa - h, xa + h), axis=1), active)
+		with np.errstate(all="ignore"):
+			new = xa - y[:, 0] / ((y[:, 2] - y[:, 1]) / (2 * h))
+		converged = (y[:, 0] == 0) | (np.abs(new - xa) <= tolerance * np.maximum(np.abs(new), 1.0))
+		lost = ~np.isfinite(new)  # Derivada nula ou fora do domínio: sem raiz a partir deste chute
+		root[active[converged]] = np.where(y[converged, 0] == 0, xa[converged], new[converged])
+		x[active] = new
+		active = active[~(converged | lost)]
+	return root
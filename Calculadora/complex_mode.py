@@ -0,0 +1,175 @@
+"""Modo complexo e matricial (tecla ℝ/ℂ e painel de matrizes), com NumPy.
+
+A expressão é a mesma do modo real e usa o mesmo avaliador compilado do cache
+do motor: só o ambiente de execução muda. As funções "math.*" viram versões
+do NumPy que aceitam complexos (math.sqrt(-4) dá 2j) e arrays, e as matrizes
+do painel entram como variáveis (A, B) do tipo Matrix, cujos operadores seguem
+a álgebra linear: A*B é o produto matricial, A**n a potência, 1/A a inversa e
+|A| o determinante. As funções (sin, exp...) são aplicadas elemento a elemento.
+"""
+
+import numpy as np  # Dependência opcional: só este modo e os recursos vetorizados precisam dela
+
+from engine import FINANCIAL_FUNCTIONS, RADIANS, compile_expression, make_globals  # Mesmo parser/cache do modo real
+
+MATRIX_NAMES = ("A", "B")  # Variáveis preenchidas pelo painel de matrizes
+
+
+class Matrix:
+	"""Matriz 2-D com os operadores da álgebra linear; números comuns continuam escalares."""
+
+	__slots__ = ("array",)
+	__array_ufunc__ = None  # Escalares do NumPy devolvem o controle aos operadores desta classe
+
+	def __init__(self, array):
+		array = np.asarray(array)
+		if array.ndim != 2:
+			raise ValueError("a matriz precisa ter duas dimensões")
+		self.array = array
+
+	@property
+	def shape(self):
+		return self.array.shape
+
+	def _square(self):
+		if self.shape[0] != self.shape[1]:
+			raise ValueError(f"a operação exige uma matriz quadrada, não {self.shape[0]}x{self.shape[1]}")
+		return self.array
+
+	def inverse(self):
+		return Matrix(np.linalg.inv(self._square()))
+
+	def __add__(self, other):
+		return Matrix(self.array + _same_shape(self, other))
+
+	def __radd__(self, other):
+		return Matrix(_same_shape(self, other) + self.array)
+
+	def __sub__(self, other):
+		return Matrix(self.array - _same_shape(self, other))
+
+	def __rsub__(self, other):
+		return Matrix(_same_shape(self, other) - self.array)
+
+	def __mul__(self, other):
+		if isinstance(other, Matrix):
+			return Matrix(self.array @ other.array)
+		return Matrix(self.array * other)
+
+	def __rmul__(self, other):
+		return Matrix(other * self.array)
+
+	def __truediv__(self, other):
+		if isinstance(other, Matrix):  # A/B = A * B⁻¹
+			return self * other.inverse()
+		return Matrix(self.array / other)
+
+	def __rtruediv__(self, other):  # k/A = k * A⁻¹ (a tecla "1/x" inverte a matriz)
+		return other * self.inverse()
+
+	def __pow__(self, exponent):
+		if isinstance(exponent, float) and exponent.is_integer():  # 2.0 vindo de outra conta
+			exponent = int(exponent)
+		if not isinstance(exponent, int):
+			raise TypeError("a potência de matriz exige um expoente inteiro")
+		return Matrix(np.linalg.matrix_power(self._square(), exponent))
+
+	def __neg__(self):
+		return Matrix(-self.array)
+
+	def __pos__(self):
+		return self
+
+	def __abs__(self):  # |A| = determinante
+		return _scalar(np.linalg.det(self._square()))
+
+	def __str__(self):  # Uma linha, para o visor: [1 2; 3 4]
+		return "[" + "; ".join(" ".join(_format(value) for value in row) for row in self.array.tolist()) + "]"
+
+	def __repr__(self):
+		return f"Matrix({self.array.tolist()!r})"
+
+
+def _same_shape(matrix, other):
+	"""Soma/subtração: matriz com matriz do mesmo formato, ou matriz com escalar (em cada elemento)."""
+	if isinstance(other, Matrix):
+		if other.shape != matrix.shape:
+			raise ValueError(f"formatos diferentes: {matrix.shape[0]}x{matrix.shape[1]} e {other.shape[0]}x{other.shape[1]}")
+		return other.array
+	return other
+
+
+def _format(value):
+	if isinstance(value, complex):
+		return str(_simplify(value))
+	return str(int(value)) if float(value).is_integer() and abs(value) < 1e15 else repr(value)
+
+
+def _simplify(value):
+	"""Complexo com parte imaginária nula vira real."""
+	return value.real if value.imag == 0 else value
+
+
+def _scalar(value):
+	"""Escalar do NumPy -> número do Python (para o visor e para voltar à expressão)."""
+	if isinstance(value, np.generic):
+		value = value.item()
+	if isinstance(value, complex):
+		return _simplify(value)
+	return value
+
+
+def _elementwise(function):
+	"""Função do NumPy aplicada a escalares, arrays e Matrix (elemento a elemento)."""
+	def apply(value):
+		if isinstance(value, Matrix):
+			return Matrix(function(value.array))
+		if isinstance(value, int):  # int além de 64 bits viraria objeto no NumPy (TypeError nas ufuncs)
+			value = float(value)
+		return _scalar(function(value))
+	return apply
+
+
+COMPLEX_FUNCTIONS = {  # Mesmas teclas do modo real, com resultados complexos fora do domínio real
+	"sqrt": _elementwise(np.emath.sqrt),
+	"sin": _elementwise(np.sin),
+	"cos": _elementwise(np.cos),
+	"tan": _elementwise(np.tan),
+	"log": _elementwise(np.emath.log),
+	"log10": _elementwise(np.emath.log10),
+	"exp": _elementwise(np.exp),
+}
+COMPLEX_BUILTINS = {
+	"abs": lambda value: _scalar(abs(value)),  # Módulo do complexo; determinante da matriz
+}
+
+NAMESPACE = make_globals(COMPLEX_FUNCTIONS, COMPLEX_BUILTINS, FINANCIAL_FUNCTIONS)  # Ambiente do modo ℂ
+
+
+def evaluate_complex(expression, *, angle=RADIANS, **values):
+	"""Avalia como engine.evaluate, mas com complexos e matrizes (reaproveita o mesmo compilado)."""
+	compiled = compile_expression(expression, sorted(values), angle)
+	with np.errstate(all="ignore"):
+		return _scalar(compiled.run(NAMESPACE, values))
+
+
+def parse_matrix(text):
+	"""Lê uma matriz digitada no painel: linhas separadas por quebra de linha ou ";",
+	elementos por espaço ou ","; aceita complexos como 1+2j (ou 1+2i)."""
+	rows = []
+	for line in text.replace(";", "\n").splitlines():
+		entries = line.replace(",", " ").split()
+		if entries:
+			rows.append([_parse_number(entry) for entry in entries])
+	if not rows or any(len(row) != len(rows[0]) for row in rows):
+		raise ValueError("todas as linhas da matriz precisam ter o mesmo número de elementos")
+	return Matrix(np.array(rows))
+
+
+def _parse_number(text):
+	for kind in (int, float):
+		try:
+			return kind(text)
+		except ValueError:
+			pass
+	return complex(text.replace("i", "j"))
@@ -0,0 +1,95 @@
+"""Núcleo da calculadora sem dependências de interface gráfica.
+
+Reúne o mapeamento teclado -> expressão (expression_buffer), o avaliador
+(engine) e o modo batch. Processos de lote e de avaliação importam apenas este
+lado, sem pagar o custo de importar o customtkinter nem precisar de display.
+
+No modo batch, cada bloco roda em um processo auxiliar do worker, com os
+mesmos limites de tempo e memória da interface, aplicados a cada linha: o
+bloco informa a linha em que está (worker.report) e adianta os resultados
+prontos. Se uma linha estoura o tempo (ex.: 9**9**9), o processo é reiniciado,
+só ela sai como "Erro" e o bloco continua da linha seguinte; apenas as linhas
+concluídas depois do último envio de resultados (PARTIAL_INTERVAL) são
+refeitas.
+"""
+
+import os  # Número de CPUs para o pool de processos
+import time  # Intervalo entre os envios de resultados prontos
+from collections import deque  # Fila de blocos em processamento
+from itertools import islice  # Leitura da entrada em blocos
+
+from engine import DEGREES, RADIANS, ExpressionError, compile_expression, evaluate  # noqa: F401 (API do núcleo)
+from expression_buffer import BUTTONS, KEYPAD, ExpressionBuffer  # noqa: F401 (API do núcleo)
+from presentation import ResultView, format_full  # noqa: F401 (API do núcleo)
+
+BATCH_CHUNK_SIZE = 2000  # Linhas enviadas a cada processo por vez
+PARTIAL_INTERVAL = 0.05  # Segundos entre os envios dos resultados prontos de um bloco ao processo principal
+
+def _evaluate_chunk(lines, angle=RADIANS, digits=None):  # Avalia um bloco de linhas dentro de um processo do pool
+	if digits:  # Modo de precisão: frações exatas e `digits` algarismos
+		from functools import partial  # Importados só aqui: o modo normal não paga por eles
+		from precision import evaluate_precise
+		evaluator = partial(evaluate_precise, digits=digits)
+	else:
+		evaluator = evaluate
+	from worker import report  # Linha atual e resultados prontos: o tempo limite vale por linha
+	results = []
+	sent, sent_at = 0, time.monotonic()
+	for index, line in enumerate(lines):
+		if time.monotonic() - sent_at > PARTIAL_INTERVAL:  # Resultados adiantados não se perdem se uma linha seguinte estourar o tempo
+			report(index, results[sent:])
+			sent, sent_at = index, time.monotonic()
+		else:
+			report(index)
+		expression = line.strip()
+		if not expression:  # Linha vazia gera linha vazia (mantém o alinhamento)
+			results.append("\n")
+			continue
+		try:
+			results.append(format_full(evaluator(expression, angle=angle)) + "\n")
+		except Exception:  # Mesma mensagem mostrada pela interface
+			results.append("Erro\n")
+	return results[sent:]  # O início do bloco já foi enviado por report
+
+def run_batch(lines, output, workers=None, chunk_size=BATCH_CHUNK_SIZE, angle=RADIANS, digits=None):  # Avalia um fluxo de expressões, uma por linha, preservando a ordem
+	from worker import EvaluationWorker  # Importado só aqui: processos com tempo e memória limitados, como na interface
+	workers = workers or os.cpu_count() or 1
+	lines = iter(lines)
+	chunks = iter(lambda: list(islice(lines, chunk_size)), [])  # Blocos até a entrada acabar
+	idle = [EvaluationWorker() for _ in range(workers)]
+	pending = deque()  # (processo, bloco) na ordem da entrada: no máximo um bloco por processo em voo
+	try:
+		for chunk in chunks:
+			if not idle:  # Escreve o bloco mais antigo antes de ler mais
+				output.writelines(_collect(*pending[0], angle, digits))
+				idle.append(pending.popleft()[0])
+			worker = idle.pop()
+			worker.submit_task(_evaluate_chunk, chunk, angle, digits)
+			pending.append((worker, chunk))
+		while pending:  # Esvazia o que ainda está em processamento
+			output.writelines(_collect(*pending.popleft(), angle, digits))
+	finally:
+		for worker in idle + [worker for worker, _ in pending]:
+			worker.close()
+	output.flush()
+
+def _collect(worker, chunk, angle, digits):  # Resultado de um bloco; a linha que estourar o tempo vira "Erro" e o resto continua
+	from worker import EvaluationError
+	results = []
+	while True:
+		try:
+			rest = worker.wait()
+		except EvaluationError:  # Tempo ou memória excedidos na linha `done` (o processo já foi reiniciado)
+			results += worker.partial
+			lost = chunk[len(worker.partial):worker.done]  # Concluídas depois do último envio: refeitas
+			failed = worker.done
+			if lost:
+				worker.submit_task(_evaluate_chunk, lost, angle, digits)
+				results += _collect(worker, lost, angle, digits)
+			results.append("Erro\n")
+			chunk = chunk[failed + 1:]
+			if not chunk:
+				return results
+			worker.submit_task(_evaluate_chunk, chunk, angle, digits)
+		else:
+			return results + worker.partial + rest
@@ -0,0 +1,265 @@
+"""Motor de expressões da calculadora.
+
+Analisa a gramática produzida por Calculator.on_button_click uma única vez,
+valida a árvore (só números, operadores e as funções do teclado) e guarda o
+avaliador compilado em um cache LRU indexado pela expressão normalizada.
+"""
+
+import ast  # Árvore sintática usada como representação intermediária
+import math  # Funções matemáticas emitidas pelo teclado
+import time  # Tempos da instrumentação opcional
+from functools import lru_cache  # Cache LRU dos avaliadores compilados
+from types import SimpleNamespace  # Espaço de nomes restrito para "math."
+
+import financial  # Funções financeiras (VF, PGTO, VPL, TIR)
+import metrics  # Instrumentação opcional (desligada: custa uma comparação com None)
+from optimizer import optimize  # Dobra de constantes e simplificações algébricas
+
+CACHE_SIZE = 4096  # Quantidade de expressões compiladas mantidas em memória
+
+RADIANS = "rad"  # Modos de ângulo das funções trigonométricas
+DEGREES = "deg"
+
+MATH_FUNCTIONS = {  # Funções "math.*" que os botões inserem na expressão
+	"sqrt": math.sqrt,  # √
+	"sin": math.sin,  # sin
+	"cos": math.cos,  # cos
+	"tan": math.tan,  # tan
+	"log": math.log,  # ln
+	"log10": math.log10,  # log
+	"exp": math.exp,  # eˣ
+}
+BUILTIN_FUNCTIONS = {  # Funções sem prefixo "math."
+	"abs": abs,  # |x|
+}
+FINANCIAL_FUNCTIONS = {  # Funções "fin.*", com vários argumentos separados por vírgula
+	"fv": financial.fv,  # VF
+	"pmt": financial.pmt,  # PGTO
+	"npv": financial.npv,  # VPL
+	"irr": financial.irr,  # TIR
+}
+TRIG_FUNCTIONS = ("math.sin", "math.cos", "math.tan")  # Afetadas pelo modo Rad/Deg
+
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Pow)  # "÷" duas vezes gera "//"
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+
+def make_globals(math_functions, builtin_functions, financial_functions):
+	"""Monta o ambiente de avaliação: sem builtins, apenas o vocabulário do teclado."""
+	return {
+		"__builtins__": {},
+		"math": SimpleNamespace(**math_functions),
+		"fin": SimpleNamespace(**financial_functions),
+		**builtin_functions,
+	}
+
+
+_GLOBALS = make_globals(MATH_FUNCTIONS, BUILTIN_FUNCTIONS, FINANCIAL_FUNCTIONS)  # Ambiente escalar padrão (float)
+_FOLDABLE = {  # Funções que o otimizador pode calcular na compilação
+	**{"math." + name: function for name, function in MATH_FUNCTIONS.items()},
+	**{"fin." + name: function for name, function in FINANCIAL_FUNCTIONS.items()},
+	**BUILTIN_FUNCTIONS,
+}
+
+
+class ExpressionError(ValueError):
+	"""Expressão fora da gramática do teclado."""
+
+
+def normalize(expression):
+	"""Remove espaços para que expressões equivalentes dividam a mesma entrada do cache."""
+	return "".join(expression.split())
+
+
+def function_name(node):
+	"""Retorna o nome ("math.sin", "fin.npv", "abs"...) chamado por um nó ast.Call, ou None."""
+	func = node.func
+	if isinstance(func, ast.Name) and func.id in BUILTIN_FUNCTIONS:
+		return func.id
+	if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+		if func.value.id == "math" and func.attr in MATH_FUNCTIONS:
+			return "math." + func.attr
+		if func.value.id == "fin" and func.attr in FINANCIAL_FUNCTIONS:
+			return "fin." + func.attr
+	return None
+
+
+def arity(name):
+	"""(mínimo, máximo) de argumentos da função; máximo None = sem limite."""
+	if name.startswith("fin."):
+		return financial.ARITY[name[4:]]
+	return 1, 1
+
+
+def _validate(node, variables):
+	"""Percorre a árvore e rejeita qualquer construção que o teclado não produz."""
+	if isinstance(node, ast.Name):
+		if node.id not in variables:
+			raise ExpressionError(f"nome desconhecido: {node.id}")
+	elif isinstance(node, ast.Constant):
+		if isinstance(node.value, bool) or not isinstance(node.value, (int, float, complex)):
+			raise ExpressionError(f"literal inválido: {node.value!r}")
+	elif isinstance(node, ast.BinOp):
+		if not isinstance(node.op, _BINARY_OPERATORS):
+			raise ExpressionError(f"operador não suportado: {type(node.op).__name__}")
+		_validate(node.left, variables)
+		_validate(node.right, variables)
+	elif isinstance(node, ast.UnaryOp):
+		if not isinstance(node.op, _UNARY_OPERATORS):
+			raise ExpressionError(f"operador não suportado: {type(node.op).__name__}")
+		_validate(node.operand, variables)
+	elif isinstance(node, ast.Call):
+		name = function_name(node)
+		if name is None:
+			raise ExpressionError("função não permitida")
+		low, high = arity(name)
+		if node.keywords or len(node.args) < low or (high is not None and len(node.args) > high):
+			raise ExpressionError(f"número de argumentos inválido para {name}")
+		for argument in node.args:
+			_validate(argument, variables)
+	else:
+		raise ExpressionError(f"construção não suportada: {type(node).__name__}")
+
+
+def parse(expression, variables=()):
+	"""Converte a expressão em uma árvore ast.Expression já validada.
+
+	variables lista os nomes livres aceitos (ex.: ("x",) na avaliação vetorizada).
+	"""
+	recorder = metrics.recorder
+	start = time.perf_counter() if recorder is not None else 0.0
+	try:
+		tree = ast.parse(expression, mode="eval")
+	except SyntaxError as exc:
+		raise ExpressionError(f"sintaxe inválida: {expression!r}") from exc
+	_validate(tree.body, variables)
+	if recorder is not None:
+		recorder.observe("parse", time.perf_counter() - start)
+	return tree
+
+
+class _DegreesTransformer(ast.NodeTransformer):
+	"""Converte o argumento de sin/cos/tan de graus para radianos dentro da própria árvore."""
+
+	def visit_Call(self, node):
+		self.generic_visit(node)
+		if function_name(node) in TRIG_FUNCTIONS:
+			node.args[0] = ast.BinOp(node.args[0], ast.Mult(), ast.Constant(math.pi / 180))
+		return node
+
+
+def to_degrees(tree):
+	"""Aplica o modo Deg uma única vez, na compilação: sin(a) vira sin(a * π/180)."""
+	return ast.fix_missing_locations(_DegreesTransformer().visit(tree))
+
+
+class CompiledExpression:
+	"""Avaliador compilado de uma expressão; pode ser chamado várias vezes."""
+
+	__slots__ = ("source", "variables", "angle", "tree", "code")
+
+	def __init__(self, source, tree, variables=(), angle=RADIANS):
+		self.source = source  # Expressão normalizada
+		self.variables = variables  # Nomes livres aceitos pela expressão
+		self.angle = angle  # Modo de ângulo já embutido na árvore
+		self.tree = tree  # Árvore validada (reaproveitada por outros avaliadores)
+		self.code = compile(tree, "<calculadora>", "eval")  # Bytecode gerado uma única vez
+
+	def __call__(self, **values):
+		if metrics.recorder is None:
+			return eval(self.code, _GLOBALS, values)
+		return self._measured(_GLOBALS, values)
+
+	def run(self, namespace, values=None):
+		"""Executa o bytecode com outro ambiente (ex.: ufuncs do NumPy no lugar de math)."""
+		if metrics.recorder is None:
+			return eval(self.code, namespace, values)  # Seguro: a árvore já foi validada
+		return self._measured(namespace, values)
+
+	def _measured(self, namespace, values):
+		"""Avaliação instrumentada: tempo, erros e chamadas de cada função do ambiente."""
+		recorder = metrics.recorder
+		counting = recorder.namespaces.get(id(namespace))
+		if counting is None or counting[0] is not namespace:
+			counting = recorder.namespaces[id(namespace)] = (namespace, _counting_globals(namespace, recorder.calls))
+		start = time.perf_counter()
+		try:
+			return eval(self.code, counting[1], values)
+		except Exception as exc:
+			recorder.error(exc)
+			raise
+		finally:
+			recorder.observe("evaluate", time.perf_counter() - start)
+
+	def __repr__(self):
+		return f"CompiledExpression({self.source!r})"
+
+
+def _counting_globals(namespace, calls):
+	"""Cópia de um ambiente de make_globals em que cada função conta as próprias chamadas em `calls`."""
+	def counted(name, function):
+		def call(*args):
+			calls[name] += 1
+			return function(*args)
+		return call
+
+	return make_globals(
+		{name: counted("math." + name, function) for name, function in vars(namespace["math"]).items()},
+		{name: counted(name, function) for name, function in namespace.items() if name not in ("__builtins__", "math", "fin")},
+		{name: counted("fin." + name, function) for name, function in vars(namespace["fin"]).items()},
+	)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_normalized(source, variables, angle, optimized):
+	recorder = metrics.recorder
+	if recorder is None:
+		return _build(source, variables, angle, optimized)
+	recorder.misses += 1
+	start = time.perf_counter()
+	try:
+		return _build(source, variables, angle, optimized)
+	except Exception as exc:
+		recorder.error(exc)
+		raise
+	finally:
+		recorder.observe("compile", time.perf_counter() - start)
+
+
+def _build(source, variables, angle, optimized):
+	tree = parse(source, variables)
+	if angle == DEGREES:
+		tree = to_degrees(tree)
+	elif angle != RADIANS:
+		raise ValueError(f"modo de ângulo desconhecido: {angle!r}")
+	if optimized:  # Depois do modo Deg, para que π/180 também seja dobrado
+		tree = optimize(tree, _FOLDABLE)
+	return CompiledExpression(source, tree, variables, angle)
+
+
+def compile_expression(expression, variables=(), angle=RADIANS, optimized=True):
+	"""Retorna o avaliador compilado da expressão, consultando o cache LRU.
+
+	optimized=False desliga a dobra de constantes (usado para comparação nos benchmarks).
+	"""
+	if metrics.recorder is not None:
+		metrics.recorder.lookups += 1
+	return _compile_normalized(normalize(expression), tuple(variables), angle, optimized)
+
+
+def evaluate(expression, *, angle=RADIANS, **values):
+	"""Avalia uma expressão do teclado (substitui o eval direto em Calculator.calculate).
+
+	values fornece as variáveis livres, ex.: evaluate("ans*2", ans=resultado_anterior).
+	"""
+	return compile_expression(expression, sorted(values), angle)(**values)
+
+
+def cache_info():
+	"""Estatísticas do cache de expressões compiladas."""
+	return _compile_normalized.cache_info()
+
+
+def clear_cache():
+	"""Esvazia o cache de expressões compiladas."""
+	_compile_normalized.cache_clear()
@@ -0,0 +1,273 @@
+"""Modelo da expressão digitada como lista de tokens.
+
+Cada tecla vira um token (operando, constante, operador, função, parêntese ou
+sufixo). Acrescentar, apagar o último token e trocar o sinal do último
+operando custam O(1) no tamanho da expressão, e cada operação devolve apenas
+o trecho do visor que mudou (Edit), em vez de reescrever o texto inteiro.
+"""
+
+import math  # Constantes π e e
+from typing import NamedTuple  # Descrição das alterações no visor
+
+OPERAND = "operand"  # Número digitado (dígitos e ponto) ou resultado anterior
+CONSTANT = "constant"  # π, e, i, a variável x do gráfico e as matrizes A e B: apagados de uma vez
+OPERATOR = "operator"  # + - * / ** e a vírgula entre argumentos
+FUNCTION = "function"  # "math.sin(", "abs(", "fin.npv(", "1/"...
+PAREN = "paren"  # ( e )
+POSTFIX = "postfix"  # "**2" e "/100", aplicados ao que vem antes
+RESULT = "result"  # Resultado grande demais para virar texto: referenciado pela variável ANSWER
+
+ANSWER = "ans"  # Nome da variável que guarda o valor de um token RESULT
+
+DIGITS = "0123456789."  # Teclas que estendem o operando atual
+
+KEYPAD = {  # Tecla -> (tipo do token, texto na expressão)
+	"√": (FUNCTION, "math.sqrt("),
+	"sin": (FUNCTION, "math.sin("),
+	"cos": (FUNCTION, "math.cos("),
+	"tan": (FUNCTION, "math.tan("),
+	"ln": (FUNCTION, "math.log("),  # ln = log base e
+	"log": (FUNCTION, "math.log10("),
+	"eˣ": (FUNCTION, "math.exp("),
+	"|x|": (FUNCTION, "abs("),
+	"VF": (FUNCTION, "fin.fv("),  # Valor futuro: VF(taxa, períodos, pagamento[, valor presente])
+	"PGTO": (FUNCTION, "fin.pmt("),  # Pagamento: PGTO(taxa, períodos, valor presente[, valor futuro])
+	"VPL": (FUNCTION, "fin.npv("),  # Valor presente líquido: VPL(taxa, fluxo0, fluxo1, ...)
+	"TIR": (FUNCTION, "fin.irr("),  # Taxa interna de retorno: TIR(fluxo0, fluxo1, ...)
+	"1/x": (FUNCTION, "1/"),
+	"x²": (POSTFIX, "**2"),
+	"%": (POSTFIX, "/100"),
+	"xʸ": (OPERATOR, "**"),
+	"÷": (OPERATOR, "/"),
+	"×": (OPERATOR, "*"),
+	"+": (OPERATOR, "+"),
+	"-": (OPERATOR, "-"),
+	",": (OPERATOR, ","),  # Separa os argumentos das funções financeiras
+	"π": (CONSTANT, str(math.pi)),
+	"e": (CONSTANT, str(math.e)),
+	"x": (CONSTANT, "x"),  # Variável livre: só o modo gráfico (tecla f(x)) a aceita
+	"i": (CONSTANT, "1j"),  # Unidade imaginária (modo ℂ)
+	"A": (CONSTANT, "A"),  # Matrizes do painel (modo ℂ)
+	"B": (CONSTANT, "B"),
+	"(": (PAREN, "("),
+	")": (PAREN, ")"),
+}
+
+BUTTONS = [  # Matriz com os textos dos botões (linhas da grade do teclado)
+	["sin", "cos", "tan", "Rad", "√", "C", "(", ")"],
+	["ln", "log", "1/x", "%", "7", "8", "9", "÷"],
+	["eˣ", "x²", "xʸ", "|x|", "4", "5", "6", "×"],
+	["π", "e", "+/-", ".", "1", "2", "3", "-"],
+	["x", "f(x)", "∫", "d/dx", "0", "=", "+", "raiz"],
+	["VF", "PGTO", "VPL", "TIR", ",", "ℝ", "i", "[A]"]
+]
+
+
+def _is_number(text):
+	"""Indica se o texto é um número real sem sinal ("5", "2.5", "1e-07")."""
+	if not text or text[0] not in DIGITS:
+		return False
+	try:
+		float(text)
+	except ValueError:
+		return False
+	return True
+
+
+class Edit(NamedTuple):
+	"""Alteração no visor: apaga `deleted` caracteres a partir de `start` e insere `inserted`."""
+	start: int
+	deleted: int
+	inserted: str
+
+
+class Token:
+	"""Um pedaço da expressão; operandos e constantes podem estar negados."""
+
+	__slots__ = ("kind", "text", "negative")
+
+	def __init__(self, kind, text, negative=False):
+		self.kind = kind
+		self.text = text
+		self.negative = negative
+
+	def render(self):
+		"""Texto mostrado no visor."""
+		if self.negative:  # O parêntese garante que o sinal vale só para este operando (ex.: (-2)**2)
+			return "(-" + self.text + ")"
+		return self.text
+
+	def source(self):
+		"""Texto enviado ao motor; difere do visor apenas para tokens RESULT."""
+		if self.kind == RESULT:
+			return "(-" + ANSWER + ")" if self.negative else ANSWER
+		return self.render()
+
+	def opens(self):
+		"""Indica se o token abre um parêntese ("(" ou "math.sin(")."""
+		return self.kind in (FUNCTION, PAREN) and self.text.endswith("(")
+
+	def is_incomplete(self):
+		"""Indica se a expressão não pode terminar neste token (operador, função aberta, "(-" vazio)."""
+		return self.kind == OPERATOR or self.opens() or self.text == "1/" or (self.kind == OPERAND and not self.text)
+
+	def __repr__(self):
+		return f"Token({self.kind!r}, {self.render()!r})"
+
+
+class ExpressionBuffer:
+	"""Expressão da calculadora mantida como lista de tokens."""
+
+	def __init__(self):
+		self.tokens = []
+		self.length = 0  # Tamanho do texto renderizado, mantido incrementalmente
+		self.depth = 0  # Parênteses abertos e ainda não fechados
+		self.result_value = None  # Valor referenciado por um token RESULT
+
+	@property
+	def text(self):
+		"""Expressão como aparece no visor."""
+		return "".join(token.render() for token in self.tokens)
+
+	@property
+	def expression(self):
+		"""Expressão completa, no formato aceito pelo motor (engine)."""
+		return "".join(token.source() for token in self.tokens)
+
+	def completed(self):
+		"""Expressão fechada para a prévia: descarta o final incompleto e fecha os parênteses."""
+		end = len(self.tokens)
+		depth = self.depth
+		while end and self.tokens[end - 1].is_incomplete():
+			end -= 1
+			depth -= self.tokens[end].opens()
+		return "".join(token.source() for token in self.tokens[:end]) + ")" * max(depth, 0)
+
+	def values(self):
+		"""Variáveis livres da expressão (o resultado anterior, se houver)."""
+		if self.result_value is None:
+			return {}
+		return {ANSWER: self.result_value}
+
+	def __len__(self):
+		return self.length
+
+	def press(self, key):
+		"""Aplica uma tecla do teclado (exceto "C", "=", "Rad" e "+/-")."""
+		last = self.tokens[-1] if self.tokens else None
+		if key in DIGITS:
+			if last is not None and last.kind == OPERAND:
+				return self._extend(last, key)
+			if last is not None and self._ends_operand(last):  # i5 é i×5, (2)5 é (2)×5, ans5 é ans×5: o dígito não os estende
+				return self._implicit_product(Token(OPERAND, key))
+			return self._push(Token(OPERAND, key))
+		try:
+			kind, text = KEYPAD[key]
+		except KeyError:
+			raise ValueError(f"tecla desconhecida: {key!r}") from None
+		if kind == CONSTANT and last is not None and self._ends_operand(last):  # 2i é 2×i, não "21j"
+			return self._implicit_product(Token(kind, text))
+		return self._push(Token(kind, text))
+
+	def backspace(self):
+		"""Apaga o último caractere do operando atual ou o último token inteiro."""
+		if not self.tokens:
+			return Edit(0, 0, "")
+		last = self.tokens[-1]
+		if last.kind == OPERAND and last.text and (len(last.text) > 1 or last.negative):
+			last.text = last.text[:-1]
+			end = self.length - (1 if last.negative else 0)  # Antes do ")" do operando negado
+			self.length -= 1
+			return Edit(end - 1, 1, "")
+		self.tokens.pop()
+		self.depth -= self._depth_change(last)
+		size = len(last.render())
+		self.length -= size
+		return Edit(self.length, size, "")
+
+	def toggle_sign(self):
+		"""Troca o sinal do último operando (ou inicia um operando negativo)."""
+		last = self.tokens[-1] if self.tokens else None
+		if last is not None and last.kind in (OPERAND, CONSTANT, RESULT):
+			old = last.render()
+			if last.kind == OPERAND and not last.negative and last.text.startswith("-"):  # Expressão do histórico começando com "-"
+				last.text = last.text[1:]
+			else:
+				last.negative = not last.negative
+			new = last.render()
+			start = self.length - len(old)
+			self.length += len(new) - len(old)
+			return Edit(start, len(old), new)
+		if last is None or last.kind in (OPERATOR, FUNCTION) or last.text == "(":
+			return self._push(Token(OPERAND, "", negative=True))
+		return Edit(self.length, 0, "")  # Depois de ")" ou de um sufixo não há operando para negar
+
+	def clear(self):
+		"""Esvazia a expressão."""
+		edit = Edit(0, self.length, "")
+		self.tokens = []
+		self.length = 0
+		self.depth = 0
+		self.result_value = None
+		return edit
+
+	def load(self, text):
+		"""Substitui a expressão por um único operando (ex.: o resultado do "=").
+
+		Um número negativo vira operando negado: "-5" aparece como "(-5)", e x² dá (-5)**2.
+		"""
+		if text.startswith("-") and _is_number(text[1:]):
+			token = Token(OPERAND, text[1:], negative=True)
+		else:
+			token = Token(OPERAND, text)
+		rendered = token.render()
+		edit = Edit(0, self.length, rendered)
+		self.tokens = [token] if text else []
+		self.length = len(rendered)
+		self.depth = 0
+		self.result_value = None
+		return edit
+
+	def load_value(self, value, text):
+		"""Substitui a expressão por um resultado mantido como valor; text é só o que o visor mostra."""
+		edit = Edit(0, self.length, text)
+		self.tokens = [Token(RESULT, text)]
+		self.length = len(text)
+		self.depth = 0
+		self.result_value = value
+		return edit
+
+	def _push(self, token):
+		rendered = token.render()
+		start = self.length
+		self.tokens.append(token)
+		self.length += len(rendered)
+		self.depth += self._depth_change(token)
+		return Edit(start, 0, rendered)
+
+	def _implicit_product(self, token):
+		"""Acrescenta "*" e o token: a multiplicação implícita de 2π, 2i, i5 ou (1+2)5."""
+		start = self.length
+		self._push(Token(OPERATOR, "*"))
+		return Edit(start, 0, "*" + self._push(token).inserted)
+
+	@staticmethod
+	def _ends_operand(token):
+		"""Indica se o token termina um operando (número, constante, resultado, sufixo ou ")")."""
+		if token.kind == OPERAND:
+			return bool(token.text)
+		return token.kind in (CONSTANT, RESULT, POSTFIX) or token.text == ")"
+
+	@staticmethod
+	def _depth_change(token):
+		if token.opens():
+			return 1
+		if token.text == ")":
+			return -1
+		return 0
+
+	def _extend(self, token, chars):
+		start = self.length - (1 if token.negative else 0)  # Antes do ")" do operando negado
+		token.text += chars
+		self.length += len(chars)
+		return Edit(start, 0, chars)
@@ -0,0 +1,88 @@
+"""Funções financeiras da calculadora (teclas VF, PGTO, VPL e TIR).
+
+Entram na expressão como "fin.fv(", "fin.pmt(", "fin.npv(" e "fin.irr(", com
+argumentos separados por vírgula. Seguem a convenção de sinais das planilhas:
+dinheiro que sai é negativo e dinheiro que entra é positivo. Só usam a
+biblioteca padrão; as versões vetorizadas ficam em financial_vectorized.
+"""
+
+IRR_GUESS = 0.1  # Taxa inicial da TIR
+IRR_TOLERANCE = 1e-12  # Precisão relativa da TIR (no fator de desconto)
+IRR_MAX_ITERATIONS = 100
+IRR_MAX_FACTOR = 2.0 ** 30  # Maior fator de desconto procurado (taxa perto de -100%)
+
+ARITY = {  # Função -> (mínimo, máximo) de argumentos; None = sem máximo
+	"fv": (3, 4),
+	"pmt": (3, 4),
+	"npv": (2, None),
+	"irr": (2, None),
+}
+
+
+def fv(rate, nper, pmt, pv=0):
+	"""Valor futuro de `pv` hoje mais `nper` pagamentos `pmt` no fim de cada período, à taxa `rate`."""
+	if rate == 0:
+		return -(pv + pmt * nper)
+	growth = (1 + rate) ** nper
+	return -(pv * growth + pmt * (growth - 1) / rate)
+
+
+def pmt(rate, nper, pv, fv=0):
+	"""Pagamento por período que leva o valor presente `pv` ao valor futuro `fv` em `nper` períodos."""
+	if rate == 0:
+		return -(pv + fv) / nper
+	growth = (1 + rate) ** nper
+	return -(fv + pv * growth) * rate / (growth - 1)
+
+
+def npv(rate, *flows):
+	"""Valor presente líquido dos fluxos; o primeiro é o do instante zero (não é descontado)."""
+	factor = 1 / (1 + rate)
+	total = 0
+	for flow in reversed(flows):  # Horner no fator de desconto
+		total = total * factor + flow
+	return total
+
+
+def irr(*flows):
+	"""Taxa interna de retorno: a taxa em que npv(taxa, *flows) é zero.
+
+	Resolve no fator de desconto t = 1/(1+taxa), em que o VPL é um polinômio:
+	procura um intervalo com troca de sinal e usa Newton protegido por bisseção.
+	Levanta ValueError se os fluxos não trocam de sinal (não há TIR) ou se não
+	convergir em IRR_MAX_ITERATIONS iterações (ex.: raiz de multiplicidade alta).
+	"""
+	low, high = 0.0, 1.0  # t = 0 (taxa infinita) e t = 1 (taxa zero)
+	value_low = flows[0]
+	if value_low == 0:
+		raise ValueError("TIR indefinida: o primeiro fluxo é zero")
+	while _polynomial(flows, high)[0] * value_low > 0 and high < IRR_MAX_FACTOR:
+		low, high = high, high * 2  # Taxa negativa: t > 1
+	if _polynomial(flows, high)[0] * value_low > 0:
+		raise ValueError("TIR não encontrada: os fluxos não trocam de sinal")
+	value_low = _polynomial(flows, low)[0]
+	t = min(max(1 / (1 + IRR_GUESS), low), high)
+	for _ in range(IRR_MAX_ITERATIONS):
+		value, slope = _polynomial(flows, t)
+		if value == 0:
+			break
+		if (value > 0) == (value_low > 0):
+			low, value_low = t, value
+		else:
+			high = t
+		step = t - value / slope if slope else low
+		if abs(step - t) <= IRR_TOLERANCE * t:  # O passo de Newton já é menor que a tolerância
+			break
+		t = step if low < step < high else (low + high) / 2
+	else:
+		raise ValueError(f"TIR não convergiu em {IRR_MAX_ITERATIONS} iterações")
+	return 1 / t - 1
+
+
+def _polynomial(flows, t):
+	"""Valor e derivada de sum(flows[k] * t**k) pelo método de Horner."""
+	value = slope = 0.0
+	for flow in reversed(flows):
+		slope = slope * t + value
+		value = value * t + flow
+	return value, slope
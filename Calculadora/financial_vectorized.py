@@ -0,0 +1,108 @@
+"""Funções financeiras vetorizadas (NumPy): as mesmas de financial, para arrays.
+
+fv e pmt fazem broadcast de todos os argumentos. npv e irr recebem os fluxos
+como um array 2-D (uma série por linha, um período por coluna) e tratam todas
+as séries de uma vez: a TIR usa Newton protegido por bisseção, com cada
+iteração avaliando o polinômio do VPL de todas as séries ainda ativas.
+"""
+
+import numpy as np  # Dependência opcional: só os recursos vetorizados precisam dela
+
+from financial import IRR_GUESS, IRR_MAX_FACTOR, IRR_MAX_ITERATIONS, IRR_TOLERANCE  # Mesmos parâmetros do modo escalar
+
+
+def fv(rate, nper, pmt, pv=0):
+	"""Valor futuro (ver financial.fv), com broadcast."""
+	rate, nper, pmt, pv = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (rate, nper, pmt, pv)))
+	with np.errstate(all="ignore"):
+		growth = (1 + rate) ** nper
+		annuity = np.where(rate == 0, nper, (growth - 1) / rate)
+	return -(pv * growth + pmt * annuity)
+
+
+def pmt(rate, nper, pv, fv=0):
+	"""Pagamento por período (ver financial.pmt), com broadcast."""
+	rate, nper, pv, fv = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (rate, nper, pv, fv)))
+	with np.errstate(all="ignore"):
+		growth = (1 + rate) ** nper
+		return np.where(rate == 0, -(pv + fv) / nper, -(fv + pv * growth) * rate / (growth - 1))
+
+
+def npv(rate, flows):
+	"""VPL de cada série (linha) de `flows`; rate é um escalar ou uma taxa por série."""
+	columns = np.moveaxis(np.asarray(flows, dtype=float), -1, 0)
+	with np.errstate(all="ignore"):
+		return _polynomial(columns, 1 / (1 + np.asarray(rate, dtype=float)))[0]
+
+
+def irr(flows):
+	"""TIR de cada série (linha) de `flows`; nan onde financial.irr levanta ValueError.
+
+	Mesmo método de financial.irr, no fator de desconto t = 1/(1+taxa): o intervalo
+	inicial [0, 1] é dobrado só nas séries de taxa negativa, e as séries que convergem
+	saem do lote, de modo que cada iteração só trabalha com as que faltam. Séries
+	sem troca de sinal ou que não convergem em IRR_MAX_ITERATIONS ficam com nan.
+	"""
+	flows = np.atleast_2d(np.asarray(flows, dtype=float))
+	columns = np.ascontiguousarray(flows.T)  # Um período por linha: o Horner percorre memória contígua
+	count = len(flows)
+	low = np.zeros(count)
+	high = np.ones(count)
+	first = columns[0]
+	value_high = columns.sum(axis=0)  # VPL com taxa zero (t = 1)
+	grow = np.flatnonzero((value_high * first > 0) & (first != 0))
+	while len(grow) and high[grow[0]] < IRR_MAX_FACTOR:  # Todas as séries em grow têm o mesmo high
+		low[grow], high[grow] = high[grow], high[grow] * 2
+		value_high[grow] = _polynomial(columns[:, grow], high[grow])[0]
+		grow = grow[value_high[grow] * first[grow] > 0]
+	root = np.full(count, np.nan)
+	active = np.flatnonzero((first != 0) & (value_high * first <= 0))
+	columns, low, high = columns[:, active], low[active], high[active]  # Estado só das séries ativas
+	value_low = np.where(low == 0, columns[0], _polynomial(columns, low)[0])
+	t = np.clip(1 / (1 + IRR_GUESS), low, high)
+	for _ in range(IRR_MAX_ITERATIONS):
+		if not len(active):
+			break
+		value, slope = _polynomial(columns, t)
+		same = np.sign(value) == np.sign(value_low)
+		low = np.where(same, t, low)
+		high = np.where(same, high, t)
+		value_low = np.where(same, value, value_low)
+		with np.errstate(all="ignore"):
+			step = t - value / slope
+		new = np.where((step > low) & (step < high), step, (low + high) / 2)
+		converged = (value == 0) | (np.abs(step - t) <= IRR_TOLERANCE * t)  # O passo de Newton já é menor que a tolerância
+		if converged.any():  # Compacta o lote: as próximas iterações só tocam as séries restantes
+			root[active[converged]] = t[converged]
+			keep = ~converged
+			active, columns, new, low, high, value_low = active[keep], columns[:, keep], new[keep], low[keep], high[keep], value_low[keep]
+		t = new
+	with np.errstate(divide="ignore"):
+		return 1 / root - 1
+
+
+def _polynomial(columns, t):
+	"""Valor e derivada de sum(columns[k] * t**k) em cada série, pelo método de Horner."""
+	value = np.zeros(np.broadcast_shapes(columns.shape[1:], np.shape(t)))
+	slope = np.zeros_like(value)
+	for row in columns[::-1]:  # Um passo por período, sobre todas as séries
+		slope = slope * t + value
+		value = value * t + row
+	return value, slope
+
+
+def _npv_call(rate, *flows):  # fin.npv(taxa, f0, f1, ...) dentro de evaluate_array
+	return npv(rate, np.stack(np.broadcast_arrays(*(np.asarray(flow, dtype=float) for flow in flows)), axis=-1))
+
+
+def _irr_call(*flows):  # fin.irr(f0, f1, ...) dentro de evaluate_array
+	stacked = np.stack(np.broadcast_arrays(*(np.asarray(flow, dtype=float) for flow in flows)), axis=-1)
+	return irr(stacked.reshape(-1, len(flows))).reshape(stacked.shape[:-1])
+
+
+ARRAY_FUNCTIONS = {  # Nome após "fin." -> versão para o ambiente vetorizado
+	"fv": fv,
+	"pmt": pmt,
+	"npv": _npv_call,
+	"irr": _irr_call,
+}
@@ -0,0 +1,332 @@
+"""Interface gráfica (CustomTkinter) da calculadora, carregada só quando a janela é aberta."""
+
+import math  # isnan nos resultados do cálculo numérico
+import customtkinter as ctk  # Importa a biblioteca customtkinter para interface moderna
+import tkinter as tk  # Exceções do Tk (TclError)
+from expression_buffer import BUTTONS, ExpressionBuffer  # Modelo da expressão em tokens e matriz do teclado
+from presentation import ResultView  # Apresentação de resultados enormes
+from preview import preview_summary  # Prévia incremental do resultado (no processo da prévia)
+from keypad import CanvasKeypad  # Teclado desenhado em um único canvas
+from engine import DEGREES, RADIANS  # Modos de ângulo
+from history import History  # Histórico persistente de cálculos
+from worker import EVAL_MEMORY_LIMIT, EVAL_TIMEOUT, PENDING, EvaluationWorker  # Avaliação em processo separado
+
+ctk.set_appearance_mode("dark")  # Define o modo escuro
+ctk.set_default_color_theme("dark-blue")  # Define o tema de cor escuro
+
+POLL_INTERVAL_MS = 20  # Intervalo entre consultas ao processo de avaliação
+PREVIEW_DELAY_MS = 150  # Espera após a última tecla antes de atualizar a prévia
+CALCULUS_KEYS = {  # Tecla -> (função de calculus, pergunta feita ao usuário)
+	"∫": ("integrate", "Limites de integração a;b"),
+	"d/dx": ("derivative", "Ponto x"),
+	"raiz": ("find_root", "Intervalo a;b (ou chute inicial x0)"),
+}
+
+class Calculator(ctk.CTk):  # Define a classe principal da calculadora
+	def __init__(self, timeout=EVAL_TIMEOUT, memory_limit=EVAL_MEMORY_LIMIT):  # Inicializa a janela
+		super().__init__()  # Inicializa a classe base CTk
+		self.title("Calculadora Científica")  # Define o título da janela
+		self.geometry("600x502")  # Define o tamanho da janela
+		self.configure(bg="black")  # Define o fundo preto
+
+		self.buffer = ExpressionBuffer()  # Armazena a expressão digitada como lista de tokens
+		self.display_stale = False  # Indica que o visor mostra "Erro" em vez da expressão
+		self.angle = RADIANS  # Modo de ângulo de sin/cos/tan (tecla Rad/Deg)
+		self.complex_mode = False  # Modo ℂ: complexos e matrizes com NumPy (tecla ℝ/ℂ)
+		self.matrices = {}  # Nome ("A", "B") -> matriz definida no painel
+		self.digits = None  # Algarismos do modo de precisão (Ctrl+P); None = float
+		self.worker = EvaluationWorker(timeout, memory_limit)  # Processo aquecido que avalia as expressões
+		self.preview_worker = EvaluationWorker(timeout, memory_limit)  # Processo da prévia: uma prévia cara não trava a janela nem o "="
+		self.poll_job = None  # Consulta agendada ao processo do "=" (cancelada pelo "C")
+		self.protocol("WM_DELETE_WINDOW", self.on_close)  # Encerra o processo junto com a janela
+		try:
+			self.history = History()  # Log em ~/.calculadora; abrir não relê o histórico
+		except OSError:  # Sem permissão de escrita: a calculadora funciona sem histórico
+			self.history = None
+		self.submitted_text = ""  # Expressão (como no visor) enviada no último "="
+		self.bind("<Control-h>", self.show_history)  # Ctrl+H abre o histórico
+		self.bind("<Control-p>", self.ask_precision)  # Ctrl+P liga/desliga o modo de precisão
+
+		self.display = ctk.CTkEntry(self, font=("Arial", 28), width=560, height=50, justify="right", fg_color="black", text_color="white")  # Campo de texto para mostrar a expressão/resultados
+		self.display.grid(row=0, column=0, columnspan=8, padx=20, pady=(20,10))  # Posiciona o campo de texto
+		self.display.bind("<BackSpace>", self.on_backspace)  # Apaga pelo modelo de tokens
+		self.display.bind("<Double-Button-1>", self.show_full_result)  # Duplo clique mostra todos os dígitos
+		self.result_view = None  # Último resultado calculado
+
+		self.preview_job = None  # Atualização da prévia agendada (debounce)
+		self.preview_outdated = False  # O visor mudou enquanto a prévia anterior calculava
+		self.preview_label = ctk.CTkLabel(self, text="", font=("Arial", 16), text_color="gray", anchor="e", width=560)  # Linha com a prévia do resultado
+		self.preview_label.grid(row=1, column=0, columnspan=8, padx=20)  # Logo abaixo do visor
+
+		self.keypad = CanvasKeypad(self, BUTTONS, self.on_key, bg=ctk.ThemeManager.theme["CTk"]["fg_color"][1])  # Teclado inteiro em um único canvas (mesma cor de fundo da janela no modo escuro)
+		self.keypad.grid(row=2, column=0, columnspan=8, padx=14, pady=(0, 10))  # Posiciona o teclado abaixo da prévia
+
+	def on_key(self, char):  # Tecla solta sobre o teclado
+		if char == "=":  # Botão de igual
+			self.calculate()
+		else:
+			self.on_button_click(char)
+
+	def on_button_click(self, char):  # Função chamada ao clicar em um botão
+		if self.worker.busy:  # Enquanto calcula, só "C" tem efeito (cancela o cálculo)
+			if char != "C":
+				return
+			self.worker.cancel()
+			if self.poll_job is not None:  # Senão a consulta antiga continuaria ao lado da do próximo cálculo
+				self.after_cancel(self.poll_job)
+				self.poll_job = None
+			self.display_stale = True
+		if char == "C":  # Limpa a expressão
+			edit = self.buffer.clear()
+		elif char == "Rad":  # Alterna radiano/grau
+			self.angle = DEGREES if self.angle == RADIANS else RADIANS
+			self.keypad.set_label("Rad", "Deg" if self.angle == DEGREES else "Rad")  # A tecla mostra o modo atual
+			self.schedule_preview()  # A prévia muda com o modo
+			return
+		elif char == "ℝ":  # Alterna modo real/complexo
+			self.set_complex_mode(not self.complex_mode)
+			return
+		elif char == "[A]":  # Painel de matrizes
+			self.show_matrices()
+			return
+		elif char == "f(x)":  # Gráfico da expressão em x
+			self.show_plot()
+			return
+		elif char in CALCULUS_KEYS:  # Integral, derivada ou raiz da expressão em x
+			self.run_calculus(char)
+			return
+		elif char == "+/-":  # Troca o sinal do último operando
+			edit = self.buffer.toggle_sign()
+		else:  # Números, operadores, funções, constantes e parênteses (ver expression_buffer.KEYPAD)
+			edit = self.buffer.press(char)
+			if char == "i" and not self.complex_mode:  # Unidade imaginária só faz sentido no modo ℂ
+				self.set_complex_mode(True)
+		self.apply_edit(edit)  # Atualiza só o trecho do visor que mudou
+
+	def on_backspace(self, event=None):  # Tecla Backspace apaga o último caractere/token
+		if self.worker.busy:
+			return "break"
+		self.apply_edit(self.buffer.backspace())
+		return "break"  # Impede o CTkEntry de apagar por conta própria
+
+	def apply_edit(self, edit):  # Aplica uma alteração incremental ao visor
+		if self.display_stale:  # Visor mostra "Erro": reescreve a expressão inteira uma vez
+			self.display.delete(0, ctk.END)
+			self.display.insert(0, self.buffer.text)
+			self.display_stale = False
+		else:
+			if edit.deleted:
+				self.display.delete(edit.start, edit.start + edit.deleted)
+			if edit.inserted:
+				self.display.insert(edit.start, edit.inserted)
+		self.schedule_preview()
+
+	def schedule_preview(self):  # Reagenda a prévia: só avalia quando a digitação pausa
+		if self.preview_job is not None:
+			self.after_cancel(self.preview_job)
+		self.preview_job = self.after(PREVIEW_DELAY_MS, self.update_preview)
+
+	def update_preview(self):  # Pede ao processo da prévia o valor atual da expressão, sem alterá-la
+		self.preview_job = None
+		if self.preview_worker.busy:  # A prévia anterior ainda calcula: refaz quando ela terminar
+			self.preview_outdated = True
+			return
+		self.preview_outdated = False
+		if len(self.buffer.tokens) > 1 and not self.worker.busy and not self.complex_mode and not self.digits:  # Um único token já é o próprio valor; os modos ℂ e de precisão não têm prévia
+			expression = self.buffer.completed()  # Descarta o final incompleto e fecha parênteses
+			self.preview_worker.submit_task(preview_summary, expression, self.angle, self.buffer.values())
+			self.after(POLL_INTERVAL_MS, self.poll_preview)
+		else:
+			self.preview_label.configure(text="")
+
+	def poll_preview(self):  # Mostra a prévia quando o processo dela termina
+		try:
+			summary = self.preview_worker.poll()
+		except Exception:  # Expressão ainda inválida ou cara demais (tempo ou memória excedidos): sem prévia
+			summary = None
+		if summary is PENDING:
+			self.after(POLL_INTERVAL_MS, self.poll_preview)
+			return
+		if self.preview_outdated:  # Valor de uma expressão que já mudou
+			self.update_preview()
+			return
+		self.preview_label.configure(text="" if summary is None else "= " + summary)
+
+	def calculate(self):  # Função chamada ao clicar no botão de igual
+		if self.worker.busy:  # Já existe um cálculo em andamento
+			return
+		values = {**self.matrices, **self.buffer.values()}  # Matrizes do painel e o resultado anterior
+		self.worker.submit(self.buffer.expression, values, self.angle, self.complex_mode, self.digits)  # Avalia fora do processo da interface
+		self.submitted_text = self.buffer.text
+		self.show_message("calculando…")
+		self.poll_job = self.after(POLL_INTERVAL_MS, self.poll_result, self.finish_calculation)  # Consulta o resultado sem bloquear o mainloop
+
+	def poll_result(self, finish):  # Verifica se o processo de avaliação terminou; finish recebe o resultado
+		self.poll_job = None
+		try:
+			result = self.worker.poll()
+		except Exception:  # Erro na expressão, tempo ou memória excedidos
+			self.show_error()
+			return
+		if result is PENDING:
+			self.poll_job = self.after(POLL_INTERVAL_MS, self.poll_result, finish)
+			return
+		finish(result)
+
+	def finish_calculation(self, result):  # Resultado do "=": vira o novo operando e entra no histórico
+		self.result_view = ResultView(result)  # Mantém o valor; o texto completo só é gerado sob demanda
+		if self.result_view.by_reference:  # Resumo no visor (notação científica, matriz), valor exato guardado no token
+			self.apply_edit(self.buffer.load_value(result, self.result_view.summary()))
+		else:  # Mostra o resultado, que vira o novo operando
+			self.apply_edit(self.buffer.load(self.result_view.summary()))
+		if self.history is not None:
+			self.history.append(self.submitted_text, self.result_view.summary())
+
+	def show_history(self, event=None):  # Janela de busca no histórico (trecho, ou prefixo começando com ^)
+		if self.history is None:
+			return
+		window = ctk.CTkToplevel(self)
+		window.title("Histórico")
+		search = ctk.CTkEntry(window, width=460, placeholder_text="Buscar (^ no início busca por prefixo)")
+		search.pack(padx=10, pady=(10, 5))
+		listbox = tk.Listbox(window, width=50, height=15, bg="black", fg="white", font=("Arial", 14))
+		listbox.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+		found = []  # Entradas mostradas na lista
+
+		def refresh(event=None):  # Refaz a busca a cada tecla
+			query = search.get()
+			found[:] = self.history.search_prefix(query[1:]) if query.startswith("^") else self.history.search(query)
+			listbox.delete(0, tk.END)
+			for expression, result, _ in found:
+				listbox.insert(tk.END, f"{expression} = {result}")
+
+		def choose(event=None):  # Duplo clique traz a expressão de volta ao visor
+			selection = listbox.curselection()
+			if selection and not self.worker.busy:
+				self.apply_edit(self.buffer.load(found[selection[0]][0]))
+				window.destroy()
+
+		search.bind("<KeyRelease>", refresh)
+		listbox.bind("<Double-Button-1>", choose)
+		refresh()
+
+	def ask_precision(self, event=None):  # Pergunta os algarismos do modo de precisão (0 ou vazio = float)
+		text = ctk.CTkInputDialog(text="Algarismos significativos (0 = desligado)", title="Precisão").get_input()
+		if text is None:  # Cancelado
+			return
+		try:
+			digits = int(text or 0)
+		except ValueError:
+			self.show_message("Erro")
+			return
+		self.digits = digits if digits > 0 else None
+		if self.digits:  # Frações exatas não se misturam com complexos e matrizes
+			self.set_complex_mode(False)
+		self.show_message(f"precisão: {self.digits} algarismos" if self.digits else "precisão: float")  # A próxima tecla volta a mostrar a expressão
+
+	def set_complex_mode(self, enabled):  # Liga/desliga o modo ℂ e atualiza a tecla
+		self.complex_mode = enabled
+		if enabled:
+			self.digits = None
+		self.keypad.set_label("ℝ", "ℂ" if enabled else "ℝ")
+		self.schedule_preview()
+
+	def show_matrices(self):  # Painel para digitar as matrizes A e B
+		window = ctk.CTkToplevel(self)
+		window.title("Matrizes")
+		for column, name in enumerate(("A", "B")):
+			box = ctk.CTkTextbox(window, width=220, height=140)
+			box.grid(row=0, column=column, padx=10, pady=(10, 5))
+			if name in self.matrices:
+				box.insert("1.0", str(self.matrices[name])[1:-1].replace("; ", "\n"))  # Uma linha da matriz por linha
+			insert = ctk.CTkButton(window, text="Inserir " + name, command=lambda name=name, box=box: self.insert_matrix(name, box.get("1.0", "end")))
+			insert.grid(row=1, column=column, pady=(0, 5))
+		hint = ctk.CTkLabel(window, text="Uma linha por linha da matriz, elementos separados por espaço (ex.: 1 2j)", text_color="gray")
+		hint.grid(row=2, column=0, columnspan=2, padx=10, pady=(0, 10))
+
+	def insert_matrix(self, name, text):  # Guarda a matriz digitada e insere seu nome na expressão
+		if self.worker.busy:
+			return
+		try:
+			from complex_mode import parse_matrix  # Importa o NumPy só quando o modo ℂ é usado
+			self.matrices[name] = parse_matrix(text)
+		except Exception:  # Linhas de tamanhos diferentes, número inválido ou NumPy ausente
+			self.show_message("Erro")
+			return
+		self.set_complex_mode(True)
+		self.apply_edit(self.buffer.press(name))
+
+	def show_plot(self):  # Abre uma janela com o gráfico de y = expressão (amostras calculadas no processo da janela)
+		expression = self.buffer.completed()
+		if not expression:
+			return
+		try:
+			from plot import open_plot  # Importa o NumPy só quando o gráfico é usado
+		except ImportError:  # NumPy ausente
+			self.show_message("Erro")
+			return
+		worker = EvaluationWorker(self.worker.timeout, self.worker.memory_limit)
+		open_plot(self, expression, self.angle, self.buffer.values(), title="y = " + self.buffer.text, worker=worker,
+			on_error=lambda: self.show_message("Erro"))  # Expressão inválida, tempo ou memória excedidos
+
+	def run_calculus(self, key):  # Pede os limites (ou o ponto) e calcula sobre a expressão em x, no processo do "="
+		expression = self.buffer.completed()
+		if not expression or self.worker.busy:
+			return
+		name, prompt = CALCULUS_KEYS[key]
+		text = ctk.CTkInputDialog(text=prompt, title=key).get_input()
+		if not text:  # Cancelado
+			return
+		try:
+			import calculus  # Importa o NumPy só quando o recurso é usado
+			args = [float(part) for part in text.split(";")]
+		except Exception:  # Limites inválidos, NumPy ausente
+			self.show_error()
+			return
+		self.worker.submit_task(getattr(calculus, name), expression, *args, angle=self.angle, values=self.buffer.values())
+		self.show_message("calculando…")
+		self.poll_job = self.after(POLL_INTERVAL_MS, self.poll_result, self.finish_calculus)
+
+	def finish_calculus(self, result):  # Resultado de ∫, d/dx ou raiz: vira o novo operando, como no "="
+		if math.isnan(result):  # Sem raiz no intervalo ou integral que não converge
+			self.show_error()
+			return
+		self.result_view = ResultView(result)
+		self.apply_edit(self.buffer.load(self.result_view.summary()))
+
+	def show_full_result(self, event=None):  # Abre uma janela com todos os dígitos do último resultado
+		if self.result_view is None or not self.result_view.by_reference:
+			return
+		window = ctk.CTkToplevel(self)
+		window.title("Resultado completo")
+		box = ctk.CTkTextbox(window, width=560, height=300, wrap="char")
+		box.pack(fill="both", expand=True, padx=10, pady=10)
+		self.stream_digits(box, self.result_view.chunks())
+
+	def stream_digits(self, box, chunks):  # Insere um bloco de dígitos por vez, sem travar a interface
+		try:
+			box.insert("end", next(chunks))
+		except (StopIteration, tk.TclError):  # Terminou ou a janela foi fechada
+			return
+		self.after(1, self.stream_digits, box, chunks)
+
+	def show_error(self):  # Limpa a expressão e mostra "Erro"
+		self.buffer.clear()
+		self.result_view = None
+		self.show_message("Erro")
+
+	def show_message(self, text):  # Mostra um aviso no lugar da expressão
+		self.display.delete(0, ctk.END)  # Limpa o campo de texto
+		self.display.insert(0, text)
+		self.display_stale = True  # A próxima atualização volta a mostrar a expressão
+		self.preview_label.configure(text="")
+		self.preview_outdated = True  # Uma prévia em andamento não aparece sob o aviso
+
+	def on_close(self):  # Fecha a janela e os processos de avaliação
+		if self.poll_job is not None:
+			self.after_cancel(self.poll_job)
+		self.worker.close()
+		self.preview_worker.close()
+		if self.history is not None:
+			self.history.close()
+		self.destroy()
@@ -0,0 +1,254 @@
+"""Histórico persistente de cálculos em arquivos só de acréscimo.
+
+Cada cálculo vira um registro binário (timestamp, expressão, resultado) anexado
+ao arquivo .log. A expressão também é anexada, precedida de "\\n", ao arquivo
+.txt, que é o texto de busca. O .idx guarda, para cada entrada, o deslocamento
+do registro no .log e o da expressão no .txt (16 bytes por entrada).
+
+Abrir o histórico lê só o .idx; o .log e o .txt são lidos por mmap, sob
+demanda, e nada é reprocessado na inicialização. As buscas usam o .blm: para
+cada bloco de 256 entradas, um filtro de Bloom (2 KiB) com os trechos de 1 a 3
+bytes das expressões do bloco, gravado quando o bloco se completa. Uma busca
+testa de uma vez, coluna a coluna, os bits do trecho em todos os filtros e só
+percorre no .txt, do mais recente para o mais antigo, os blocos que podem
+conter o trecho, parando ao juntar `limit` resultados.
+Filtros que faltarem no .blm (histórico anterior a ele, gravação interrompida)
+são refeitos a partir do .txt no primeiro acréscimo ou na primeira busca.
+"""
+
+import mmap  # Leitura dos arquivos sem carregá-los inteiros
+import os  # Tamanho dos arquivos
+import struct  # Cabeçalho binário dos registros
+import time  # Timestamp de cada cálculo
+from array import array  # Deslocamentos compactos
+from bisect import bisect_right  # Posição no texto -> número da entrada
+from pathlib import Path  # Caminhos dos arquivos
+
+DEFAULT_PATH = Path.home() / ".calculadora" / "historico"  # Gera historico.log, .txt e .idx
+SEARCH_LIMIT = 50  # Resultados devolvidos por busca
+
+_HEADER = struct.Struct("<dII")  # timestamp, tamanho da expressão, tamanho do resultado (bytes UTF-8)
+_INDEX = struct.Struct("<QQ")  # Deslocamento no .log, início da expressão no .txt
+_SEPARATOR = b"\n"  # Nenhuma expressão do teclado contém quebra de linha
+_BLOCK = 256  # Entradas por filtro de busca
+_BLOOM_BITS = 16384  # Bits de cada filtro
+_BLOOM_BYTES = _BLOOM_BITS // 8
+_BLOOM_SHIFT = _BLOOM_BITS.bit_length() - 1
+_MULTIPLIERS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F)  # Hash multiplicativo (64 bits), estável entre execuções
+_BIT_TABLES = [bytes(value >> bit & 1 for value in range(256)) for bit in range(8)]  # Byte -> bit `bit` dele (0 ou 1)
+
+
+def _positions(data):
+	"""Bits do filtro ocupados pelos trechos de 1 a 3 bytes de data (os dos trigramas primeiro).
+
+	Cada trecho ocupa dois bits (hash multiplicativo com dois multiplicadores),
+	para que um trecho raro não passe pelo filtro só por colidir com um comum.
+	"""
+	return list(dict.fromkeys(
+		(int.from_bytes(data[i:i + size], "little") << 2 | size) * multiplier >> 64 - _BLOOM_SHIFT & _BLOOM_BITS - 1
+		for size in (3, 2, 1) for i in range(len(data) - size + 1) for multiplier in _MULTIPLIERS
+	))
+
+
+def _grams(data):
+	"""Filtro (inteiro usado como conjunto de bits) com os trechos de 1 a 3 bytes de data."""
+	mask = 0
+	for position in _positions(data):
+		mask |= 1 << position
+	return mask
+
+
+class _GrowingMap:
+	"""mmap somente leitura de um arquivo que só cresce; é refeito quando o arquivo aumenta."""
+
+	def __init__(self, path):
+		self.path = path
+		self.map = None
+
+	def get(self, needed):
+		if self.map is None or len(self.map) < needed:
+			self.close()
+			with open(self.path, "rb") as file:
+				self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		return self.map
+
+	def close(self):
+		if self.map is not None:
+			self.map.close()
+			self.map = None
+
+
+class History:
+	"""Histórico de (expressão, resultado, timestamp) com busca por prefixo e por trecho."""
+
+	def __init__(self, path=DEFAULT_PATH):
+		path = Path(path)
+		path.parent.mkdir(parents=True, exist_ok=True)
+		self.log_path = path.with_suffix(".log")
+		self.text_path = path.with_suffix(".txt")
+		self.index_path = path.with_suffix(".idx")
+		self.filter_path = path.with_suffix(".blm")
+		self._log = open(self.log_path, "ab")
+		self._text = open(self.text_path, "ab")
+		self._index = open(self.index_path, "ab")
+		self._filter = open(self.filter_path, "ab")
+		self._log_map = _GrowingMap(self.log_path)
+		self._text_map = _GrowingMap(self.text_path)
+		self._offsets = array("Q")  # Deslocamento de cada registro no .log
+		self._starts = array("Q")  # Início de cada expressão no .txt
+		self._filters = None  # Filtros dos blocos completos, em sequência (lidos do .blm na primeira busca)
+		self._tail = None  # Filtro do bloco incompleto, ainda não gravado (None até _sync_filters)
+		self._load_index()
+
+	def _load_index(self):
+		"""Lê o .idx (16 bytes por entrada) e descarta entradas de uma gravação interrompida."""
+		pairs = array("Q")
+		size = os.path.getsize(self.index_path)
+		with open(self.index_path, "rb") as file:
+			pairs.frombytes(file.read(size - size % _INDEX.size))  # Ignora um par escrito pela metade
+		self._offsets = pairs[0::2]
+		self._starts = pairs[1::2]
+		log_size = os.path.getsize(self.log_path)
+		text_size = os.path.getsize(self.text_path)
+		while self._offsets and (self._offsets[-1] + _HEADER.size > log_size or self._starts[-1] > text_size):
+			self._offsets.pop()
+			self._starts.pop()
+		if size != len(self._offsets) * _INDEX.size:  # Os próximos acréscimos continuam do último par válido
+			self._index.truncate(len(self._offsets) * _INDEX.size)
+		text_end = self._end(len(self) - 1) if self._offsets else 0
+		if text_size > text_end:  # Expressão sem entrada no índice: não pode ser atribuída à entrada anterior
+			self._text.truncate(text_end)
+			self._text.seek(text_end)  # truncate não move a posição usada por tell() em append
+
+	def _sync_filters(self):
+		"""Completa o .blm com os filtros que faltarem e calcula o do bloco incompleto."""
+		complete = len(self) // _BLOCK
+		size = os.path.getsize(self.filter_path)
+		count = min(size // _BLOOM_BYTES, complete)
+		if size != count * _BLOOM_BYTES:  # Filtro escrito pela metade, ou de entradas descartadas do índice
+			self._filter.truncate(count * _BLOOM_BYTES)
+		for block in range(count, complete):
+			self._filter.write(self._block_filter(block).to_bytes(_BLOOM_BYTES, "little"))
+		self._filter.flush()
+		self._tail = self._block_filter(complete)
+
+	def _load_filters(self):
+		"""Lê os filtros dos blocos completos (o .blm já está em dia)."""
+		with open(self.filter_path, "rb") as file:
+			self._filters = bytearray(file.read((len(self) // _BLOCK) * _BLOOM_BYTES))
+
+	def _block_filter(self, block):
+		mask = 0
+		for number in range(block * _BLOCK, min((block + 1) * _BLOCK, len(self))):
+			mask |= _grams(self._text_map.get(self._end(number))[self._starts[number] - len(_SEPARATOR):self._end(number)])
+		return mask
+
+	def _end(self, number):
+		"""Fim da expressão `number` no .txt (o que vier depois da última entrada indexada é ignorado)."""
+		if number + 1 < len(self._starts):
+			return self._starts[number + 1] - len(_SEPARATOR)
+		offset = self._offsets[number]
+		_, expression_size, _ = _HEADER.unpack_from(self._log_map.get(offset + _HEADER.size), offset)
+		return self._starts[number] + expression_size
+
+	def __len__(self):
+		return len(self._offsets)
+
+	def append(self, expression, result, timestamp=None):
+		"""Anexa um cálculo ao log, ao texto de busca, ao índice e ao filtro do bloco."""
+		if self._tail is None:
+			self._sync_filters()
+		expression_bytes = expression.encode("utf-8")
+		result_bytes = result.encode("utf-8")
+		offset = self._log.tell()
+		start = self._text.tell() + len(_SEPARATOR)
+		self._log.write(_HEADER.pack(time.time() if timestamp is None else timestamp, len(expression_bytes), len(result_bytes)))
+		self._log.write(expression_bytes + result_bytes)
+		self._text.write(_SEPARATOR + expression_bytes)
+		self._log.flush()  # Registro e texto vão para o disco antes do índice que aponta para eles
+		self._text.flush()
+		self._index.write(_INDEX.pack(offset, start))
+		self._index.flush()
+		self._offsets.append(offset)
+		self._starts.append(start)
+		self._tail |= _grams(_SEPARATOR + expression_bytes)
+		if len(self) % _BLOCK == 0:  # Bloco completo: o filtro vai para o .blm
+			self._filter.write(self._tail.to_bytes(_BLOOM_BYTES, "little"))
+			self._filter.flush()
+			if self._filters is not None:
+				self._filters += self._tail.to_bytes(_BLOOM_BYTES, "little")
+			self._tail = 0
+
+	def entry(self, number):
+		"""Retorna (expressão, resultado, timestamp) da entrada `number` (0 = mais antiga)."""
+		offset = self._offsets[number]
+		start = offset + _HEADER.size
+		timestamp, expression_size, result_size = _HEADER.unpack_from(self._log_map.get(start), offset)
+		end = start + expression_size + result_size
+		log_map = self._log_map.get(end)
+		expression = log_map[start:start + expression_size].decode("utf-8")
+		result = log_map[start + expression_size:end].decode("utf-8")
+		return expression, result, timestamp
+
+	def recent(self, limit=SEARCH_LIMIT):
+		"""Últimas entradas, da mais recente para a mais antiga."""
+		return [self.entry(number) for number in range(len(self) - 1, max(len(self) - limit, 0) - 1, -1)]
+
+	def search(self, query, limit=SEARCH_LIMIT):
+		"""Entradas cuja expressão contém `query`, da mais recente para a mais antiga."""
+		return self._search(query.encode("utf-8"), limit)
+
+	def search_prefix(self, prefix, limit=SEARCH_LIMIT):
+		"""Entradas cuja expressão começa com `prefix`, da mais recente para a mais antiga."""
+		return self._search(_SEPARATOR + prefix.encode("utf-8"), limit, shift=len(_SEPARATOR))
+
+	def _search(self, needle, limit, shift=0):
+		if not needle.strip(_SEPARATOR) or not self._starts:
+			return self.recent(limit)
+		if self._tail is None:
+			self._sync_filters()
+		if self._filters is None:
+			self._load_filters()
+		starts = self._starts
+		text = self._text_map.get(self._end(len(starts) - 1))
+		found = []
+		for block in self._candidates(needle):
+			first = block * _BLOCK
+			low = starts[first] - len(_SEPARATOR)
+			end = self._end(min(first + _BLOCK, len(starts)) - 1)
+			while len(found) < limit:
+				position = text.rfind(needle, low, end)
+				if position < 0:
+					break
+				number = bisect_right(starts, position + shift) - 1
+				found.append(self.entry(number))
+				end = starts[number] - len(_SEPARATOR)  # Continua antes desta expressão (cada uma aparece uma vez só)
+			if len(found) >= limit:
+				break
+		return found
+
+	def _candidates(self, needle):
+		"""Blocos, do mais recente para o mais antigo, cujo filtro tem todos os trechos de needle."""
+		positions = _positions(needle)
+		complete = len(self._filters) // _BLOOM_BYTES
+		if complete < len(self) / _BLOCK and all(self._tail >> position & 1 for position in positions):
+			yield complete
+		flags = (1 << 8 * complete) - 1 if complete else 0  # Um byte por bloco: 1 enquanto o bloco for candidato
+		for position in positions:  # Trigramas primeiro: os mais seletivos zeram mais blocos
+			if not flags:
+				return
+			column = self._filters[position >> 3::_BLOOM_BYTES].translate(_BIT_TABLES[position & 7])
+			flags &= int.from_bytes(column, "little")
+		flags = flags.to_bytes(complete, "little")
+		block = flags.rfind(1)
+		while block >= 0:
+			yield block
+			block = flags.rfind(1, 0, block)
+
+	def close(self):
+		self._log_map.close()
+		self._text_map.close()
+		self._log.close()
+		self._text.close()
+		self._index.close()
+		self._filter.close()
@@ -0,0 +1,90 @@
+"""Teclado da calculadora desenhado em um único Canvas.
+
+Cada CTkButton é um widget composto com canvas próprio; com 34 teclas, o
+teclado dominava o tempo de abertura e a memória da janela. Aqui todas as
+teclas são itens de um só Canvas, montados a partir da mesma matriz `buttons`,
+e o clique é resolvido por aritmética de grade (hit-testing) em O(1).
+"""
+
+import tkinter as tk  # Canvas do Tk puro (o CustomTkinter é construído sobre ele)
+
+KEY_WIDTH = 60  # Mesmas medidas dos antigos CTkButton
+KEY_HEIGHT = 50
+KEY_PAD = 6  # Espaço em volta de cada tecla (padx/pady da grade antiga)
+KEY_RADIUS = 6  # Raio dos cantos arredondados
+CELL_WIDTH = KEY_WIDTH + 2 * KEY_PAD
+CELL_HEIGHT = KEY_HEIGHT + 2 * KEY_PAD
+
+KEY_STYLE = {  # Cores e fontes: (fundo, fundo pressionado, fonte)
+	"default": ("#222", "#3a3a3a", ("Arial", 18)),
+	"=": ("#a06a6a", "#b88484", ("Arial", 20, "bold")),
+}
+
+
+def _rounded_points(x0, y0, x1, y1, r):
+	"""Pontos de um retângulo de cantos arredondados para create_polygon(smooth=True)."""
+	return (
+		x0 + r, y0, x1 - r, y0, x1, y0, x1, y0 + r,
+		x1, y1 - r, x1, y1, x1 - r, y1, x0 + r, y1,
+		x0, y1, x0, y1 - r, x0, y0 + r, x0, y0,
+	)
+
+
+class CanvasKeypad(tk.Canvas):
+	"""Teclado inteiro em um Canvas; chama command(texto) ao soltar uma tecla."""
+
+	def __init__(self, master, buttons, command, bg="black"):
+		columns = max(len(row) for row in buttons)
+		super().__init__(master, width=columns * CELL_WIDTH, height=len(buttons) * CELL_HEIGHT, bg=bg, highlightthickness=0, bd=0)
+		self.buttons = buttons
+		self.command = command
+		self.shapes = {}  # (linha, coluna) -> id do polígono da tecla
+		self.labels = {}  # (linha, coluna) -> id do texto da tecla
+		self.pressed = None  # Tecla sob o botão do mouse
+		for r, row in enumerate(buttons):  # Desenha cada tecla não vazia
+			for c, text in enumerate(row):
+				if text:
+					self._draw_key(r, c, text)
+		self.bind("<ButtonPress-1>", self.on_press)
+		self.bind("<ButtonRelease-1>", self.on_release)
+
+	def _draw_key(self, r, c, text):
+		fill, _, font = KEY_STYLE.get(text, KEY_STYLE["default"])
+		x0 = c * CELL_WIDTH + KEY_PAD
+		y0 = r * CELL_HEIGHT + KEY_PAD
+		self.shapes[r, c] = self.create_polygon(_rounded_points(x0, y0, x0 + KEY_WIDTH, y0 + KEY_HEIGHT, KEY_RADIUS), smooth=True, fill=fill)
+		self.labels[r, c] = self.create_text(x0 + KEY_WIDTH / 2, y0 + KEY_HEIGHT / 2, text=text, fill="white", font=font)
+
+	def set_label(self, key_text, label):
+		"""Troca o texto exibido de uma tecla; o comando continua recebendo key_text."""
+		for (r, c), item in self.labels.items():
+			if self.buttons[r][c] == key_text:
+				self.itemconfigure(item, text=label)
+
+	def key_at(self, x, y):
+		"""Retorna (linha, coluna) da tecla na posição, ou None (espaço entre teclas ou célula vazia)."""
+		c, dx = divmod(int(x), CELL_WIDTH)
+		r, dy = divmod(int(y), CELL_HEIGHT)
+		if not (KEY_PAD <= dx < KEY_PAD + KEY_WIDTH and KEY_PAD <= dy < KEY_PAD + KEY_HEIGHT):
+			return None
+		if 0 <= r < len(self.buttons) and 0 <= c < len(self.buttons[r]) and self.buttons[r][c]:
+			return r, c
+		return None
+
+	def _paint(self, key, pressed):
+		text = self.buttons[key[0]][key[1]]
+		fill, pressed_fill, _ = KEY_STYLE.get(text, KEY_STYLE["default"])
+		self.itemconfigure(self.shapes[key], fill=pressed_fill if pressed else fill)
+
+	def on_press(self, event):
+		self.pressed = self.key_at(event.x, event.y)
+		if self.pressed is not None:
+			self._paint(self.pressed, True)
+
+	def on_release(self, event):
+		key, self.pressed = self.pressed, None
+		if key is None:
+			return
+		self._paint(key, False)
+		if self.key_at(event.x, event.y) == key:  # Só conta se soltar sobre a mesma tecla
+			self.command(self.buttons[key[0]][key[1]])
@@ -0,0 +1,229 @@
+"""Instrumentação opcional do motor: tempos, cache e chamadas de função.
+
+Desligada por padrão: o motor só confere se `recorder` é None. Com enable() (ou
+a variável de ambiente CALCULADORA_METRICS=1, herdada pelos processos
+auxiliares) o motor passa a registrar:
+
+- histogramas do tempo de análise (parse), de compilação (falhas do cache,
+  incluindo a análise) e de avaliação (escalar ou com outro ambiente, como as
+  ufuncs do NumPy: uma avaliação vetorizada conta uma vez);
+- consultas e falhas do cache de compilados;
+- chamadas de cada função do teclado (math.sin, fin.irr...) e erros por tipo.
+
+render() gera o texto no formato de exposição do Prometheus e profile() mede
+um trecho de código. snapshot() devolve os números como dicionários simples,
+que podem vir de outros processos e ser somados com merge().
+"""
+
+import os  # Ativação pela variável de ambiente
+from bisect import bisect_left  # Faixa de cada observação
+from collections import Counter  # Chamadas por função e erros por tipo
+from contextlib import contextmanager  # API de profiling
+
+BUCKETS = (  # Limites (em segundos) das faixas dos histogramas
+	1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+	1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0,
+)
+PHASES = ("parse", "compile", "evaluate")
+PREFIX = "calculadora"
+
+_HELP = {
+	"parse": "Tempo de análise e validação de uma expressão",
+	"compile": "Tempo de uma compilação (falha do cache), incluindo a análise",
+	"evaluate": "Tempo de execução de uma expressão compilada",
+}
+
+recorder = None  # Recorder ativo, ou None (instrumentação desligada)
+
+
+class Histogram:
+	"""Contagem de observações por faixa de BUCKETS, mais soma e total."""
+
+	__slots__ = ("counts", "sum")
+
+	def __init__(self, counts=None, total=0.0):
+		self.counts = list(counts) if counts is not None else [0] * (len(BUCKETS) + 1)  # A última faixa é +Inf
+		self.sum = total
+
+	@property
+	def count(self):
+		return sum(self.counts)
+
+	def observe(self, seconds):
+		self.counts[bisect_left(BUCKETS, seconds)] += 1
+		self.sum += seconds
+
+	def quantile(self, q):
+		"""Limite superior da faixa que contém o quantil q (inf se cair na última)."""
+		target = q * self.count
+		running = 0
+		for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+			running += count
+			if count and running >= target:
+				return bound
+		return 0.0
+
+
+class Recorder:
+	"""Números acumulados desde enable(); atualizados pelo próprio motor."""
+
+	__slots__ = ("histograms", "lookups", "misses", "calls", "errors", "namespaces")
+
+	def __init__(self):
+		self.histograms = {phase: Histogram() for phase in PHASES}
+		self.lookups = 0  # Consultas ao cache de compilados
+		self.misses = 0  # Consultas que precisaram compilar
+		self.calls = Counter()  # "math.sin" -> chamadas
+		self.errors = Counter()  # "ZeroDivisionError" -> ocorrências
+		self.namespaces = {}  # id(ambiente) -> (ambiente, cópia que conta as chamadas), montados pelo motor
+
+	def observe(self, phase, seconds):
+		self.histograms[phase].observe(seconds)
+
+	def error(self, exc):
+		self.errors[type(exc).__name__] += 1
+
+
+def enable():
+	"""Liga a instrumentação (mantém os números se ela já estava ligada)."""
+	global recorder
+	if recorder is None:
+		recorder = Recorder()
+	return recorder
+
+
+def disable():
+	"""Desliga a instrumentação e descarta os números."""
+	global recorder
+	recorder = None
+
+
+def snapshot():
+	"""Números atuais como dicionários simples (vazios com a instrumentação desligada)."""
+	if recorder is None:
+		return _empty()
+	return {
+		"histograms": {phase: (list(histogram.counts), histogram.sum) for phase, histogram in recorder.histograms.items()},
+		"lookups": recorder.lookups,
+		"misses": recorder.misses,
+		"calls": dict(recorder.calls),
+		"errors": dict(recorder.errors),
+	}
+
+
+def _empty():
+	return {"histograms": {}, "lookups": 0, "misses": 0, "calls": {}, "errors": {}}
+
+
+def merge(snapshots, sign=1):
+	"""Soma snapshots (de vários processos, por exemplo); sign=-1 subtrai do primeiro os demais."""
+	total = _empty()
+	for position, data in enumerate(snapshots):
+		factor = 1 if position == 0 else sign
+		for phase, (counts, seconds) in data["histograms"].items():
+			histogram = total["histograms"].setdefault(phase, ([0] * len(counts), 0.0))
+			total["histograms"][phase] = ([a + factor * b for a, b in zip(histogram[0], counts)], histogram[1] + factor * seconds)
+		for key in ("lookups", "misses"):
+			total[key] += factor * data[key]
+		for key in ("calls", "errors"):
+			counter = Counter(total[key])
+			counter.update({name: factor * count for name, count in data[key].items()})
+			total[key] = {name: count for name, count in counter.items() if count}
+	return total
+
+
+def render(data=None):
+	"""Texto no formato de exposição do Prometheus (do processo atual, ou de um snapshot)."""
+	data = snapshot() if data is None else data
+	lines = []
+	for phase in PHASES:
+		counts, seconds = data["histograms"].get(phase, ([0] * (len(BUCKETS) + 1), 0.0))
+		name = f"{PREFIX}_{phase}_seconds"
+		lines += [f"# HELP {name} {_HELP[phase]}.", f"# TYPE {name} histogram"]
+		running = 0
+		for bound, count in zip(BUCKETS + (float("inf"),), counts):
+			running += count
+			label = "+Inf" if bound == float("inf") else repr(bound)
+			lines.append(f'{name}_bucket{{le="{label}"}} {running}')
+		lines += [f"{name}_sum {seconds!r}", f"{name}_count {running}"]
+	hits = data["lookups"] - data["misses"]
+	lines += [
+		f"# HELP {PREFIX}_cache_hits_total Expressões encontradas já compiladas no cache.",
+		f"# TYPE {PREFIX}_cache_hits_total counter",
+		f"{PREFIX}_cache_hits_total {hits}",
+		f"# HELP {PREFIX}_cache_misses_total Expressões que precisaram ser compiladas.",
+		f"# TYPE {PREFIX}_cache_misses_total counter",
+		f"{PREFIX}_cache_misses_total {data['misses']}",
+		f"# HELP {PREFIX}_function_calls_total Chamadas de cada função do teclado durante a avaliação.",
+		f"# TYPE {PREFIX}_function_calls_total counter",
+	]
+	lines += [f'{PREFIX}_function_calls_total{{function="{name}"}} {count}' for name, count in sorted(data["calls"].items())]
+	lines += [
+		f"# HELP {PREFIX}_errors_total Expressões que levantaram erro, por tipo de exceção.",
+		f"# TYPE {PREFIX}_errors_total counter",
+	]
+	lines += [f'{PREFIX}_errors_total{{type="{name}"}} {count}' for name, count in sorted(data["errors"].items())]
+	return "\n".join(lines) + "\n"
+
+
+class Profile:
+	"""Resultado de profile(): números do trecho medido."""
+
+	def __init__(self):
+		self.data = _empty()
+
+	def histogram(self, phase):
+		counts, seconds = self.data["histograms"].get(phase, (None, 0.0))
+		return Histogram(counts, seconds)
+
+	@property
+	def hit_rate(self):
+		"""Fração das consultas ao cache que não precisaram compilar (nan sem consultas)."""
+		lookups = self.data["lookups"]
+		return (lookups - self.data["misses"]) / lookups if lookups else float("nan")
+
+	@property
+	def calls(self):
+		return Counter(self.data["calls"])
+
+	@property
+	def errors(self):
+		return Counter(self.data["errors"])
+
+	def __str__(self):
+		lines = [f"{'fase':10} {'vezes':>9} {'total ms':>10} {'média µs':>9} {'p50 ≤ µs':>9} {'p99 ≤ µs':>9}"]
+		for phase in PHASES:
+			histogram = self.histogram(phase)
+			count = histogram.count
+			mean = histogram.sum / count * 1e6 if count else 0.0
+			lines.append(f"{phase:10} {count:9d} {histogram.sum * 1000:10.2f} {mean:9.2f} "
+				f"{histogram.quantile(0.5) * 1e6:9g} {histogram.quantile(0.99) * 1e6:9g}")
+		lines.append(f"cache: {self.data['lookups']} consultas, {self.data['misses']} compilações, acerto {self.hit_rate:.1%}")
+		if self.data["calls"]:
+			lines.append("chamadas: " + ", ".join(f"{name} {count}" for name, count in self.calls.most_common()))
+		if self.data["errors"]:
+			lines.append("erros: " + ", ".join(f"{name} {count}" for name, count in self.errors.most_common()))
+		return "\n".join(lines)
+
+
+@contextmanager
+def profile():
+	"""Mede o trecho do bloco with: `with profile() as report: ...`; report é preenchido na saída.
+
+	Liga a instrumentação durante o bloco, se ela estava desligada.
+	"""
+	started = recorder is None
+	if started:
+		enable()
+	before = snapshot()
+	report = Profile()
+	try:
+		yield report
+	finally:
+		report.data = merge([snapshot(), before], sign=-1)
+		if started:
+			disable()
+
+
+if os.environ.get("CALCULADORA_METRICS"):  # Processos auxiliares herdam a escolha do processo principal
+	enable()
@@ -0,0 +1,121 @@
+"""Otimização da árvore da expressão antes da compilação.
+
+O teclado cola str(math.pi) e str(math.e) como literais longos e gera "/100"
+("%") e "1/" ("1/x"); sem otimização, essas subárvores constantes seriam
+recalculadas a cada avaliação. Este passo dobra as subexpressões constantes e
+aplica identidades algébricas simples. Ele vale a pena sobretudo quando a mesma
+expressão é avaliada milhões de vezes (x variando, arrays do NumPy).
+"""
+
+import ast  # Nós da árvore produzida pelo motor
+import math  # Expoente das constantes (inverso exato)
+import operator  # Operadores usados na dobra de constantes
+
+FOLD_MAX_BITS = 100_000  # Inteiros maiores que isso não são calculados na compilação (ex.: 9**9**9)
+
+_BINARY = {
+	ast.Add: operator.add,
+	ast.Sub: operator.sub,
+	ast.Mult: operator.mul,
+	ast.Div: operator.truediv,
+	ast.FloorDiv: operator.floordiv,
+	ast.Pow: operator.pow,
+}
+_UNARY = {
+	ast.UAdd: operator.pos,
+	ast.USub: operator.neg,
+}
+
+
+def too_costly(op, left, right, max_bits):
+	"""Indica se a operação entre inteiros produziria um número grande demais para calcular agora."""
+	if not (isinstance(left, int) and isinstance(right, int)):
+		return False
+	if op is ast.Pow:
+		return right > 0 and left.bit_length() * right > max_bits
+	if op is ast.Mult:
+		return left.bit_length() + right.bit_length() > max_bits
+	return False
+
+
+def _constant(node):
+	return isinstance(node, ast.Constant)
+
+
+def _call_name(node):
+	"""Nome da função chamada ("math.sin", "abs"); a árvore já foi validada pelo motor."""
+	func = node.func
+	if isinstance(func, ast.Attribute):
+		return func.value.id + "." + func.attr
+	return func.id
+
+
+def _exact_reciprocal(value):
+	"""1/value, se for exato (potências de dois): só então a/c e a*(1/c) dão o mesmo float."""
+	if type(value) not in (int, float) or not 2 ** -53 <= abs(value) <= 2 ** 53:
+		return None
+	if abs(math.frexp(value)[0]) != 0.5:  # 3, 10, 100...: 1/c arredondado mudaria o último dígito
+		return None
+	return 1 / value
+
+
+def _is_int(node, value):
+	"""Literal inteiro igual a value (1 e 1.0 não são intercambiáveis: mudam o tipo do resultado)."""
+	return _constant(node) and type(node.value) is int and node.value == value
+
+
+class _Optimizer(ast.NodeTransformer):
+	"""Dobra constantes e simplifica identidades, de baixo para cima."""
+
+	def __init__(self, functions):
+		self.functions = functions  # Nome ("math.sin", "fin.fv", "abs") -> função pura usada na dobra
+
+	def _fold(self, node, function, *args):
+		"""Substitui o nó pelo resultado, se o cálculo não falhar; erros ficam para a avaliação."""
+		try:
+			value = function(*args)
+		except (ArithmeticError, ValueError, TypeError):
+			return node
+		return ast.copy_location(ast.Constant(value), node)
+
+	def visit_UnaryOp(self, node):
+		self.generic_visit(node)
+		if _constant(node.operand):
+			return self._fold(node, _UNARY[type(node.op)], node.operand.value)
+		if isinstance(node.op, ast.UAdd):  # +a -> a
+			return node.operand
+		if isinstance(node.op, ast.USub) and isinstance(node.operand, ast.UnaryOp) and isinstance(node.operand.op, ast.USub):
+			return node.operand.operand  # -(-a) -> a
+		return node
+
+	def visit_BinOp(self, node):
+		self.generic_visit(node)
+		op = type(node.op)
+		left, right = node.left, node.right
+		if _constant(left) and _constant(right):
+			if too_costly(op, left.value, right.value, FOLD_MAX_BITS):
+				return node
+			return self._fold(node, _BINARY[op], left.value, right.value)
+		if op is ast.Mult and _is_int(right, 1):  # a*1 -> a
+			return left
+		if op is ast.Mult and _is_int(left, 1):  # 1*a -> a
+			return right
+		if op is ast.Pow and _is_int(right, 1):  # a**1 -> a
+			return left
+		# x**2 fica como está: com x float, x*x daria inf onde x**2 levanta OverflowError (o tipo de x só se sabe ao avaliar)
+		if op is ast.Div and _constant(right) and _exact_reciprocal(right.value) is not None:
+			reciprocal = _exact_reciprocal(right.value)  # a/4 -> a*0.25 (a/100 fica: 0.01 não é exato)
+			return ast.copy_location(ast.BinOp(left, ast.Mult(), ast.Constant(reciprocal)), node)
+		return node
+
+	def visit_Call(self, node):
+		self.generic_visit(node)
+		name = _call_name(node)
+		if name in self.functions and all(_constant(argument) for argument in node.args):
+			return self._fold(node, self.functions[name], *(argument.value for argument in node.args))
+		return node
+
+
+def optimize(tree, functions):
+	"""Retorna a árvore otimizada (a original não é reaproveitada pelo chamador)."""
+	return ast.fix_missing_locations(_Optimizer(functions).visit(tree))
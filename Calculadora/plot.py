@@ -0,0 +1,209 @@
+"""Janela do modo gráfico: desenha y = f(x) em um Canvas, com arrastar e zoom.
+
+As amostras vêm do AdaptiveSampler, que guarda os blocos já avaliados e roda
+em um processo auxiliar só da janela (EvaluationWorker, com tempo e memória
+limitados): uma expressão cara não trava o Tk. Cada redesenho converte para
+pixels os pontos que já chegaram (uma conta vetorizada), cria uma linha por
+trecho contínuo da curva e pede as amostras da nova vista; os eventos de
+arrastar e de zoom são acumulados e redesenhados uma vez por ciclo ocioso.
+"""
+
+import tkinter as tk  # Canvas do Tk puro
+
+import numpy as np  # Conversão das amostras para pixels
+
+from engine import RADIANS  # Modo de ângulo padrão
+from sampler import sample_task  # Amostragem adaptativa com cache de blocos (no processo auxiliar)
+from worker import PENDING, EvaluationWorker  # Processo auxiliar da janela
+
+PLOT_WIDTH = 600
+PLOT_HEIGHT = 400
+INITIAL_RANGE = (-10.0, 10.0)  # Intervalo de x ao abrir
+ZOOM_STEP = 1.25  # Fator de zoom por passo da roda do mouse
+CURVE_COLOR = "#a06a6a"  # Mesma cor da tecla "="
+AXIS_COLOR = "#555"
+POLL_INTERVAL_MS = 15  # Intervalo entre consultas ao processo das amostras
+
+
+class WorkerSampler:
+	"""AdaptiveSampler de uma expressão rodando no processo auxiliar `worker`."""
+
+	def __init__(self, worker, expression, angle=RADIANS, values=None):
+		self.worker = worker
+		self.args = (expression, angle, dict(values or {}))
+
+	@property
+	def busy(self):
+		return self.worker.busy
+
+	def request(self, x_min, x_max, width):
+		"""Pede as amostras de [x_min, x_max] sem esperar; o resultado vem por poll()."""
+		self.worker.submit_task(sample_task, *self.args, x_min, x_max, width)
+
+	def poll(self):
+		"""(xs, ys), PENDING enquanto calcula, ou levanta o erro (tempo ou memória excedidos)."""
+		return self.worker.poll()
+
+	def close(self):
+		self.worker.close()
+
+
+class PlotCanvas(tk.Canvas):
+	"""Canvas com a curva de uma expressão em x; arrastar desloca, a roda do mouse aproxima.
+
+	samples são as amostras de INITIAL_RANGE já recebidas de `sampler` (um WorkerSampler).
+	"""
+
+	def __init__(self, master, sampler, samples, width=PLOT_WIDTH, height=PLOT_HEIGHT, bg="black"):
+		super().__init__(master, width=width, height=height, bg=bg, highlightthickness=0, bd=0)
+		self.sampler = sampler
+		self.samples = samples  # Últimas (xs, ys) recebidas do processo auxiliar
+		self.width, self.height = width, height
+		self.x_min, self.x_max = INITIAL_RANGE
+		self.y_min, self.y_max = self._initial_y_range()
+		self.drag = None  # Última posição do mouse durante o arraste
+		self.redraw_job = None  # Redesenho pendente (um por ciclo ocioso)
+		self.poll_job = None  # Consulta pendente ao processo das amostras
+		self.outdated = False  # A vista mudou depois do último pedido de amostras
+		self.bind("<ButtonPress-1>", self.on_press)
+		self.bind("<B1-Motion>", self.on_drag)
+		self.bind("<MouseWheel>", self.on_wheel)  # Windows e macOS
+		self.bind("<Button-4>", self.on_wheel)  # Linux (X11): roda para cima
+		self.bind("<Button-5>", self.on_wheel)  # Linux (X11): roda para baixo
+		self.bind("<Configure>", self.on_resize)
+		self.bind("<Destroy>", self.on_destroy)
+		self.draw()
+
+	def _initial_y_range(self):
+		"""Faixa de y que mostra a maior parte da curva, ignorando polos e valores extremos."""
+		_, ys = self.samples
+		ys = ys[np.isfinite(ys)]
+		if not len(ys):
+			return -1.0, 1.0
+		low, high = np.percentile(ys, (2, 98))
+		if high - low < 1e-12:  # Curva constante
+			return low - 1.0, high + 1.0
+		margin = (high - low) * 0.1
+		return low - margin, high + margin
+
+	def schedule_redraw(self):
+		if self.redraw_job is None:
+			self.redraw_job = self.after_idle(self.redraw)
+
+	def redraw(self):
+		"""Desenha na vista atual as amostras que já chegaram e pede as da vista nova."""
+		self.redraw_job = None
+		self.draw()
+		self.request_samples()
+
+	def request_samples(self):
+		if self.sampler.busy:  # O pedido anterior ainda calcula: pede de novo quando ele chegar
+			self.outdated = True
+			return
+		self.outdated = False
+		self.sampler.request(self.x_min, self.x_max, self.width)
+		self.poll_job = self.after(POLL_INTERVAL_MS, self.poll_samples)
+
+	def poll_samples(self):
+		self.poll_job = None
+		try:
+			samples = self.sampler.poll()
+		except Exception:  # Tempo ou memória excedidos: fica a última curva
+			return
+		if samples is PENDING:
+			self.poll_job = self.after(POLL_INTERVAL_MS, self.poll_samples)
+			return
+		self.samples = samples
+		self.draw()
+		if self.outdated:
+			self.request_samples()
+
+	def draw(self):
+		self.delete("all")
+		self._draw_axes()
+		xs, ys = self.samples
+		visible = slice(max(np.searchsorted(xs, self.x_min) - 1, 0), np.searchsorted(xs, self.x_max) + 1)
+		xs, ys = xs[visible], ys[visible]
+		px = (xs - self.x_min) * (self.width / (self.x_max - self.x_min))
+		py = (self.y_max - ys) * (self.height / (self.y_max - self.y_min))
+		py = np.clip(py, -self.height, 2 * self.height)  # Valores enormes estourariam as coordenadas do Tk
+		finite = np.isfinite(py)
+		edges = np.flatnonzero(np.diff(finite.astype(np.int8)))  # Onde a curva entra ou sai do domínio
+		bounds = np.concatenate(([0], edges + 1, [len(py)]))
+		for start, end in zip(bounds[:-1], bounds[1:]):
+			if end - start > 1 and finite[start]:
+				points = np.column_stack((px[start:end], py[start:end])).ravel()
+				self.create_line(*points.tolist(), fill=CURVE_COLOR, width=2)
+
+	def _draw_axes(self):
+		if self.x_min < 0 < self.x_max:
+			x = -self.x_min * self.width / (self.x_max - self.x_min)
+			self.create_line(x, 0, x, self.height, fill=AXIS_COLOR)
+		if self.y_min < 0 < self.y_max:
+			y = self.y_max * self.height / (self.y_max - self.y_min)
+			self.create_line(0, y, self.width, y, fill=AXIS_COLOR)
+
+	def on_press(self, event):
+		self.drag = (event.x, event.y)
+
+	def on_drag(self, event):
+		if self.drag is None:
+			return
+		dx = (event.x - self.drag[0]) * (self.x_max - self.x_min) / self.width
+		dy = (event.y - self.drag[1]) * (self.y_max - self.y_min) / self.height
+		self.drag = (event.x, event.y)
+		self.x_min, self.x_max = self.x_min - dx, self.x_max - dx
+		self.y_min, self.y_max = self.y_min + dy, self.y_max + dy
+		self.schedule_redraw()
+
+	def on_wheel(self, event):
+		zoom_in = event.num == 4 or getattr(event, "delta", 0) > 0
+		factor = 1 / ZOOM_STEP if zoom_in else ZOOM_STEP
+		x = self.x_min + event.x * (self.x_max - self.x_min) / self.width  # Ponto sob o mouse fica parado
+		y = self.y_max - event.y * (self.y_max - self.y_min) / self.height
+		self.x_min, self.x_max = x + (self.x_min - x) * factor, x + (self.x_max - x) * factor
+		self.y_min, self.y_max = y + (self.y_min - y) * factor, y + (self.y_max - y) * factor
+		self.schedule_redraw()
+
+	def on_resize(self, event):
+		if (event.width, event.height) != (self.width, self.height):
+			self.width, self.height = event.width, event.height
+			self.schedule_redraw()
+
+	def on_destroy(self, event):
+		if event.widget is not self:
+			return
+		for job in (self.redraw_job, self.poll_job):
+			if job is not None:
+				self.after_cancel(job)
+		self.sampler.close()  # Encerra o processo da janela
+
+
+def open_plot(master, expression, angle, values=None, title=None, worker=None, on_error=None):
+	"""Abre uma janela com o gráfico da expressão em x assim que as primeiras amostras chegam.
+
+	As amostras são calculadas em `worker` (um EvaluationWorker novo, se omitido),
+	que passa a ser da janela e é encerrado com ela. Se as primeiras falharem
+	(sintaxe inválida, tempo ou memória excedidos), a janela não abre e
+	on_error() é chamado.
+	"""
+	sampler = WorkerSampler(worker or EvaluationWorker(), expression, angle, values)
+	sampler.request(*INITIAL_RANGE, PLOT_WIDTH)
+
+	def poll():
+		try:
+			samples = sampler.poll()
+		except Exception:
+			sampler.close()
+			if on_error is not None:
+				on_error()
+			return
+		if samples is PENDING:
+			master.after(POLL_INTERVAL_MS, poll)
+			return
+		window = tk.Toplevel(master)
+		window.title(title or "y = " + expression)
+		window.configure(bg="black")
+		PlotCanvas(window, sampler, samples).pack(fill="both", expand=True)
+
+	master.after(POLL_INTERVAL_MS, poll)
@@ -0,0 +1,466 @@
+"""Modo de precisão arbitrária (Ctrl+P): frações exatas e decimais com N dígitos.
+
+A expressão é a mesma do modo normal e passa pela mesma análise do motor, mas
+é compilada sem a dobra de constantes em float: cada literal vira a Fraction
+do texto digitado (0.1 é exatamente 1/10), a divisão dá Fraction e as
+potências inteiras são exatas. Assim 0.1+0.2 dá 0.3 e 1/3*3 dá 1.
+
+Só as funções transcendentes (sin, ln, eˣ, raízes não exatas...) e as
+potências fracionárias saem do caminho exato: são calculadas em ponto fixo
+binário (inteiros grandes) com `digits` mais GUARD_DIGITS algarismos e voltam
+como Fraction para o resto da conta; a TIR usa o módulo decimal. O
+resultado é um int (exato) ou um Decimal com até `digits` algarismos
+significativos (exato quando cabe neles, como 0.3).
+
+Atalhos:
+- expressões só com inteiros (+, -, ×, ÷÷, potência natural, |x|) usam o
+  compilado normal do motor, que já é exato para inteiros;
+- raízes exatas (√(9/4) = 3/2) e, em graus, sin/cos/tan de múltiplos de 30°
+  e 45° com valor racional (sin(30) = 0.5) não passam pelo decimal;
+- os literais colados pelas teclas π e e (str(math.pi), str(math.e)) valem
+  π e e com todos os dígitos;
+- as funções transcendentes guardam os resultados por (argumento, precisão).
+"""
+
+import ast  # Reescrita da árvore validada pelo motor
+import math  # Texto das constantes coladas pelas teclas π e e
+from decimal import Decimal, localcontext  # Resultado com N dígitos e TIR
+from fractions import Fraction  # Aritmética racional exata
+from functools import lru_cache  # Compilados, ambientes e resultados das funções transcendentes
+
+import financial  # Chute inicial da TIR (em float)
+from engine import CACHE_SIZE, DEGREES, RADIANS, ExpressionError, compile_expression, function_name, make_globals, normalize, parse
+
+DEFAULT_DIGITS = 50  # Algarismos significativos do resultado
+MAX_DIGITS = 10000
+GUARD_DIGITS = 10  # Algarismos extras nos cálculos intermediários com decimal
+FUNCTION_CACHE_SIZE = 4096  # Resultados de funções transcendentes guardados
+MAX_ROOT_INDEX = 64  # Maior índice de raiz exata tentado em a**(p/q)
+HALVINGS = 8  # Reduções do argumento (divisões por 2 ou raízes quadradas) antes das séries
+EXP_LIMIT = 10 ** 6  # |x| acima disso em eˣ é estouro, como no decimal
+IRR_MAX_ITERATIONS = 50
+
+PI_TEXT = str(math.pi)  # Literais colados pelas teclas π e e
+E_TEXT = str(math.e)
+
+_INTEGER_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.FloorDiv, ast.UAdd, ast.USub)  # Fechados nos inteiros
+_SIN_30 = {0: 0, 30: Fraction(1, 2), 90: 1, 150: Fraction(1, 2), 180: 0, 210: Fraction(-1, 2), 270: -1, 330: Fraction(-1, 2)}
+_TAN_45 = {0: 0, 45: 1, 135: -1, 180: 0, 225: 1, 315: -1}
+
+
+class _Exact(ast.NodeTransformer):
+	"""Literais float -> nomes ligados a Fraction; / e ** -> funções exatas."""
+
+	def __init__(self, source):
+		self.source = source
+		self.constants = []  # (nome, Fraction ou texto de π/e)
+
+	def visit_Constant(self, node):
+		if isinstance(node.value, complex):
+			raise ExpressionError("o modo de precisão não aceita números complexos")
+		if isinstance(node.value, int):
+			return node
+		text = ast.get_source_segment(self.source, node)
+		name = f"_k{len(self.constants)}"
+		self.constants.append((name, text if text in (PI_TEXT, E_TEXT) else Fraction(text)))
+		return ast.copy_location(ast.Name(name, ast.Load()), node)
+
+	def visit_BinOp(self, node):
+		self.generic_visit(node)
+		if isinstance(node.op, (ast.Div, ast.Pow)):
+			helper = "_div" if isinstance(node.op, ast.Div) else "_pow"
+			return ast.copy_location(ast.Call(ast.Name(helper, ast.Load()), [node.left, node.right], []), node)
+		return node
+
+
+def _integer_only(tree):
+	"""Indica se a expressão só produz inteiros a partir de variáveis inteiras."""
+	for node in ast.walk(tree):
+		if isinstance(node, ast.Constant) and type(node.value) is not int:
+			return False
+		if isinstance(node, (ast.BinOp, ast.UnaryOp)) and not isinstance(node.op, _INTEGER_OPERATORS):
+			if not (isinstance(node.op, ast.Pow) and isinstance(node.right, ast.Constant) and node.right.value >= 0):
+				return False
+		if isinstance(node, ast.Call) and function_name(node) != "abs":
+			return False
+	return True
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile(source, variables):
+	tree = parse(source, variables)
+	integer_only = _integer_only(tree)
+	transformer = _Exact(source)
+	tree = ast.fix_missing_locations(transformer.visit(tree))
+	return compile(tree, "<calculadora>", "eval"), tuple(transformer.constants), integer_only
+
+
+def evaluate_precise(expression, *, angle=RADIANS, digits=DEFAULT_DIGITS, **values):
+	"""Avalia como engine.evaluate, mas com frações exatas e `digits` algarismos significativos."""
+	if not 1 <= digits <= MAX_DIGITS:
+		raise ValueError(f"digits deve estar entre 1 e {MAX_DIGITS}")
+	source = normalize(expression)
+	names = tuple(sorted(values))
+	code, constants, integer_only = _compile(source, names)
+	if integer_only and all(type(value) is int for value in values.values()):  # Atalho: o motor já é exato
+		return compile_expression(source, names, angle)(**values)
+	precision = digits + GUARD_DIGITS
+	local = {name: _exact(value) for name, value in values.items()}
+	for name, value in constants:
+		local[name] = value if isinstance(value, Fraction) else _CONSTANTS[value](precision)
+	return _finish(eval(code, _namespace(angle, precision), local), digits)  # Seguro: a árvore foi validada pelo motor
+
+
+def _exact(value):
+	"""Valor de uma variável (resultado anterior) como número exato."""
+	if isinstance(value, (int, Fraction)) and not isinstance(value, bool):
+		return value
+	if isinstance(value, float):
+		return Fraction(repr(value))  # O valor mostrado no visor, não a aproximação binária
+	if isinstance(value, Decimal):
+		return Fraction(value)
+	raise TypeError(f"o modo de precisão não aceita {type(value).__name__}")
+
+
+def _finish(value, digits):
+	"""int exato ou Decimal com até `digits` algarismos."""
+	if isinstance(value, Fraction):
+		if value.denominator == 1:
+			return value.numerator
+		with localcontext() as ctx:
+			ctx.prec = digits
+			return Decimal(value.numerator) / Decimal(value.denominator)  # Exato quando cabe em `digits` (0.3)
+	return value
+
+
+def _normal(value):
+	return value.numerator if isinstance(value, Fraction) and value.denominator == 1 else value
+
+
+def _decimal(value):
+	"""Fraction/int -> Decimal com a precisão do contexto atual."""
+	if isinstance(value, int):
+		return +Decimal(value)
+	return Decimal(value.numerator) / Decimal(value.denominator)
+
+
+def _from_decimal(value):
+	return _normal(Fraction(value))
+
+
+# Aritmética exata
+
+def _div(a, b):
+	return _normal(Fraction(a) / b)
+
+
+def _iroot(value, n):
+	"""Raiz n-ésima inteira (arredondada para baixo) de um inteiro não negativo."""
+	if value < 2:
+		return value
+	if n == 2:
+		return math.isqrt(value)
+	x = 1 << -(-value.bit_length() // n)  # Maior ou igual à raiz
+	while True:
+		y = ((n - 1) * x + value // x ** (n - 1)) // n
+		if y >= x:
+			return x
+		x = y
+
+
+def _root(value, n):
+	"""Raiz n-ésima exata de uma fração não negativa, ou None se ela não for racional."""
+	value = Fraction(value)
+	numerator, denominator = _iroot(value.numerator, n), _iroot(value.denominator, n)
+	if numerator ** n == value.numerator and denominator ** n == value.denominator:
+		return Fraction(numerator, denominator)
+	return None
+
+
+def _pow(base, exponent, precision):
+	if isinstance(exponent, Fraction) and exponent.denominator == 1:
+		exponent = exponent.numerator
+	if isinstance(exponent, int):
+		if exponent >= 0:
+			return base ** exponent
+		return _normal(Fraction(base) ** exponent)  # Levanta ZeroDivisionError para 0**-n
+	if base == 0:
+		if exponent < 0:
+			raise ZeroDivisionError("0 elevado a expoente negativo")
+		return 0
+	if base < 0:
+		raise ValueError("potência fracionária de número negativo")
+	if exponent.denominator <= MAX_ROOT_INDEX:
+		root = _root(base, exponent.denominator)
+		if root is not None:  # Atalho: (9/4)**(1/2) = 3/2
+			return _normal(root ** exponent.numerator)
+	bits = _bits(precision) + int(abs(exponent)).bit_length()  # O erro de ln(base) é multiplicado pelo expoente
+	return _exp(exponent * Fraction(_ln_fixed(base, bits), 1 << bits), precision)
+
+
+# Funções transcendentes em ponto fixo binário: inteiros v que valem v / 2**bits.
+# Recebem e devolvem números exatos (Fraction/int); só o valor devolvido é aproximado.
+
+def _bits(precision):
+	"""Bits de trabalho para `precision` algarismos, com folga para os arredondamentos internos."""
+	return int(precision * 3.3219280948873626) + 24  # log2(10)
+
+
+def _fixed(x, bits):
+	x = Fraction(x)
+	return (x.numerator << bits) // x.denominator
+
+
+def _unfixed(value, bits):
+	return _normal(Fraction(value, 1 << bits))
+
+
+@lru_cache(maxsize=64)
+def _pi_fixed(bits):
+	"""π * 2**bits (fórmula de Machin)."""
+	guard = bits + 16
+
+	def arctan_inverse(n):  # arctan(1/n) * 2**guard
+		total = term = (1 << guard) // n
+		k, square = 1, n * n
+		while term:
+			term //= square
+			k += 2
+			total += -(term // k) if k % 4 == 3 else term // k
+		return total
+
+	return (16 * arctan_inverse(5) - 4 * arctan_inverse(239)) >> 16
+
+
+@lru_cache(maxsize=64)
+def _ln2_fixed(bits):
+	"""ln 2 * 2**bits, como 2·atanh(1/3)."""
+	guard = bits + 16
+	total = term = (1 << guard) // 3
+	k = 1
+	while term:
+		term //= 9
+		k += 2
+		total += term // k
+	return (2 * total) >> 16
+
+
+def _pi(precision):
+	return _unfixed(_pi_fixed(_bits(precision)), _bits(precision))
+
+
+def _e(precision):
+	return _exp(1, precision)
+
+
+_CONSTANTS = {PI_TEXT: _pi, E_TEXT: _e}
+
+
+@lru_cache(maxsize=FUNCTION_CACHE_SIZE)
+def _sqrt(x, precision):
+	if x < 0:
+		raise ValueError("math domain error")
+	root = _root(x, 2)
+	if root is not None:  # Atalho: raiz exata
+		return _normal(root)
+	x = Fraction(x)
+	bits = _bits(precision)
+	return _unfixed(math.isqrt((x.numerator << 2 * bits) // x.denominator), bits)
+
+
+@lru_cache(maxsize=FUNCTION_CACHE_SIZE)
+def _exp(x, precision):
+	if x == 0:
+		return 1
+	if abs(x) > EXP_LIMIT:
+		raise OverflowError("math range error")
+	bits = _bits(precision) + HALVINGS
+	ln2 = _ln2_fixed(bits)
+	v = _fixed(x, bits)
+	n = (2 * v + ln2) // (2 * ln2)  # x = n·ln 2 + r, |r| <= ln 2 / 2
+	r = (v - n * ln2) >> HALVINGS  # Série de r / 2**HALVINGS, elevada ao quadrado HALVINGS vezes
+	one = 1 << bits
+	total = term = one
+	k = 0
+	while term:
+		k += 1
+		term = (term * r >> bits) // k
+		total += term
+	for _ in range(HALVINGS):
+		total = total * total >> bits
+	return _unfixed(total << n, bits) if n >= 0 else _unfixed(total, bits - n)
+
+
+def _ln_fixed(x, bits):
+	"""ln(x) * 2**bits para x > 0: x = m·2**e, m perto de 1 após HALVINGS raízes quadradas, e atanh."""
+	x = Fraction(x)
+	e = x.numerator.bit_length() - x.denominator.bit_length()
+	work = bits + HALVINGS
+	m = (x.numerator << work) // (x.denominator << e) if e >= 0 else (x.numerator << (work - e)) // x.denominator
+	for _ in range(HALVINGS):
+		m = math.isqrt(m << work)
+	one = 1 << work
+	z = ((m - one) << work) // (m + one)  # ln m = 2·atanh(z)
+	square = z * z >> work
+	total = term = z
+	k = 1
+	while term:
+		term = term * square >> work
+		k += 2
+		total += term // k
+	return ((total << (HALVINGS + 1)) + e * _ln2_fixed(work)) >> HALVINGS  # ln x = e·ln 2 + 2**HALVINGS · 2·atanh(z)
+
+
+@lru_cache(maxsize=FUNCTION_CACHE_SIZE)
+def _log(x, precision):
+	if x <= 0:
+		raise ValueError("math domain error")
+	if x == 1:
+		return 0
+	bits = _bits(precision)
+	return _unfixed(_ln_fixed(x, bits), bits)
+
+
+@lru_cache(maxsize=FUNCTION_CACHE_SIZE)
+def _log10(x, precision):
+	if x <= 0:
+		raise ValueError("math domain error")
+	x = Fraction(x)
+	if x.denominator == 1 or x.numerator == 1:  # Atalho: potências de 10 dão inteiros
+		power = _power_of_ten(max(x.numerator, x.denominator))
+		if power is not None:
+			return power if x.denominator == 1 else -power
+	bits = _bits(precision)
+	return _normal(Fraction(_ln_fixed(x, bits), _ln_fixed(10, bits)))
+
+
+def _power_of_ten(n):
+	"""k se n == 10**k, senão None (sem converter n para texto)."""
+	estimate = int(n.bit_length() * 0.30102999566398120)
+	for k in (estimate - 1, estimate, estimate + 1):
+		if k >= 0 and 10 ** k == n:
+			return k
+	return None
+
+
+def _sin_cos(x, precision):
+	"""(sin x, cos x, bits) em ponto fixo: redução a [-π, π], série de Taylor de x / 2**HALVINGS e ângulo duplo."""
+	magnitude = int(abs(x)).bit_length()  # Bits a mais para reduzir argumentos grandes
+	bits = _bits(precision) + 2 * HALVINGS
+	pi = _pi_fixed(bits + magnitude)
+	v = _fixed(x, bits + magnitude)
+	v -= 2 * pi * ((v + pi) // (2 * pi))
+	r = v >> (magnitude + HALVINGS)
+	square = r * r >> bits
+	one = 1 << bits
+	sin = term = r
+	cos = cos_term = one
+	k = 0
+	while term or cos_term:
+		k += 2
+		cos_term = -(cos_term * square >> bits) // (k * (k - 1))
+		term = -(term * square >> bits) // (k * (k + 1))
+		sin += term
+		cos += cos_term
+	for _ in range(HALVINGS):
+		sin, cos = 2 * sin * cos >> bits, (cos * cos - sin * sin) >> bits
+	return sin, cos, bits
+
+
+@lru_cache(maxsize=FUNCTION_CACHE_SIZE)
+def _trig(name, x, precision, degrees):
+	if x == 0:
+		return 1 if name == "cos" else 0
+	if degrees:
+		if isinstance(x, int) or x.denominator == 1:  # Atalho: ângulos notáveis com valor racional
+			angle = int(x) % 360
+			if name == "tan" and angle in (90, 270):
+				raise ValueError("tan de 90° + k·180° não existe")
+			table_key = angle if name != "cos" else (angle + 90) % 360
+			table = _TAN_45 if name == "tan" else _SIN_30
+			if table_key in table:
+				return table[table_key]
+		x = Fraction(x) * _pi(precision + 5) / 180
+	sin, cos, bits = _sin_cos(x, precision)
+	noise = (int(abs(x)) + 1) << (bits - _bits(precision) + 8)  # Abaixo disso o valor é só o erro do argumento (ex.: sin(π))
+	sin = sin if abs(sin) > noise else 0
+	cos = cos if abs(cos) > noise else 0
+	if name == "sin":
+		return _unfixed(sin, bits)
+	if name == "cos":
+		return _unfixed(cos, bits)
+	if not cos:
+		raise ValueError("tan de π/2 + k·π não existe")
+	return _normal(Fraction(sin, cos))
+
+
+def _trig_functions(degrees):
+	return {name: lambda x, precision, name=name: _trig(name, x, precision, degrees) for name in ("sin", "cos", "tan")}
+
+
+# Funções financeiras exatas (VF, PGTO e VPL são racionais; a TIR é refinada com decimal)
+
+def _fv(rate, nper, pmt, pv=0, *, precision):
+	if rate == 0:
+		return -(pv + pmt * nper)
+	growth = _pow(1 + rate, nper, precision)
+	return -(pv * growth + _div(pmt * (growth - 1), rate))
+
+
+def _pmt(rate, nper, pv, fv=0, *, precision):
+	if rate == 0:
+		return _div(-(pv + fv), nper)
+	growth = _pow(1 + rate, nper, precision)
+	return _div(-(fv + pv * growth) * rate, growth - 1)
+
+
+def _npv(rate, *flows, precision):
+	factor = _div(1, 1 + rate)
+	total = 0
+	for flow in reversed(flows):
+		total = total * factor + flow
+	return _normal(Fraction(total))
+
+
+def _irr(*flows, precision):
+	"""TIR: chute da versão float (mesmos erros) e Newton em decimal até a precisão pedida."""
+	guess = financial.irr(*(float(flow) for flow in flows))
+	with localcontext() as ctx:
+		ctx.prec = precision
+		flows = [_decimal(flow) for flow in flows]
+		t = 1 / (1 + Decimal(repr(guess)))  # Fator de desconto, como em financial.irr
+		for _ in range(IRR_MAX_ITERATIONS):
+			value = slope = Decimal(0)
+			for flow in reversed(flows):
+				slope = slope * t + value
+				value = value * t + flow
+			if not slope:
+				break
+			step = value / slope
+			t -= step
+			if abs(step) <= abs(t).scaleb(-precision + 2):
+				break
+		return _from_decimal(1 / t - 1)
+
+
+@lru_cache(maxsize=64)
+def _namespace(angle, precision):
+	"""Ambiente de avaliação com as funções ligadas à precisão e ao modo de ângulo."""
+	if angle not in (RADIANS, DEGREES):
+		raise ValueError(f"modo de ângulo desconhecido: {angle!r}")
+
+	def bind(function):
+		return lambda *args: function(*args, precision)
+
+	def bind_keyword(function):
+		return lambda *args: function(*args, precision=precision)
+
+	functions = {"sqrt": _sqrt, "exp": _exp, "log": _log, "log10": _log10, **_trig_functions(angle == DEGREES)}
+	namespace = make_globals(
+		{name: bind(function) for name, function in functions.items()},
+		{"abs": abs},
+		{name: bind_keyword(function) for name, function in {"fv": _fv, "pmt": _pmt, "npv": _npv, "irr": _irr}.items()},
+	)
+	namespace["_div"] = _div
+	namespace["_pow"] = bind(_pow)
+	return namespace
@@ -0,0 +1,119 @@
+"""Apresentação de resultados, inclusive inteiros enormes.
+
+str(int) é lento para inteiros gigantes (ex.: resultados de "xʸ") e, a partir
+do Python 3.11, levanta ValueError acima de 4300 dígitos. Aqui o valor numérico
+é mantido como está: o visor recebe uma notação científica calculada a partir
+do bit_length, e os dígitos completos só são gerados sob demanda, em blocos.
+"""
+
+from decimal import Decimal, localcontext  # Logaritmo com precisão suficiente para o expoente
+
+DISPLAY_DIGITS = 30  # Inteiros com mais dígitos que isso aparecem em notação científica
+SIGNIFICANT_DIGITS = 12  # Algarismos da mantissa mostrada no visor
+LEAF_DIGITS = 1000  # Tamanho dos pedaços convertidos com str() (bem abaixo do limite de 4300)
+CHUNK_SIZE = 10000  # Dígitos entregues por vez em iter_digits
+
+_LOG10_2 = 0.30102999566398120  # log10(2), usado só para a estimativa rápida do número de dígitos
+
+
+def is_huge(value):
+	"""Indica se o valor é um inteiro grande demais para o visor."""
+	return isinstance(value, int) and not isinstance(value, bool) and value.bit_length() * _LOG10_2 > DISPLAY_DIGITS
+
+
+def scientific(value, significant=SIGNIFICANT_DIGITS):
+	"""Notação científica de um inteiro sem convertê-lo para decimal (custo O(1) no tamanho)."""
+	sign = "-" if value < 0 else ""
+	value = abs(value)
+	shift = max(value.bit_length() - 64, 0)  # Só os 64 bits mais significativos importam para a mantissa
+	top = value >> shift
+	with localcontext() as ctx:
+		ctx.prec = 40
+		log = Decimal(top).log10() + shift * Decimal(2).log10()
+		exponent = int(log)
+		mantissa = round(Decimal(10) ** (log - exponent), significant - 1)
+		if mantissa >= 10:  # Arredondamento de 9.999... para 10
+			mantissa /= 10
+			exponent += 1
+	text = f"{mantissa:f}".rstrip("0").rstrip(".")
+	return f"{sign}{text}e+{exponent}"
+
+
+def _leaf_digits(value, width, powers, level):
+	"""Gera os dígitos de value (com `width` dígitos, zeros à esquerda) dividindo ao meio recursivamente."""
+	if level < 0:
+		yield str(value).zfill(width) if width else str(value)
+		return
+	power, digits = powers[level]
+	high, low = divmod(value, power)
+	if width or high:
+		yield from _leaf_digits(high, width - digits if width else 0, powers, level - 1)
+		yield from _leaf_digits(low, digits, powers, level - 1)
+	else:
+		yield from _leaf_digits(low, 0, powers, level - 1)
+
+
+def iter_digits(value, chunk_size=CHUNK_SIZE):
+	"""Gera a representação decimal completa em blocos, começando pelos dígitos mais significativos."""
+	if value < 0:
+		yield "-"
+		value = -value
+	powers = []  # powers[i] = (10**(LEAF_DIGITS * 2**i), LEAF_DIGITS * 2**i)
+	digits = LEAF_DIGITS
+	while value.bit_length() * _LOG10_2 > digits:
+		powers.append((10 ** digits, digits))
+		digits *= 2
+	buffer = ""
+	for piece in _leaf_digits(value, 0, powers, len(powers) - 1):
+		buffer += piece
+		while len(buffer) >= chunk_size:
+			yield buffer[:chunk_size]
+			buffer = buffer[chunk_size:]
+	if buffer:
+		yield buffer
+
+
+def format_full(value):
+	"""Texto completo do resultado, sem esbarrar no limite de dígitos do str(int)."""
+	if is_huge(value):
+		return "".join(iter_digits(value))
+	return str(value)
+
+
+def is_literal(value):
+	"""Indica se str(value) pode voltar à expressão como operando (número finito de tamanho comum)."""
+	if isinstance(value, bool) or not isinstance(value, (int, float, complex)):
+		return False  # Ex.: matriz do modo complexo
+	if isinstance(value, int):
+		return not is_huge(value)
+	return all(part not in (float("inf"), float("-inf")) and part == part for part in (value.real, value.imag))
+
+
+class ResultView:
+	"""Resultado de um cálculo: mantém o valor e decide como mostrá-lo."""
+
+	__slots__ = ("value",)
+
+	def __init__(self, value):
+		self.value = value
+
+	@property
+	def is_huge(self):
+		return is_huge(self.value)
+
+	@property
+	def by_reference(self):
+		"""O visor mostra só um resumo e a expressão seguinte usa o valor guardado (ans)."""
+		return not is_literal(self.value)
+
+	def summary(self):
+		"""Texto curto para o visor."""
+		if self.is_huge:
+			return scientific(self.value)
+		return str(self.value)
+
+	def chunks(self, chunk_size=CHUNK_SIZE):
+		"""Dígitos completos, gerados sob demanda."""
+		if self.is_huge:
+			return iter_digits(self.value, chunk_size)
+		return iter([str(self.value)])
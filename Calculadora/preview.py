@@ -0,0 +1,126 @@
+"""Avaliação incremental usada na prévia do resultado enquanto se digita.
+
+A expressão é analisada pelo motor (com cache) e avaliada nó a nó. Cada
+subárvore recebe um identificador estrutural (tipo do nó + identificadores dos
+filhos), e o valor de cada identificador fica guardado: ao digitar mais uma
+tecla, as subárvores do prefixo já avaliado são reaproveitadas e só a parte
+nova da expressão é recalculada.
+
+A interface não avalia nada no próprio processo: preview_summary roda em um
+processo auxiliar (EvaluationWorker), que mantém o avaliador e o seu cache
+entre as teclas e é substituído se uma subexpressão estourar o tempo.
+"""
+
+import ast  # Nós da árvore produzida pelo motor
+import operator  # Operadores binários e unários
+
+from engine import BUILTIN_FUNCTIONS, FINANCIAL_FUNCTIONS, MATH_FUNCTIONS, RADIANS, compile_expression, function_name
+from optimizer import too_costly
+from presentation import ResultView
+
+PREVIEW_CACHE_SIZE = 20000  # Subárvores guardadas antes de esvaziar o cache
+PREVIEW_MAX_BITS = 1_000_000  # Inteiros maiores que isso não entram na prévia (só no "=")
+
+_evaluator = None  # Avaliador do processo auxiliar da prévia (criado na primeira prévia)
+
+_BINARY = {
+	ast.Add: operator.add,
+	ast.Sub: operator.sub,
+	ast.Mult: operator.mul,
+	ast.Div: operator.truediv,
+	ast.FloorDiv: operator.floordiv,
+	ast.Pow: operator.pow,
+}
+_UNARY = {
+	ast.UAdd: operator.pos,
+	ast.USub: operator.neg,
+}
+_FUNCTIONS = {
+	**{"math." + name: function for name, function in MATH_FUNCTIONS.items()},
+	**{"fin." + name: function for name, function in FINANCIAL_FUNCTIONS.items()},
+	**BUILTIN_FUNCTIONS,
+}
+
+
+class PreviewUnavailable(Exception):
+	"""A subexpressão é cara demais para ser avaliada na prévia."""
+
+
+class IncrementalEvaluator:
+	"""Avaliador que reaproveita os valores das subárvores já calculadas."""
+
+	def __init__(self, max_entries=PREVIEW_CACHE_SIZE):
+		self.max_entries = max_entries
+		self._ids = {}  # Chave estrutural -> identificador da subárvore
+		self._values = {}  # Identificador -> valor já calculado
+		self._bound = {}  # Variáveis usadas nos valores guardados
+
+	def evaluate(self, expression, *, angle=RADIANS, **values):
+		"""Avalia a expressão; levanta as mesmas exceções do motor ou PreviewUnavailable."""
+		tree = compile_expression(expression, sorted(values), angle).tree
+		if len(self._ids) > self.max_entries or not self._same_bindings(values):
+			self.clear()
+		self._bound = values
+		return self._visit(tree.body)[1]
+
+	def clear(self):
+		self._ids.clear()
+		self._values.clear()
+
+	def _same_bindings(self, values):
+		return values.keys() == self._bound.keys() and all(_same_value(values[name], self._bound[name]) for name in values)
+
+	def _intern(self, key):
+		node_id = self._ids.get(key)
+		if node_id is None:
+			node_id = self._ids[key] = len(self._ids)
+		return node_id
+
+	def _visit(self, node):
+		"""Retorna (identificador, valor) da subárvore, calculando apenas o que é novo."""
+		if isinstance(node, ast.Constant):
+			return self._intern(("const", type(node.value), node.value)), node.value
+		if isinstance(node, ast.Name):
+			return self._intern(("name", node.id)), self._bound[node.id]
+		if isinstance(node, ast.BinOp):
+			left_id, left = self._visit(node.left)
+			right_id, right = self._visit(node.right)
+			op = type(node.op)
+			node_id = self._intern((op, left_id, right_id))
+			if node_id not in self._values:
+				if too_costly(op, left, right, PREVIEW_MAX_BITS):  # Evita travar a interface (ex.: 9**9**9)
+					raise PreviewUnavailable
+				self._values[node_id] = _BINARY[op](left, right)
+			return node_id, self._values[node_id]
+		if isinstance(node, ast.UnaryOp):
+			operand_id, operand = self._visit(node.operand)
+			op = type(node.op)
+			node_id = self._intern((op, operand_id))
+			if node_id not in self._values:
+				self._values[node_id] = _UNARY[op](operand)
+			return node_id, self._values[node_id]
+		name = function_name(node)  # ast.Call já validado pelo motor
+		arguments = [self._visit(argument) for argument in node.args]
+		node_id = self._intern((name, *(argument_id for argument_id, _ in arguments)))
+		if node_id not in self._values:
+			self._values[node_id] = _FUNCTIONS[name](*(value for _, value in arguments))
+		return node_id, self._values[node_id]
+
+
+def _same_value(value, bound):
+	"""O mesmo objeto, ou um número igual (as variáveis chegam copiadas ao processo auxiliar)."""
+	if value is bound:
+		return True
+	if type(value) is not type(bound):
+		return False
+	if type(value) is int:
+		return value == bound
+	return type(value) in (float, complex) and repr(value) == repr(bound)  # repr distingue -0.0 de 0.0
+
+
+def preview_summary(expression, angle=RADIANS, values=None):
+	"""Resumo do valor da expressão para a linha de prévia (tarefa do EvaluationWorker)."""
+	global _evaluator
+	if _evaluator is None:
+		_evaluator = IncrementalEvaluator()
+	return ResultView(_evaluator.evaluate(expression, angle=angle, **(values or {}))).summary()
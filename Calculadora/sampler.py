@@ -0,0 +1,191 @@
+"""Amostragem adaptativa e vetorizada de y = f(x) para o modo gráfico.
+
+O eixo x é dividido em blocos (tiles) de TILE_INTERVALS intervalos com passo
+2**nível. Cada bloco é avaliado uma vez, com o NumPy, e refinado só onde a
+curva dobra muito ou muda de domínio (o ponto do meio de cada intervalo
+marcado entra na próxima passada). Saltos que sobram depois do refinamento
+(polos de math.tan, divisão inteira) viram um nan entre os pontos, e o
+desenho interrompe a linha ali.
+
+Os blocos ficam guardados: arrastar o gráfico só avalia os blocos que entram
+na tela, e ao mudar de nível no zoom os pontos do nível vizinho já calculado
+são reaproveitados (metade dos pontos ao aproximar, todos ao afastar).
+
+Na interface, o sampler roda no processo auxiliar da janela do gráfico
+(sample_task); só os pontos prontos voltam para o Tk.
+"""
+
+import math  # log2 na escolha do nível
+
+import numpy as np  # Avaliação e refinamento em arrays
+
+from engine import RADIANS, compile_expression  # Mesmo parser/cache do modo escalar
+from vectorized import NAMESPACE  # Ufuncs no lugar das funções de math
+
+VARIABLE = "x"  # Variável livre do gráfico
+TILE_INTERVALS = 64  # Intervalos de cada bloco no passo base (par: o nível vizinho divide ao meio)
+PIXELS_PER_SAMPLE = 4  # Passo base desejado, em pixels da tela
+MAX_REFINE = 6  # Passadas de refinamento: até 64 vezes mais pontos onde a curva exige
+MAX_BEND = 0.15  # Mudança de direção (radianos) que dispara o refinamento
+JUMP_RATIO = 20.0  # Variação JUMP_RATIO vezes maior que as vizinhas (mesmo com o mesmo sinal) é um salto
+SAMPLER_CACHE_SIZE = 4096  # Blocos guardados antes de esvaziar o cache
+
+_sampler = None  # AdaptiveSampler do processo auxiliar de uma janela de gráfico
+_sampler_key = None  # (expressão, ângulo) de _sampler
+
+
+class _Tile:
+	"""Pontos de um bloco: a grade base (reaproveitada entre níveis) e a curva refinada."""
+
+	__slots__ = ("base", "xs", "ys")
+
+	def __init__(self, base, xs, ys):
+		self.base = base  # y nos TILE_INTERVALS + 1 pontos da grade
+		self.xs = xs
+		self.ys = ys
+
+
+class AdaptiveSampler:
+	"""Amostras de uma expressão em x, calculadas por bloco e guardadas entre redesenhos."""
+
+	def __init__(self, expression, angle=RADIANS, values=None, max_tiles=SAMPLER_CACHE_SIZE):
+		self.values = dict(values or {})  # Outras variáveis livres (ex.: o resultado anterior)
+		self.compiled = compile_expression(expression, tuple(sorted({VARIABLE, *self.values})), angle)
+		self.max_tiles = max_tiles
+		self.tiles = {}  # (nível, índice) -> _Tile
+		self.evaluated = 0  # Pontos avaliados até agora (mede o reaproveitamento)
+
+	def _evaluate(self, xs):
+		with np.errstate(all="ignore"):
+			ys = self.compiled.run(NAMESPACE, {**self.values, VARIABLE: xs})
+		self.evaluated += len(xs)
+		ys = np.asarray(ys, dtype=float)
+		if ys.ndim == 0:  # Expressão sem x
+			return np.full(xs.shape, float(ys))
+		return ys
+
+	@staticmethod
+	def level_for(x_min, x_max, width):
+		"""Nível cujo passo (2**nível) fica perto de PIXELS_PER_SAMPLE pixels na tela."""
+		step = (x_max - x_min) / max(width, 1) * PIXELS_PER_SAMPLE
+		return math.floor(math.log2(step))
+
+	def sample(self, x_min, x_max, width):
+		"""Retorna (xs, ys) cobrindo [x_min, x_max] para uma tela com `width` pixels."""
+		level = self.level_for(x_min, x_max, width)
+		span = TILE_INTERVALS * 2.0 ** level
+		first = math.floor(x_min / span)
+		last = math.floor(x_max / span)
+		if len(self.tiles) > self.max_tiles:
+			self.tiles.clear()
+		xs, ys = [], []
+		for index in range(first, last + 1):
+			tile = self.tile(level, index)
+			start = 1 if xs else 0  # O primeiro ponto repete o último do bloco anterior
+			xs.append(tile.xs[start:])
+			ys.append(tile.ys[start:])
+		return self._break_jumps(np.concatenate(xs), np.concatenate(ys))
+
+	def tile(self, level, index):
+		"""Bloco `index` do nível, calculado (ou reaproveitado) sob demanda."""
+		tile = self.tiles.get((level, index))
+		if tile is None:
+			step = 2.0 ** level
+			xs = (index * TILE_INTERVALS + np.arange(TILE_INTERVALS + 1)) * step
+			base = self._base_from_neighbors(level, index)
+			if base is None:
+				base = self._evaluate(xs)
+			ghosts = np.array((xs[0] - step, xs[-1] + step))  # Um ponto de cada vizinho: a borda também é refinada
+			ghost_ys = self._evaluate(ghosts)
+			refined_xs, refined_ys = self._refine(
+				np.concatenate((ghosts[:1], xs, ghosts[1:])), np.concatenate((ghost_ys[:1], base, ghost_ys[1:])), step)
+			inside = slice(np.searchsorted(refined_xs, xs[0]), np.searchsorted(refined_xs, xs[-1], side="right"))
+			tile = self.tiles[level, index] = _Tile(base, refined_xs[inside], refined_ys[inside])
+		return tile
+
+	def _base_from_neighbors(self, level, index):
+		"""Grade base montada a partir dos níveis vizinhos já calculados, ou None."""
+		half = TILE_INTERVALS // 2
+		parent = self.tiles.get((level + 1, index // 2))
+		if parent is not None:  # Aproximando: os pontos pares já existem no nível de cima
+			base = np.empty(TILE_INTERVALS + 1)
+			offset = (index % 2) * half
+			base[0::2] = parent.base[offset:offset + half + 1]
+			step = 2.0 ** level
+			odd = (index * TILE_INTERVALS + np.arange(1, TILE_INTERVALS, 2)) * step
+			base[1::2] = self._evaluate(odd)
+			return base
+		left = self.tiles.get((level - 1, 2 * index))
+		right = self.tiles.get((level - 1, 2 * index + 1))
+		if left is not None and right is not None:  # Afastando: todos os pontos existem no nível de baixo
+			return np.concatenate((left.base[0::2], right.base[2::2]))
+		return None
+
+	def _refine(self, xs, ys, step):
+		"""Insere pontos médios onde a curva dobra ou sai do domínio."""
+		finite = np.isfinite(ys)
+		scale = np.median(np.abs(np.diff(ys[finite]))) / step if finite.sum() > 1 else 0.0
+		scale = scale if scale > 0 and np.isfinite(scale) else 1.0  # Inclinação típica: normaliza o eixo y
+		for _ in range(MAX_REFINE):
+			rough = self._rough(xs, ys, step, scale)
+			if not rough.any():
+				break
+			positions = np.flatnonzero(rough)
+			middles = (xs[positions] + xs[positions + 1]) / 2
+			xs = np.insert(xs, positions + 1, middles)
+			ys = np.insert(ys, positions + 1, self._evaluate(middles))
+		return xs, ys
+
+	def _break_jumps(self, xs, ys):
+		"""Insere um nan no meio de cada salto (feito na curva já emendada: pega saltos na borda dos blocos)."""
+		jumps = np.flatnonzero(self._jumps(ys))
+		if len(jumps):
+			xs = np.insert(xs, jumps + 1, (xs[jumps] + xs[jumps + 1]) / 2)
+			ys = np.insert(ys, jumps + 1, np.nan)
+		return xs, ys
+
+	@staticmethod
+	def _rough(xs, ys, step, scale):
+		"""Intervalos que precisam de um ponto no meio."""
+		dx = np.diff(xs) / step
+		dy = np.diff(ys) / (scale * step)
+		finite = np.isfinite(ys)
+		rough = finite[:-1] != finite[1:]  # Borda do domínio (ex.: math.sqrt de negativo)
+		angles = np.arctan2(dy, dx)
+		with np.errstate(invalid="ignore"):
+			bend = np.abs(np.diff(angles)) > MAX_BEND  # Ponto interno onde a direção muda
+		rough[:-1] |= bend
+		rough[1:] |= bend
+		return rough & (dx > 2.0 ** -MAX_REFINE)  # Não divide abaixo da resolução máxima
+
+	@staticmethod
+	def _jumps(ys):
+		"""Intervalos cuja variação é maior que as vizinhas e tem o sinal oposto ao delas, ou é muito maior.
+
+		Depois do refinamento, um extremo suave não muda de sinal duas vezes seguidas;
+		um polo (math.tan) muda, e um degrau (divisão inteira) fica bem maior que os vizinhos.
+		"""
+		dy = np.diff(ys)
+		jumps = np.zeros(len(dy), dtype=bool)
+		if len(dy) < 3:
+			return jumps
+		middle, before, after = dy[1:-1], dy[:-2], dy[2:]
+		neighbors = np.maximum(np.abs(before), np.abs(after))
+		with np.errstate(invalid="ignore"):
+			flips = (np.sign(middle) != np.sign(before)) & (np.sign(middle) != np.sign(after)) & (np.abs(middle) > neighbors)
+			jumps[1:-1] = flips | (np.abs(middle) > JUMP_RATIO * neighbors)
+		return jumps
+
+
+def sample_task(expression, angle, values, x_min, x_max, width):
+	"""AdaptiveSampler.sample no processo auxiliar da janela de gráfico (tarefa do EvaluationWorker).
+
+	Cada janela tem o seu processo: o sampler criado na primeira chamada guarda os
+	blocos para os próximos redesenhos (as variáveis de uma janela não mudam) e é
+	refeito se o processo for substituído ou receber outra expressão.
+	"""
+	global _sampler, _sampler_key
+	if _sampler is None or _sampler_key != (expression, angle):
+		_sampler = AdaptiveSampler(expression, angle, values)
+		_sampler_key = (expression, angle)
+	return _sampler.sample(x_min, x_max, width)
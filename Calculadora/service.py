@@ -0,0 +1,434 @@
+"""Serviço local de avaliação (HTTP sobre TCP ou socket Unix), com asyncio.
+
+Outras ferramentas enviam POST /evaluate com {"expression": "...", "values":
+{"x": 1.5}, "angle": "rad"} e recebem {"result": "..."}, o mesmo texto do modo
+batch. As avaliações rodam nos mesmos processos auxiliares da interface
+(worker.EvaluationWorker), com tempo e memória limitados.
+
+Pedidos que chegam dentro de uma janela curta (ou enquanto todos os processos
+estão ocupados) formam um lote, avaliado de uma vez no processo auxiliar: cada
+expressão distinta do lote é compilada uma única vez (cache do motor), uma
+expressão sem variáveis é avaliada uma vez para todos os pedidos, e os pedidos
+da mesma expressão com variáveis float viram uma avaliação vetorizada do NumPy.
+Por padrão só se vetorizam as operações que o NumPy arredonda exatamente como o
+Python (+, -, *, /, //, abs e raiz), para que o resultado não dependa do lote;
+com exact=False, potências e funções transcendentes também são vetorizadas e o
+último dígito pode diferir da avaliação escalar.
+
+Acima de max_pending pedidos na fila o serviço responde 503 (com Retry-After)
+em vez de acumular memória e latência. Com instrumented=True (--metricas) os
+processos auxiliares ligam o módulo metrics e GET /metrics soma os números de
+todos eles no formato do Prometheus.
+"""
+
+import ast  # Operações presentes na árvore compilada
+import asyncio  # Servidor, janela de agrupamento e fila de pedidos
+import json  # Corpo dos pedidos e das respostas
+import os  # Número de CPUs e remoção do socket Unix
+from concurrent.futures import ThreadPoolExecutor  # Espera dos processos auxiliares fora do laço de eventos
+from functools import lru_cache  # Decisão de vetorização por expressão compilada
+
+import metrics  # Instrumentação opcional dos processos auxiliares (GET /metrics)
+from engine import CACHE_SIZE, DEGREES, RADIANS, ExpressionError, compile_expression, function_name, normalize  # Mesmo motor e cache da interface
+from presentation import format_full  # Mesmo texto do modo batch
+from worker import EVAL_MEMORY_LIMIT, EVAL_TIMEOUT, EvaluationError, EvaluationTimeout, EvaluationWorker  # Processos com tempo e memória limitados
+
+BATCH_WINDOW = 0.002  # Segundos de espera por outros pedidos antes de enviar um lote
+MAX_BATCH = 1024  # Pedidos por lote
+MAX_PENDING = 20000  # Pedidos na fila (e em avaliação) antes de recusar com 503
+MAX_BODY = 64 * 1024  # Bytes do corpo de um pedido
+VECTORIZE_MIN = 8  # Pedidos da mesma expressão a partir dos quais a avaliação é vetorizada
+
+EXACT_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.UAdd, ast.USub)  # Mesmo arredondamento no NumPy
+EXACT_FUNCTIONS = ("abs", "math.sqrt")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large", 422: "Unprocessable Entity",
+	500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+class ServiceOverloaded(Exception):
+	"""A fila de pedidos está cheia."""
+
+
+# Lado do processo auxiliar
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _vectorizable(compiled, exact):
+	"""Indica se a expressão pode ser avaliada em lote com as ufuncs sem mudar o resultado."""
+	if not exact:
+		return True
+	for node in ast.walk(compiled.tree):
+		if isinstance(node, (ast.BinOp, ast.UnaryOp)) and not isinstance(node.op, EXACT_OPERATORS):
+			return False
+		if isinstance(node, ast.Call) and function_name(node) not in EXACT_FUNCTIONS:
+			return False
+	return True
+
+
+def _run(compiled, values):
+	try:
+		return True, format_full(compiled(**values))
+	except Exception as exc:  # Erro de uma expressão não afeta as outras do lote
+		return False, exc
+
+
+def _run_vectorized(compiled, names, rows):
+	"""Texto de cada resultado da avaliação vetorizada; None onde é preciso refazer no modo escalar."""
+	if any(type(row[name]) is not float for row in rows for name in names):
+		return None  # Inteiros continuam exatos (e inteiros) no modo escalar
+	try:
+		import numpy as np  # Dependência opcional: sem ela o lote é avaliado expressão a expressão
+		from vectorized import NAMESPACE
+	except ImportError:
+		return None
+	arrays = {name: np.array([row[name] for row in rows]) for name in names}
+	with np.errstate(all="ignore"):
+		try:
+			result = compiled.run(NAMESPACE, arrays)
+		except Exception:
+			return None
+	if np.shape(result) != (len(rows),) or result.dtype != np.float64:  # Ex.: expressão que não usa as variáveis
+		return None
+	finite = np.isfinite(result)  # Erros (divisão por zero, domínio) viram inf/nan: refeitos para dar a mesma exceção
+	return [str(value) if ok else None for value, ok in zip(result.tolist(), finite.tolist())]
+
+
+def evaluate_requests(requests, exact=True):
+	"""Avalia um lote de (expressão, variáveis, ângulo) e retorna (ok, texto ou exceção) de cada um.
+
+	Roda no processo auxiliar (EvaluationWorker.submit_task). Pedidos com a mesma
+	expressão, os mesmos nomes de variáveis e o mesmo ângulo formam um grupo,
+	compilado uma única vez.
+	"""
+	results = [None] * len(requests)
+	groups = {}
+	for index, (expression, values, angle) in enumerate(requests):
+		groups.setdefault((normalize(expression), tuple(sorted(values)), angle), []).append(index)
+	for (source, names, angle), indexes in groups.items():
+		try:
+			compiled = compile_expression(source, names, angle)
+		except Exception as exc:
+			for index in indexes:
+				results[index] = (False, exc)
+			continue
+		if not names:  # Expressão constante: uma avaliação para todos os pedidos
+			outcome = _run(compiled, {})
+			for index in indexes:
+				results[index] = outcome
+			continue
+		rows = [requests[index][1] for index in indexes]
+		texts = None
+		if len(rows) >= VECTORIZE_MIN and _vectorizable(compiled, exact):
+			texts = _run_vectorized(compiled, names, rows)
+		for position, index in enumerate(indexes):
+			if texts is not None and texts[position] is not None:
+				results[index] = (True, texts[position])
+			else:
+				results[index] = _run(compiled, rows[position])
+	return results
+
+
+def evaluate_requests_measured(requests, exact=True):
+	"""evaluate_requests mais os números da instrumentação do processo auxiliar."""
+	return evaluate_requests(requests, exact), metrics.snapshot()
+
+
+# Lado do servidor
+
+def _request_key(request):
+	"""Identifica pedidos iguais (expressão, ângulo e variáveis) dentro de um lote."""
+	expression, values, angle = request
+	return expression, angle, repr(sorted(values.items()))
+
+
+class EvaluationService:
+	"""Fila de pedidos agrupados em lotes e distribuídos entre processos auxiliares."""
+
+	def __init__(self, workers=None, window=BATCH_WINDOW, max_batch=MAX_BATCH, max_pending=MAX_PENDING,
+			timeout=EVAL_TIMEOUT, memory_limit=EVAL_MEMORY_LIMIT, exact=True, instrumented=False):
+		self.workers = workers or os.cpu_count() or 1
+		self.window = window
+		self.max_batch = max_batch
+		self.max_pending = max_pending
+		self.timeout = timeout
+		self.memory_limit = memory_limit
+		self.exact = exact
+		self.instrumented = instrumented
+		self.stats = {"requests": 0, "rejected": 0, "batches": 0, "batched_requests": 0, "largest_batch": 0, "timeouts": 0}
+		self._pending = []  # (pedido, future) à espera de um lote
+		self._queued = 0  # Pedidos aceitos e ainda sem resposta
+		self._ready = None
+		self._idle = None
+		self._tasks = set()
+		self._threads = None
+		self._pool = []
+		self._measures = {}  # Processo auxiliar -> último snapshot de metrics
+		self._retired = metrics.snapshot()  # Números de processos já substituídos (tempo esgotado, por exemplo)
+
+	async def start(self):
+		self._ready = asyncio.Event()
+		self._idle = asyncio.Queue()
+		self._threads = ThreadPoolExecutor(max_workers=self.workers)
+		if self.instrumented:
+			os.environ["CALCULADORA_METRICS"] = "1"  # Herdada pelos processos auxiliares
+		for _ in range(self.workers):
+			worker = EvaluationWorker(self.timeout, self.memory_limit)
+			self._pool.append(worker)
+			self._idle.put_nowait(worker)
+		self._spawn(self._dispatch())
+
+	async def close(self):
+		for task in list(self._tasks):
+			task.cancel()
+		await asyncio.gather(*self._tasks, return_exceptions=True)
+		for worker in self._pool:
+			worker.close()
+		self._threads.shutdown()
+
+	async def evaluate(self, expression, values=None, angle=RADIANS):
+		"""Avalia uma expressão no próximo lote; retorna o texto do resultado ou levanta o erro."""
+		if self._queued >= self.max_pending:
+			self.stats["rejected"] += 1
+			raise ServiceOverloaded(f"{self._queued} pedidos na fila")
+		future = asyncio.get_running_loop().create_future()
+		self._pending.append(((expression, values or {}, angle), future))
+		self._queued += 1
+		self.stats["requests"] += 1
+		self._ready.set()
+		try:
+			return await future
+		finally:
+			self._queued -= 1
+
+	def _spawn(self, coroutine):
+		task = asyncio.ensure_future(coroutine)
+		self._tasks.add(task)
+		task.add_done_callback(self._tasks.discard)
+
+	async def _dispatch(self):  # Um lote para cada processo livre
+		while True:
+			worker = await self._idle.get()
+			await self._ready.wait()
+			if len(self._pending) < self.max_batch:  # Dá tempo para outros pedidos entrarem no lote
+				await asyncio.sleep(self.window)
+			batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+			if not self._pending:
+				self._ready.clear()
+			self.stats["batches"] += 1
+			self.stats["batched_requests"] += len(batch)
+			self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+			self._spawn(self._run(worker, batch))
+
+	async def _run(self, worker, batch):
+		try:
+			await self._evaluate_batch(worker, batch)
+		finally:
+			self._idle.put_nowait(worker)
+
+	async def _evaluate_batch(self, worker, batch):
+		"""Avalia o lote; se o processo estoura o tempo ou morre, refaz cada pedido sozinho."""
+		batch = [(request, future) for request, future in batch if not future.done()]  # Cliente desistiu
+		if not batch:
+			return
+		try:
+			results = await self._submit(worker, [request for request, _ in batch])
+		except EvaluationError as exc:  # O processo já foi reiniciado por poll()
+			self._retire(worker, exc)
+			if len(batch) > 1:
+				await self._evaluate_each(worker, batch)
+				return
+			results = [(False, exc)]
+		except Exception as exc:  # Resultado que não pôde ser enviado de volta, por exemplo
+			results = [(False, exc)] * len(batch)
+		self._resolve(batch, results)
+
+	async def _evaluate_each(self, worker, batch):
+		"""Um pedido por vez, cada um com o tempo limite inteiro: só o culpado recebe o erro.
+
+		Cada resposta sai assim que fica pronta. Pedidos idênticos a um que já
+		estourou o tempo recebem o mesmo erro sem uma nova espera.
+		"""
+		failed = {}
+		for request, future in batch:
+			if future.done():
+				continue
+			key = _request_key(request)
+			if key in failed:
+				self._resolve([(request, future)], [(False, failed[key])])
+				continue
+			try:
+				results = await self._submit(worker, [request])
+			except EvaluationError as exc:
+				self._retire(worker, exc)
+				failed[key] = exc
+				results = [(False, exc)]
+			except Exception as exc:
+				results = [(False, exc)]
+			self._resolve([(request, future)], results)
+
+	async def _submit(self, worker, requests):
+		"""Envia os pedidos ao processo auxiliar e espera os resultados fora do laço de eventos."""
+		loop = asyncio.get_running_loop()
+		if self.instrumented:
+			worker.submit_task(evaluate_requests_measured, requests, self.exact)
+			results, self._measures[worker] = await loop.run_in_executor(self._threads, worker.wait)
+			return results
+		worker.submit_task(evaluate_requests, requests, self.exact)
+		return await loop.run_in_executor(self._threads, worker.wait)
+
+	def _retire(self, worker, exc):
+		"""Registra a falha de um processo auxiliar (que poll() já substituiu)."""
+		if worker in self._measures:  # O processo novo recomeça do zero
+			self._retired = metrics.merge([self._retired, self._measures.pop(worker)])
+		if isinstance(exc, EvaluationTimeout):
+			self.stats["timeouts"] += 1
+
+	@staticmethod
+	def _resolve(batch, results):
+		for (_, future), (ok, value) in zip(batch, results):
+			if future.done():
+				continue
+			if ok:
+				future.set_result(value)
+			else:
+				future.set_exception(value)
+
+	def render_metrics(self):
+		"""Números do serviço e dos processos auxiliares no formato do Prometheus."""
+		lines = []
+		for key in ("requests", "rejected", "batches", "batched_requests", "timeouts"):
+			name = f"{metrics.PREFIX}_service_{key}_total"
+			lines += [f"# TYPE {name} counter", f"{name} {self.stats[key]}"]
+		name = f"{metrics.PREFIX}_service_queued"
+		lines += [f"# TYPE {name} gauge", f"{name} {self._queued}"]
+		return "\n".join(lines) + "\n" + metrics.render(metrics.merge([self._retired, *self._measures.values()]))
+
+	# HTTP/1.1 mínimo (com keep-alive), sem dependências
+
+	async def handle(self, reader, writer):
+		try:
+			while True:
+				request_line = await reader.readline()
+				if not request_line:
+					break
+				method, path, version = request_line.decode("latin-1").split()
+				headers = {}
+				while True:
+					line = await reader.readline()
+					if line in (b"\r\n", b"\n", b""):
+						break
+					name, _, value = line.decode("latin-1").partition(":")
+					headers[name.strip().lower()] = value.strip()
+				length = int(headers.get("content-length", 0))
+				keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+				if length > MAX_BODY:
+					status, payload, keep_alive = 413, {"error": "corpo grande demais"}, False
+				else:
+					body = await reader.readexactly(length) if length else b""
+					status, payload = await self.route(method, path, body)
+				writer.write(_response(status, payload, keep_alive))
+				await writer.drain()
+				if not keep_alive:
+					break
+		except (ValueError, asyncio.IncompleteReadError, ConnectionError):  # Pedido malformado ou conexão encerrada
+			pass
+		finally:
+			writer.close()
+
+	async def route(self, method, path, body):
+		"""(status, corpo JSON) da resposta a um pedido."""
+		if method == "GET" and path == "/stats":
+			return 200, {**self.stats, "queued": self._queued}
+		if method == "GET" and path == "/metrics":
+			return 200, self.render_metrics()
+		if path != "/evaluate":
+			return 404, {"error": "rota desconhecida"}
+		if method != "POST":
+			return 404, {"error": "use POST"}
+		try:
+			expression, values, angle = _parse_request(body)
+		except ValueError as exc:
+			return 400, {"error": str(exc)}
+		try:
+			return 200, {"result": await self.evaluate(expression, values, angle)}
+		except ServiceOverloaded as exc:
+			return 503, {"error": str(exc)}
+		except EvaluationTimeout as exc:
+			return 504, {"error": str(exc)}
+		except ExpressionError as exc:
+			return 400, {"error": str(exc)}
+		except EvaluationError as exc:  # Processo auxiliar encerrado (ex.: memória)
+			return 500, {"error": str(exc)}
+		except Exception as exc:  # Mesma mensagem mostrada pela interface, com o motivo
+			return 422, {"error": "Erro", "detail": f"{type(exc).__name__}: {exc}"}
+
+
+def _parse_request(body):
+	try:
+		request = json.loads(body)
+	except (UnicodeDecodeError, json.JSONDecodeError):
+		raise ValueError("corpo não é JSON") from None
+	if not isinstance(request, dict) or not isinstance(request.get("expression"), str):
+		raise ValueError('esperado {"expression": "..."}')
+	values = request.get("values", {})
+	if not isinstance(values, dict) or not all(
+			name.isidentifier() and type(value) in (int, float) for name, value in values.items()):
+		raise ValueError("values deve mapear nomes para números")
+	angle = request.get("angle", RADIANS)
+	if angle not in (RADIANS, DEGREES):
+		raise ValueError(f"angle deve ser {RADIANS!r} ou {DEGREES!r}")
+	return request["expression"], values, angle
+
+
+def _response(status, payload, keep_alive):
+	if isinstance(payload, str):  # Texto do Prometheus
+		body, kind = payload.encode(), "text/plain; version=0.0.4; charset=utf-8"
+	else:
+		body, kind = json.dumps(payload).encode(), "application/json"
+	head = [f"HTTP/1.1 {status} {_REASONS[status]}", f"Content-Type: {kind}",
+		f"Content-Length: {len(body)}", "Connection: " + ("keep-alive" if keep_alive else "close")]
+	if status == 503:
+		head.append("Retry-After: 1")
+	return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def serve(host="127.0.0.1", port=8765, unix_path=None, **options):
+	"""Inicia o serviço e atende até ser interrompido; options vai para EvaluationService."""
+	service = EvaluationService(**options)
+	await service.start()
+	if unix_path:
+		if os.path.exists(unix_path):  # Socket de uma execução anterior
+			os.unlink(unix_path)
+		server = await asyncio.start_unix_server(service.handle, unix_path)
+	else:
+		server = await asyncio.start_server(service.handle, host, port)
+	try:
+		async with server:
+			await server.serve_forever()
+	finally:
+		await service.close()
+		if unix_path and os.path.exists(unix_path):
+			os.unlink(unix_path)
+
+
+def main_serve(argv):  # Ponto de entrada do serviço (main.py --serve)
+	import argparse  # Importado só aqui, como no modo batch
+	parser = argparse.ArgumentParser(description="Serviço local de avaliação de expressões da calculadora.")
+	parser.add_argument("--serve", action="store_true", help="modo serviço")
+	parser.add_argument("--host", default="127.0.0.1", help="endereço TCP (padrão: só a máquina local)")
+	parser.add_argument("--port", type=int, default=8765, help="porta TCP")
+	parser.add_argument("--unix", default=None, help="caminho de um socket Unix (no lugar de TCP)")
+	parser.add_argument("--workers", type=int, default=None, help="processos de avaliação (padrão: CPUs)")
+	parser.add_argument("--janela-ms", type=float, default=BATCH_WINDOW * 1000, help="espera por pedidos para formar um lote")
+	parser.add_argument("--max-lote", type=int, default=MAX_BATCH, help="pedidos por lote")
+	parser.add_argument("--max-fila", type=int, default=MAX_PENDING, help="pedidos na fila antes de responder 503")
+	parser.add_argument("--metricas", action="store_true", help="instrumenta a avaliação e publica GET /metrics")
+	parser.add_argument("--rapido", action="store_true", help="vetoriza também potências e funções transcendentes "
+		"(o último dígito pode diferir da avaliação escalar)")
+	args = parser.parse_args(argv)
+	try:
+		asyncio.run(serve(args.host, args.port, args.unix, workers=args.workers, window=args.janela_ms / 1000,
+			max_batch=args.max_lote, max_pending=args.max_fila, exact=not args.rapido, instrumented=args.metricas))
+	except KeyboardInterrupt:
+		pass
+	return 0
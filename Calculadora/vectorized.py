@@ -0,0 +1,44 @@
+"""Avaliação vetorizada (NumPy) de expressões da calculadora.
+
+Usa o mesmo vocabulário do teclado ("math.sin(", "math.log10(", "**", "abs(",
+"/100", "fin.npv("...) mais uma variável livre x. A expressão é compilada uma vez pelo
+motor (engine) e executada sobre o array inteiro, trocando cada função
+"math.*" pela ufunc equivalente do NumPy.
+"""
+
+import numpy as np  # Dependência opcional: só este módulo precisa dela
+
+from engine import RADIANS, compile_expression, make_globals  # Mesmo parser/cache do modo escalar
+from financial_vectorized import ARRAY_FUNCTIONS  # VF, PGTO, VPL e TIR para arrays
+
+UFUNCS = {  # Função do teclado -> ufunc
+	"sqrt": np.sqrt,
+	"sin": np.sin,
+	"cos": np.cos,
+	"tan": np.tan,
+	"log": np.log,
+	"log10": np.log10,
+	"exp": np.exp,
+}
+ARRAY_BUILTINS = {
+	"abs": np.abs,
+}
+
+NAMESPACE = make_globals(UFUNCS, ARRAY_BUILTINS, ARRAY_FUNCTIONS)  # Ambiente de avaliação com as ufuncs no lugar de math
+
+
+def evaluate_array(expression, x, variable="x", angle=RADIANS):
+	"""Avalia a expressão para cada valor de x em uma única passada vetorizada.
+
+	Erros de domínio (log de negativo, divisão por zero...) viram nan/inf em vez
+	de exceções, como no restante do NumPy. Retorna sempre um array do formato de x.
+	No modo graus a conversão já está na árvore compilada: custa uma multiplicação
+	por chamada trigonométrica, feita pelo NumPy sobre o array inteiro.
+	"""
+	compiled = compile_expression(expression, (variable,), angle)
+	x = np.asarray(x, dtype=float)
+	with np.errstate(all="ignore"):
+		result = compiled.run(NAMESPACE, {variable: x})
+	if np.ndim(result) == 0:  # Expressão sem x: replica a constante
+		return np.full(x.shape, result, dtype=float)
+	return result
@@ -0,0 +1,193 @@
+"""Avaliação fora do processo da interface, com limite de tempo e de memória.
+
+Entradas patológicas como 9**9**9 não levantam exceção: o eval simplesmente não
+termina e trava o mainloop do Tk. Aqui a expressão é enviada a um processo
+auxiliar mantido aquecido; a interface consulta o resultado com poll() (via
+after()) e, se o tempo estourar, o processo é encerrado e substituído. O
+cálculo numérico (∫, d/dx, raiz) usa o mesmo processo do "="; a prévia e cada
+janela de gráfico têm o seu (submit_task). Tarefas com muitos itens (um bloco
+do modo batch) chamam report() a cada item, e o tempo limite passa a valer
+por item, e não para a tarefa inteira.
+"""
+
+import multiprocessing  # Processo auxiliar e canal de comunicação
+import os  # Threads do BLAS no processo auxiliar
+import time  # Medição do tempo de cada avaliação
+from decimal import Decimal  # Resultados do modo de precisão usados nos outros modos
+
+try:
+	import resource  # Limite de memória (somente POSIX)
+except ImportError:  # No Windows o limite de memória não é aplicado
+	resource = None
+
+from engine import RADIANS, evaluate  # Motor usado dentro do processo auxiliar
+
+EVAL_TIMEOUT = 2.0  # Segundos que uma expressão pode levar
+EVAL_MEMORY_LIMIT = 512 * 1024 * 1024  # Bytes de memória do processo auxiliar
+PROGRESS_CHECK = 0.05  # Segundos entre as conferências do progresso em wait(): folga do tempo limite por item
+PENDING = object()  # Retorno de poll() enquanto a avaliação não termina
+
+_channel = None  # (conexão, contador de itens concluídos) dentro do processo auxiliar, usados por report()
+
+
+class EvaluationError(Exception):
+	"""O processo auxiliar não conseguiu devolver um resultado."""
+
+
+class EvaluationTimeout(EvaluationError):
+	"""A expressão ultrapassou o tempo limite."""
+
+
+def _evaluate(expression, values, angle, complex_mode, digits=None):  # Uma expressão da calculadora (submit)
+	if digits:
+		from precision import evaluate_precise  # Modo de precisão (Ctrl+P)
+		return evaluate_precise(expression, angle=angle, digits=digits, **values)
+	values = {name: float(value) if isinstance(value, Decimal) else value for name, value in values.items()}  # Resultado anterior do modo de precisão
+	if complex_mode:
+		from complex_mode import evaluate_complex as evaluator  # NumPy só é importado no primeiro uso do modo ℂ
+	else:
+		evaluator = evaluate
+	return evaluator(expression, angle=angle, **values)
+
+
+def report(done, results=None):
+	"""Chamada de dentro de uma tarefa que processa vários itens: `done` itens já concluídos.
+
+	Enquanto o contador avança, o tempo limite vale para cada item, e não para a
+	tarefa inteira. results, se houver, são resultados já prontos enviados à
+	frente: ficam em EvaluationWorker.partial mesmo que a tarefa estoure o tempo
+	depois. Fora do processo auxiliar não faz nada.
+	"""
+	if _channel is None:
+		return
+	conn, progress = _channel
+	progress.value = done
+	if results:
+		conn.send((None, results))
+
+
+def _serve(conn, memory_limit, progress):  # Laço do processo auxiliar: recebe tarefas e devolve resultados
+	global _channel
+	_channel = (conn, progress)
+	if resource is not None and memory_limit:
+		resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+		os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")  # Cada thread do BLAS reserva memória virtual (conta no RLIMIT_AS)
+	while True:
+		try:
+			task, args, kwargs = conn.recv()
+		except EOFError:  # A interface foi fechada
+			return
+		try:
+			conn.send((True, task(*args, **kwargs)))
+		except Exception as exc:  # Inclui MemoryError causado pelo limite
+			conn.send((False, exc))
+
+
+class EvaluationWorker:
+	"""Processo auxiliar reutilizável para avaliar uma expressão por vez."""
+
+	def __init__(self, timeout=EVAL_TIMEOUT, memory_limit=EVAL_MEMORY_LIMIT):
+		self.timeout = timeout
+		self.memory_limit = memory_limit
+		self._context = multiprocessing.get_context("spawn")  # Não herda o estado do Tk
+		self._process = None
+		self._conn = None
+		self._started_at = None  # Momento do submit (ou do último avanço de report) da avaliação em andamento
+		self._progress = self._context.RawValue("q", 0)  # Itens concluídos pela tarefa em andamento (report)
+		self._seen = 0  # Último valor do contador visto por poll()
+		self.partial = []  # Resultados enviados à frente pela tarefa em andamento (report)
+		self.start()
+
+	@property
+	def busy(self):
+		return self._started_at is not None
+
+	def start(self):
+		"""Inicia (ou reinicia) o processo auxiliar para que já esteja pronto no próximo cálculo."""
+		self._conn, child_conn = self._context.Pipe()
+		self._process = self._context.Process(target=_serve, args=(child_conn, self.memory_limit, self._progress), daemon=True)
+		self._process.start()
+		child_conn.close()
+
+	def submit(self, expression, values=None, angle=RADIANS, complex_mode=False, digits=None):
+		"""Envia a expressão (e suas variáveis) ao processo auxiliar sem esperar o resultado.
+
+		complex_mode avalia com complexos e matrizes (complex_mode.evaluate_complex);
+		digits, com frações exatas e esse número de algarismos (precision.evaluate_precise).
+		"""
+		self.submit_task(_evaluate, expression, values or {}, angle, complex_mode, digits)
+
+	def submit_task(self, task, *args, **kwargs):
+		"""Envia outra tarefa ao processo auxiliar, com o mesmo tempo e memória limitados.
+
+		task precisa ser uma função de nível de módulo (o pickle a envia pelo nome).
+		"""
+		if self.busy:
+			raise RuntimeError("já existe uma avaliação em andamento")
+		self._progress.value = self._seen = 0
+		self.partial = []
+		self._conn.send((task, args, kwargs))
+		self._started_at = time.monotonic()
+
+	@property
+	def done(self):
+		"""Itens concluídos pela última tarefa, segundo report() (o índice do item em que ela parou)."""
+		return self._progress.value
+
+	def poll(self):
+		"""Retorna o resultado, PENDING se ainda calcula, ou levanta o erro da avaliação."""
+		if not self.busy:
+			raise RuntimeError("nenhuma avaliação em andamento")
+		try:
+			message = self._receive()
+		except (EOFError, OSError):  # Processo morreu (ex.: encerrado pelo sistema por falta de memória)
+			self._restart()
+			raise EvaluationError("o processo de avaliação foi encerrado") from None
+		if message is not None:
+			self._started_at = None
+			ok, value = message
+			if ok:
+				return value
+			raise value
+		if self._progress.value != self._seen:  # A tarefa passou para o próximo item: o tempo limite recomeça
+			self._seen = self._progress.value
+			self._started_at = time.monotonic()
+		if time.monotonic() - self._started_at > self.timeout:
+			self._restart()
+			raise EvaluationTimeout(f"a expressão excedeu {self.timeout:g} s")
+		return PENDING
+
+	def wait(self):
+		"""Bloqueia até o resultado (ou o fim do tempo limite); retorna ou levanta como poll()."""
+		while True:
+			result = self.poll()
+			if result is not PENDING:
+				return result
+			self._conn.poll(min(max(self._started_at + self.timeout - time.monotonic(), 0.001), PROGRESS_CHECK))
+
+	def _receive(self):
+		"""Resultado (ok, valor) da tarefa, se já chegou; os resultados adiantados por report() vão para partial."""
+		while self._conn.poll():
+			ok, value = self._conn.recv()
+			if ok is not None:
+				return ok, value
+			self.partial.extend(value)
+		return None
+
+	def cancel(self):
+		"""Descarta a avaliação em andamento."""
+		if self.busy:
+			self._restart()
+
+	def close(self):
+		"""Encerra o processo auxiliar."""
+		self._started_at = None
+		if self._process is not None:
+			self._conn.close()
+			self._process.terminate()
+			self._process.join()
+			self._process = None
+
+	def _restart(self):
+		self.close()
+		self.start()
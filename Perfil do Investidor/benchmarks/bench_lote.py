@@ -0,0 +1,78 @@
+"""Benchmark: classificação em massa (main.py --lote) em linhas/s por núcleo.
+
+Gera um CSV de respostas válidas, roda o modo lote em um processo separado
+com 1, 2, ... N processos e mede a vazão total e por processo. Roda também um
+arquivo 4x maior para mostrar que a memória máxima não cresce com a entrada.
+Antes, confere que um registro CSV com quebra de linha entre aspas não é
+cortado entre blocos e que respostas JSONL não inteiras saem como ERRO.
+Uso: python "Perfil do Investidor/benchmarks/bench_lote.py" [linhas]
+"""
+
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))  # Permite importar os módulos do teste de perfil
+
+from bench_pontuacao import respostas_aleatorias  # noqa: E402
+from lote import run_lote  # noqa: E402
+
+
+def gerar_csv(caminho, linhas):
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write("id,resposta_1,resposta_2,resposta_3,resposta_4\n")
+        for inicio in range(0, linhas, 100_000):
+            bloco = respostas_aleatorias(min(100_000, linhas - inicio), seed=inicio)
+            arquivo.writelines(f"{inicio + posicao},{a},{b},{c},{d}\n" for posicao, (a, b, c, d) in enumerate(bloco.tolist()))
+
+
+def conferir_entradas():
+    """Registros CSV de várias linhas e respostas JSONL não inteiras, com blocos de uma linha."""
+    entrada = 'id,resposta_1,resposta_2,resposta_3,resposta_4\n"a\n\nb",0,2,1,1\n"c""\nd",1,1,0,0\n'
+    saida = io.StringIO()
+    run_lote(io.StringIO(entrada, newline=""), saida, workers=1, tamanho_bloco=1)
+    registros = [campos[:3] for campos in csv.reader(io.StringIO(saida.getvalue(), newline=""))]
+    assert registros[1:] == [["a\n\nb", "MODERADO", "14"], ['c"\nd', "CONSERVADOR", "8"]], registros
+    saida = io.StringIO()
+    run_lote(io.StringIO('{"id": 1, "respostas": [0, 2, 1.7, 1]}\n{"id": 2, "respostas": [0, 2.0, 1, 1]}\n'), saida, workers=1)
+    perfis = [json.loads(linha)["perfil"] for linha in saida.getvalue().splitlines()]
+    assert perfis == ["ERRO", "MODERADO"], perfis
+
+
+def rodar(caminho, workers):
+    """Tempo de parede e memória máxima (KiB) de uma execução do modo lote."""
+    comando = [sys.executable, str(ROOT / "main.py"), "--lote", caminho, "--workers", str(workers)]
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(comando, stdout=subprocess.DEVNULL)
+    _, status, uso = os.wait4(processo.pid, 0)
+    codigo = os.waitstatus_to_exitcode(status)
+    assert codigo == 0, f"main.py --lote terminou com código {codigo}"
+    return time.perf_counter() - inicio, uso.ru_maxrss
+
+
+def main(linhas=1_000_000):
+    conferir_entradas()
+    cpus = os.cpu_count() or 1
+    print(f"{linhas} linhas, {cpus} CPUs")
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "respostas.csv")
+        gerar_csv(caminho, linhas)
+        for workers in sorted({1, 2, cpus}):
+            tempo, _ = rodar(caminho, workers)
+            print(f"{workers:2d} processo(s): {linhas / tempo:12,.0f} linhas/s, {linhas / tempo / min(workers, cpus):12,.0f} linhas/s por núcleo")
+        _, memoria = rodar(caminho, 1)
+        grande = os.path.join(pasta, "respostas_4x.csv")
+        gerar_csv(grande, linhas * 4)
+        _, memoria_grande = rodar(grande, 1)
+        print(f"memória máxima do processo principal: {memoria / 1024:.0f} MiB ({linhas} linhas), {memoria_grande / 1024:.0f} MiB ({linhas * 4} linhas)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
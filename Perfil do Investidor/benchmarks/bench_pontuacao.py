@@ -0,0 +1,83 @@
+"""Benchmark: regras passo a passo, tabela de decisão e classificação em lote (NumPy).
+
+Gera respostas válidas aleatórias (a segunda pergunta do ramo moderado só tem
+duas opções), confere que os caminhos concordam e mede clientes/s. Confere
+também que alterar os pontos de uma opção muda a classificação sem chamar
+recompilar().
+Uso: python "Perfil do Investidor/benchmarks/bench_pontuacao.py" [clientes]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do teste de perfil
+
+import numpy as np  # noqa: E402
+
+from pontuacao import LIMITES_PROVISORIOS, PERGUNTAS_POR_PERFIL, aplicar_regras, classificar  # noqa: E402
+from pontuacao_vetorizada import PERFIS_NOMES, classificar_lote  # noqa: E402
+from questionario import PERGUNTAS_BASE  # noqa: E402
+
+
+def respostas_aleatorias(clientes, seed=0):
+    """Índices de opções válidos para as perguntas que cada cliente recebe."""
+    rng = np.random.default_rng(seed)
+    respostas = rng.integers(0, 3, size=(clientes, 4), dtype=np.int8)
+    pontos_base = [np.array([pontos for _, pontos in opcoes]) for _, opcoes in PERGUNTAS_BASE]
+    soma = pontos_base[0][respostas[:, 0]] + pontos_base[1][respostas[:, 1]]
+    provisorio = np.searchsorted([LIMITES_PROVISORIOS[nome] for nome in PERFIS_NOMES[:-1]], soma)
+    for codigo, nome in enumerate(PERFIS_NOMES):
+        linhas = provisorio == codigo
+        for posicao, (_, opcoes) in enumerate(PERGUNTAS_POR_PERFIL[nome]):
+            respostas[linhas, 2 + posicao] %= len(opcoes)
+    return respostas
+
+
+def conferir_invalidacao():
+    """Alterar os pontos de uma opção no lugar precisa valer na próxima consulta, sem recompilar()."""
+    respostas = [0, 0, 0, 0]  # 2 + 2 pontos: conservador
+    antes = classificar(respostas)
+    texto, pontos = PERGUNTAS_BASE[0][1][0]
+    PERGUNTAS_BASE[0][1][0] = (texto, pontos + 10)
+    try:
+        depois = classificar(respostas)
+        assert depois == aplicar_regras(respostas) != antes, (antes, depois)
+        assert PERFIS_NOMES[classificar_lote(np.array([respostas])).perfil_provisorio[0]] == depois.perfil_provisorio
+    finally:
+        PERGUNTAS_BASE[0][1][0] = (texto, pontos)
+    assert classificar(respostas) == antes
+
+
+def main(clientes=2_000_000):
+    conferir_invalidacao()
+    respostas = respostas_aleatorias(clientes)
+
+    amostra = [linha.tolist() for linha in respostas[:100_000]]
+    inicio = time.perf_counter()
+    esperado = [aplicar_regras(linha) for linha in amostra]
+    tempo_regras = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    tabela = [classificar(linha) for linha in amostra]
+    tempo_laco = time.perf_counter() - inicio
+    assert tabela == esperado
+
+    inicio = time.perf_counter()
+    lote = classificar_lote(respostas)
+    tempo_lote = time.perf_counter() - inicio
+
+    for posicao, resultado in enumerate(esperado):  # Confere que os dois caminhos concordam
+        assert PERFIS_NOMES[lote.perfil[posicao]] == resultado.perfil, posicao
+        assert PERFIS_NOMES[lote.perfil_provisorio[posicao]] == resultado.perfil_provisorio, posicao
+        assert lote.pontuacao[posicao] == resultado.pontuacao, posicao
+
+    print(f"regras (laço)     : {len(amostra) / tempo_regras:12,.0f} clientes/s ({len(amostra)} clientes)")
+    print(f"tabela (laço)     : {len(amostra) / tempo_laco:12,.0f} clientes/s ({len(amostra)} clientes)")
+    print(f"classificar_lote  : {clientes / tempo_lote:12,.0f} clientes/s ({clientes} clientes, {tempo_lote * 1000:.0f} ms)")
+    print(f"ganho             : {(clientes / tempo_lote) / (len(amostra) / tempo_laco):.0f}x")
+    print("perfis:", {nome: int((lote.perfil == codigo).sum()) for codigo, nome in enumerate(PERFIS_NOMES)})
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
@@ -0,0 +1,77 @@
+"""Teste de resistência: milhares de reinícios pelo botão Refazer Teste, com memória limitada.
+
+Responde o teste inteiro (respostas aleatórias, resultado e carteira), clica
+em Refazer Teste e repete. Depois de cada reinício confere que a sessão voltou
+ao início na mesma janela; no fim, que a memória residente (RSS) e o número de
+widgets não cresceram desde o aquecimento. Termina com erro se algo vazar.
+
+Precisa de um display; em servidores, use o Xvfb:
+    xvfb-run -a python "Perfil do Investidor/benchmarks/bench_reinicio.py" [reinicios]
+"""
+
+import gc
+import random
+import sys
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do teste de perfil
+
+from bench_transicoes import contar_widgets, rss_kib  # noqa: E402
+from main import Etapa, TesteInvestidorApp  # noqa: E402
+from questionario import PERGUNTAS_BASE  # noqa: E402
+
+AQUECIMENTO = 100  # Reinícios antes de medir a memória de referência
+CRESCIMENTO_MAXIMO_KIB = 8 * 1024  # Folga para o alocador; um vazamento por reinício passa disso com folga
+
+
+def responder(root, app, rng):
+    """Responde todas as perguntas e gera a carteira, como um usuário."""
+    while app.etapa is Etapa.QUIZ:
+        _, opcoes = app.questions[app.pergunta_atual]
+        app.resposta_selecionada.set(rng.choice(opcoes)[1])
+        app.habilitar_proximo()
+        app.btn_proximo.invoke()
+        root.update()
+    app.combo_objetivo.current(rng.randrange(len(app.combo_objetivo["values"])))
+    app.gerar_carteira()
+    root.update()
+    assert app.etapa is Etapa.CARTEIRA, app.etapa
+
+
+def main(reinicios=10_000):
+    try:
+        root = tk.Tk()
+    except tk.TclError as erro:
+        sys.exit(f"sem display ({erro}); rode com: xvfb-run -a python {sys.argv[0]}")
+    app = TesteInvestidorApp(root)
+    root.update()
+    rng = random.Random(0)
+    memoria_inicial = widgets_iniciais = None
+    for numero in range(1, reinicios + 1):
+        responder(root, app, rng)
+        app.btn_refazer.invoke()
+        root.update()
+        # A mesma janela, de volta à primeira pergunta e com a sessão zerada
+        assert root.winfo_exists() and app.master is root
+        assert app.etapa is Etapa.QUIZ and app.pergunta_atual == 0 and app.pontuacao_total == 0
+        assert app.questions == list(PERGUNTAS_BASE) and app.pontuacoes_por_pergunta == [0] * len(PERGUNTAS_BASE)
+        if numero == AQUECIMENTO:
+            gc.collect()
+            memoria_inicial, widgets_iniciais = rss_kib(), contar_widgets(root)
+        if numero % 1000 == 0:
+            print(f"{numero:6d} reinícios: {rss_kib() / 1024:.1f} MiB, {contar_widgets(root)} widgets")
+    gc.collect()
+    memoria_final, widgets_finais = rss_kib(), contar_widgets(root)
+    root.destroy()
+    if memoria_inicial is None:
+        print(f"{reinicios} reinícios sem erro (poucos para medir a memória; o aquecimento é de {AQUECIMENTO})")
+        return
+    crescimento = memoria_final - memoria_inicial
+    print(f"memória: {memoria_inicial / 1024:.1f} MiB -> {memoria_final / 1024:.1f} MiB ({crescimento:+d} KiB), widgets: {widgets_iniciais} -> {widgets_finais}")
+    assert widgets_finais == widgets_iniciais, "widgets acumulados entre sessões"
+    assert crescimento <= CRESCIMENTO_MAXIMO_KIB, f"RSS cresceu {crescimento} KiB em {reinicios - AQUECIMENTO} reinícios"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
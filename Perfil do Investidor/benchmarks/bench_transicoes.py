@@ -0,0 +1,133 @@
+"""Benchmark da interface: latência de cada transição de tela e memória ao longo de milhares de respostas.
+
+Simula um usuário respondendo o teste várias vezes seguidas (respostas
+aleatórias, resultado, carteira e novo teste) e mede, por transição, o tempo
+até a tela estar desenhada (proxima_pergunta/gerar_carteira + update). Compara
+a versão atual, que reaproveita os widgets (PoolWidgets), com uma que destrói
+e recria as opções e as telas a cada uso, como antes. Ao fim de cada modo
+mostra a memória residente (RSS) e o número de widgets vivos, que devem ficar
+estáveis depois do aquecimento.
+
+Precisa de um display; em servidores, use o Xvfb:
+    xvfb-run -a python "Perfil do Investidor/benchmarks/bench_transicoes.py" [respostas]
+"""
+
+import gc
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # Permite importar os módulos do teste de perfil
+
+from main import TesteInvestidorApp  # noqa: E402
+from questionario import PERGUNTAS_BASE  # noqa: E402
+
+AQUECIMENTO = 50  # Sessões descartadas antes de medir a memória inicial
+
+
+class TesteRecriando(TesteInvestidorApp):
+    """Comportamento anterior: opções destruídas e recriadas a cada pergunta, telas montadas do zero."""
+
+    def carregar_pergunta(self):
+        if self.pergunta_atual < len(self.questions):
+            for radio in self.pool_opcoes.itens:
+                radio.destroy()
+            self.pool_opcoes.itens, self.pool_opcoes.visiveis = [], 0
+        super().carregar_pergunta()
+
+    def finalizar_teste(self):
+        if self.frame_resultado is not None:
+            self.frame_resultado.destroy()
+            self.frame_resultado = None
+        super().finalizar_teste()
+
+    def mostrar_carteira_recomendada(self):
+        if self.frame_carteira is not None:
+            self.frame_carteira.destroy()
+            self.frame_carteira = None
+        super().mostrar_carteira_recomendada()
+
+
+def rss_kib():
+    """Memória residente atual (ou a máxima, fora do Linux)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def contar_widgets(widget):
+    return 1 + sum(contar_widgets(filho) for filho in widget.winfo_children())
+
+
+def medir(root, transicao, tempos):
+    inicio = time.perf_counter()
+    transicao()
+    root.update()
+    tempos.append(time.perf_counter() - inicio)
+
+
+def sessao(root, app, rng, tempos):
+    """Responde o teste inteiro e gera a carteira; devolve quantas respostas foram dadas."""
+    respostas = 0
+    while app.pergunta_atual < len(app.questions):
+        _, opcoes = app.questions[app.pergunta_atual]
+        app.resposta_selecionada.set(rng.choice(opcoes)[1])
+        app.habilitar_proximo()
+        respostas += 1
+        ultima = app.pergunta_atual == len(app.questions) - 1 and app.pergunta_atual >= len(PERGUNTAS_BASE)
+        medir(root, app.proxima_pergunta, tempos["resultado" if ultima else "pergunta"])
+    app.combo_objetivo.current(rng.randrange(len(app.combo_objetivo["values"])))
+    medir(root, app.gerar_carteira, tempos["carteira"])
+    medir(root, app.reiniciar_app, tempos["novo teste"])
+    return respostas
+
+
+def rodar(classe, rotulo, respostas, seed=0):
+    root = tk.Tk()
+    app = classe(root)
+    root.update()
+    rng = random.Random(seed)
+    tempos = {"pergunta": [], "resultado": [], "carteira": [], "novo teste": []}
+    dadas = sessoes = 0
+    memoria_inicial = widgets_iniciais = None
+    while dadas < respostas:
+        dadas += sessao(root, app, rng, tempos)
+        sessoes += 1
+        if sessoes == AQUECIMENTO:
+            gc.collect()
+            memoria_inicial, widgets_iniciais = rss_kib(), contar_widgets(root)
+    gc.collect()
+    memoria_final, widgets_finais = rss_kib(), contar_widgets(root)
+    root.destroy()
+    print(f"{rotulo}: {dadas} respostas, {sessoes} testes")
+    for nome, amostras in tempos.items():
+        amostras = sorted(amostras)
+        p95 = amostras[int(len(amostras) * 0.95)]
+        print(f"  {nome:<11}: mediana {statistics.median(amostras) * 1e3:7.2f} ms, p95 {p95 * 1e3:7.2f} ms ({len(amostras)} transições)")
+    if memoria_inicial is not None:
+        print(f"  memória    : {memoria_inicial / 1024:.1f} MiB após {AQUECIMENTO} testes -> {memoria_final / 1024:.1f} MiB no fim")
+        print(f"  widgets    : {widgets_iniciais} -> {widgets_finais}")
+    return tempos
+
+
+def main(respostas=5000):
+    try:
+        tk.Tk().destroy()
+    except tk.TclError as erro:
+        sys.exit(f"sem display ({erro}); rode com: xvfb-run -a python {sys.argv[0]}")
+    atual = rodar(TesteInvestidorApp, "reaproveitando widgets", respostas)
+    anterior = rodar(TesteRecriando, "recriando widgets", respostas)
+    for nome in ("pergunta", "resultado", "carteira"):
+        ganho = statistics.median(anterior[nome]) / statistics.median(atual[nome])
+        print(f"ganho ({nome}): {ganho:.1f}x na mediana")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
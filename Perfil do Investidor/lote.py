@@ -0,0 +1,178 @@
+"""Classificação em massa de exportações de respostas (CSV ou JSONL), sem interface.
+
+A entrada é lida em blocos de linhas (no CSV, cortados no fim de um registro:
+um campo entre aspas pode conter quebras de linha); cada bloco é classificado por um
+processo do pool (pontuacao_vetorizada.classificar_lote, ou a tabela de
+decisão se o NumPy não estiver instalado) e devolvido já formatado. No
+máximo 2 blocos por processo ficam em voo e a saída é escrita na ordem da
+entrada: a memória não cresce com o arquivo.
+
+CSV: cabeçalho obrigatório, uma coluna por resposta (COLUNAS_RESPOSTAS, com os
+índices das opções, 0 = primeira) e, se existir, a coluna "id". JSONL: um
+objeto por linha com "respostas": [r1, r2, r3, r4] e, opcionalmente, "id";
+respostas não inteiras (1.7, true) invalidam a linha, em vez de truncadas.
+A saída tem o mesmo formato, com id, perfil, pontuacao e objetivos (as chaves
+de CARTEIRAS do perfil). Linhas inválidas saem com perfil ERRO, mantendo o
+alinhamento com a entrada; linhas em branco são ignoradas.
+"""
+
+import csv
+import io
+import json
+import os
+from collections import deque
+from itertools import islice
+
+from pontuacao import classificar
+from questionario import CARTEIRAS
+
+TAMANHO_BLOCO = 20000  # Linhas enviadas a cada processo por vez
+COLUNAS_RESPOSTAS = ("resposta_1", "resposta_2", "resposta_3", "resposta_4")
+COLUNAS_SAIDA = ("id", "perfil", "pontuacao", "objetivos")
+ERRO = "ERRO"
+
+_OBJETIVOS = {perfil: list(carteiras) for perfil, carteiras in CARTEIRAS.items()}
+
+
+def _ler_csv(linhas, posicoes):
+    """Linhas CSV -> (ids, respostas); respostas é None nas linhas inválidas."""
+    ids, respostas = [], []
+    posicao_id, posicoes_respostas = posicoes
+    for campos in csv.reader(linhas):
+        if not campos or (len(campos) == 1 and not campos[0].strip()):  # Linha em branco
+            continue
+        ids.append(campos[posicao_id] if posicao_id is not None and posicao_id < len(campos) else "")
+        try:
+            respostas.append([int(campos[posicao]) for posicao in posicoes_respostas])
+        except (IndexError, ValueError):
+            respostas.append(None)
+    return ids, respostas
+
+
+def _ler_jsonl(linhas):
+    ids, respostas = [], []
+    for linha in linhas:
+        identificador, indices = "", None
+        try:
+            objeto = json.loads(linha)
+            identificador = objeto.get("id", "")
+            indices = [_indice(resposta) for resposta in objeto["respostas"]]
+        except (ValueError, KeyError, TypeError, AttributeError):  # A linha sai como ERRO, com o id se houver
+            pass
+        ids.append(identificador)
+        respostas.append(indices)
+    return ids, respostas
+
+
+def _indice(resposta):
+    """Índice de opção de uma resposta JSON; int() truncaria 1.7 e aceitaria true."""
+    if isinstance(resposta, bool) or (isinstance(resposta, float) and not resposta.is_integer()):
+        raise ValueError(f"resposta não inteira: {resposta!r}")
+    return int(resposta)
+
+
+def _classificar(respostas):
+    """Lista de (perfil, pontuacao) ou None por linha; usa o NumPy no bloco inteiro quando possível."""
+    validas = [linha for linha in respostas if linha is not None]
+    if len(validas) == len(respostas) and respostas:
+        try:
+            from pontuacao_vetorizada import PERFIS_NOMES, classificar_lote  # NumPy é opcional
+            lote = classificar_lote(respostas)
+            return [(PERFIS_NOMES[perfil], int(pontos)) for perfil, pontos in zip(lote.perfil.tolist(), lote.pontuacao.tolist())]
+        except (ImportError, ValueError):  # Sem NumPy, ou alguma resposta inválida: linha a linha
+            pass
+    resultados = []
+    for linha in respostas:
+        try:
+            classificacao = classificar(linha)
+            resultados.append((classificacao.perfil, classificacao.pontuacao))
+        except (TypeError, ValueError):
+            resultados.append(None)
+    return resultados
+
+
+def classificar_bloco(linhas, formato, posicoes=None):
+    """Classifica um bloco de linhas dentro de um processo do pool; devolve o texto de saída."""
+    if formato == "csv":  # Linhas em branco são descartadas pelo leitor (podem fazer parte de um campo entre aspas)
+        ids, respostas = _ler_csv(linhas, posicoes)
+    else:
+        ids, respostas = _ler_jsonl([linha for linha in linhas if linha.strip()])
+    saida = io.StringIO()
+    if formato == "csv":
+        escritor = csv.writer(saida, lineterminator="\n")
+        for identificador, resultado in zip(ids, _classificar(respostas)):
+            if resultado is None:
+                escritor.writerow((identificador, ERRO, "", ""))
+            else:
+                perfil, pontos = resultado
+                escritor.writerow((identificador, perfil, pontos, "|".join(_OBJETIVOS[perfil])))
+    else:
+        for identificador, resultado in zip(ids, _classificar(respostas)):
+            perfil, pontos = resultado if resultado is not None else (ERRO, None)
+            objetivos = _OBJETIVOS.get(perfil, [])
+            saida.write(json.dumps({"id": identificador, "perfil": perfil, "pontuacao": pontos, "objetivos": objetivos}, ensure_ascii=False) + "\n")
+    return saida.getvalue()
+
+
+def posicoes_csv(cabecalho, colunas=COLUNAS_RESPOSTAS):
+    """Posições da coluna id (ou None) e das colunas de respostas no cabeçalho."""
+    nomes = [nome.strip() for nome in next(csv.reader([cabecalho]))]
+    faltando = [coluna for coluna in colunas if coluna not in nomes]
+    if faltando:
+        raise ValueError(f"colunas ausentes no cabeçalho: {', '.join(faltando)}")
+    return (nomes.index("id") if "id" in nomes else None), tuple(nomes.index(coluna) for coluna in colunas)
+
+
+def detectar_formato(nome_arquivo, primeira_linha):
+    if nome_arquivo.endswith((".jsonl", ".ndjson")) or primeira_linha.lstrip().startswith("{"):
+        return "jsonl"
+    return "csv"
+
+
+def run_lote(linhas, saida, formato=None, workers=None, tamanho_bloco=TAMANHO_BLOCO, nome_arquivo="", colunas=COLUNAS_RESPOSTAS):
+    """Classifica um fluxo de linhas (CSV ou JSONL), preservando a ordem; devolve o número de linhas lidas."""
+    from concurrent.futures import ProcessPoolExecutor  # Importado só aqui, como no modo batch da calculadora
+    linhas = iter(linhas)
+    primeira = next(linhas, "")
+    if not primeira:  # Entrada vazia
+        return 0
+    formato = formato or detectar_formato(nome_arquivo, primeira)
+    posicoes = None
+    if formato == "csv":  # A primeira linha é o cabeçalho
+        posicoes = posicoes_csv(primeira, colunas)
+        csv.writer(saida, lineterminator="\n").writerow(COLUNAS_SAIDA)
+    else:
+        linhas = _encadear(primeira, linhas)
+    workers = workers or os.cpu_count() or 1
+    max_pendentes = workers * 2  # Limita os blocos em voo: memória constante mesmo com entradas enormes
+    total = 0
+    blocos = _blocos_csv(linhas, tamanho_bloco) if formato == "csv" else iter(lambda: list(islice(linhas, tamanho_bloco)), [])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pendentes = deque()
+        for bloco in blocos:
+            total += len(bloco)
+            pendentes.append(pool.submit(classificar_bloco, bloco, formato, posicoes))
+            if len(pendentes) >= max_pendentes:  # Escreve o bloco mais antigo antes de ler mais
+                saida.write(pendentes.popleft().result())
+        while pendentes:
+            saida.write(pendentes.popleft().result())
+    saida.flush()
+    return total
+
+
+def _blocos_csv(linhas, tamanho_bloco):
+    """Blocos de linhas CSV que terminam no fim de um registro (número par de aspas no bloco)."""
+    for bloco in iter(lambda: list(islice(linhas, tamanho_bloco)), []):
+        aspas = "".join(bloco).count('"')
+        while aspas % 2:  # Campo entre aspas ainda aberto: a linha seguinte é do mesmo registro
+            linha = next(linhas, None)
+            if linha is None:  # Aspas sem fechamento no fim da entrada: o leitor do bloco decide
+                break
+            bloco.append(linha)
+            aspas += linha.count('"')
+        yield bloco
+
+
+def _encadear(primeira, linhas):
+    yield primeira
+    yield from linhas
@@ -2,221 +2,80 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import re
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
-
-# --- Configuração das Perguntas e Pontuações ---
-# Estrutura: [Pergunta, [[Resposta A, Pontos], [Resposta B, Pontos], ...]]
-PERGUNTAS_BASE = [
-    [
-        "Qual é o seu nível de conhecimento e experiência em investimentos?",
-        [
-            ("Iniciante, com pouco ou nenhum conhecimento.", 1),
-            ("Intermediário, com algum conhecimento e experiência.", 3),
-            ("Avançado, com conhecimento profundo e experiência substancial.", 5)
-        ]
-    ],
-    [
-        "Como você reagiria a uma queda repentina no valor dos seus investimentos?",
-        [
-            ("Ficaria preocupado e consideraria vender para evitar maiores perdas.", 1),
-            ("Monitoraria a situação, mas manteria meus investimenos a longo prazo.", 3),
-            ("Aproveitaria a oportunidade para comprar mais, acreditando em uma recuperação futura", 5)
-        ]
-    ]
-]
-
-# Perguntas adicionais para cada perfil provisório (após as duas primeiras)
-PERGUNTAS_CONSERVADOR = [
-    [
-        "Como os valores investidos vão te ajudar no seu momento de vida?",
-        [
-            ("Preservação de patrimônio.", 1),
-            ("Combinação entre preservar e valorizar patrimônio, com certo risco.", 3),
-            ("Aumentar patrimônio, assumindo risco", 5)
-        ]
-    ],
-    [
-        "Onde está seu maior volume de investimento?",
-        [
-            ("Conta corrente com investimentos automáticos e Poupança", 1),
-            ("Tesouro Direto", 3),
-            ("Diversificado, com foco em renda fixa", 5)
-        ]
-    ]
-]
-
-PERGUNTAS_MODERADO = [
-    [
-        "Onde está seu maior volume de investimento?",
-        [
-            ("FIIs", 1),
-            ("Diversificado", 3),
-            ("Ações", 5)
-        ]
-    ],
-    [
-        "A quanto tempo você investe no mercado de ações?",
-        [
-            ("Menos de 1 ano", 1),
-            ("Mais de 1 ano", 5)
-        ]
-    ]
-]
-
-# Para perfil agressivo, manter um conjunto com as perguntas originais/mais aprofundadas
-PERGUNTAS_AGRESSIVO = [
-    [
-        "Como os valores investidos vão te ajudar no seu momento de vida?",
-        [
-            ("Preservação de patrimônio.", 1),
-            ("Combinação entre preservar e valorizar patrimônio, com certo risco.", 3),
-            ("Aumentar patrimônio, assumindo risco", 5)
-        ]
-    ],
-    [
-        "O que você busca dentro dos seus investimentos?",
-        [
-            ("Oportunidade de mercado com ganhos imediatos", 1),
-            ("Razoável. Conheço CDBs, LCIs, Fundos de Investimento.", 3),
-            ("Avançado. Já investi em Ações, Fundos Imobiliários e Derivativos.", 5)
-        ]
-    ]
-]
-
-# Definição dos perfis baseada na pontuação total
-# Máximo de pontos: 4 perguntas * 5 pontos = 20
-# Mínimo de pontos: 4 perguntas * 1 ponto = 4
-PERFIS = {
-    "CONSERVADOR": {"max_score": 10, "descricao": "Busca segurança e previsibilidade, preferindo produtos de baixo risco."},
-    "MODERADO": {"max_score": 15, "descricao": "Tolera um risco moderado em busca de retornos um pouco maiores."},
-    "AGRESSIVO": {"max_score": 20, "descricao": "Busca altos retornos, aceitando alta volatilidade e risco em Renda Variável."}
-}
+from enum import Enum
 
-# --- Definição de Carteiras por Perfil e Objetivo ---
-@dataclass
-class Ativo:
-    nome: str
-    classe: str
-    percentual: int
-    rentabilidade_estimada: str
-    risco: str
-    
-CARTEIRAS = {
-    "CONSERVADOR": {
-        "objetivo_renda_mensal": {
-            "descricao": "Carteira focada em renda mensal com baixo risco",
-            "estrategia": "Maximizar fluxo de caixa mensal com segurança",
-            "ativos": [
-                Ativo("Tesouro IPCA+ 2035", "Renda Fixa", 25, "IPCA + 4-5% a.a.", "Muito Baixo"),
-                Ativo("CDB Liquidez Diária (Banco Top 5)", "Renda Fixa", 20, "105-110% CDI", "Muito Baixo"),
-                Ativo("LCI/LCA Operacional", "Renda Fixa", 20, "80-95% CDI", "Muito Baixo"),
-                Ativo("Fundo Imobiliário com Distribuição", "Renda Variável", 20, "4-8% a.a.", "Médio"),
-                Ativo("FIC Renda Fixa Curta Duração", "Renda Fixa", 15, "95-105% CDI", "Muito Baixo"),
-            ],
-            "aporte_mensal": "R$ 500 - R$ 2.000",
-            "tempo_para_renda": "3-6 meses"
-        },
-        "objetivo_seguranca": {
-            "descricao": "Carteira 100% Renda Fixa - Máxima Segurança",
-            "estrategia": "Preservar capital com retorno previsível",
-            "ativos": [
-                Ativo("Tesouro Selic", "Renda Fixa", 30, "Selic - 0.5% a.a.", "Nenhum"),
-                Ativo("CDB Liquidez Diária", "Renda Fixa", 35, "105-115% CDI", "Muito Baixo"),
-                Ativo("LCI/LCA com Garantia FGC", "Renda Fixa", 25, "85-100% CDI", "Muito Baixo"),
-                Ativo("Poupança (Manutenção)", "Renda Fixa", 10, "SELIC/2 + extra", "Nenhum"),
-            ],
-            "aporte_mensal": "R$ 1.000 - R$ 5.000",
-            "tempo_para_renda": "Imediato"
-        }
-    },
-    "MODERADO": {
-        "objetivo_renda_mensal": {
-            "descricao": "Carteira balanceada para renda com crescimento moderado",
-            "estrategia": "Combinar renda fixa com fundos imobiliários e ações selecionadas",
-            "ativos": [
-                Ativo("Tesouro IPCA+ 2035", "Renda Fixa", 20, "IPCA + 4-5% a.a.", "Baixo"),
-                Ativo("CDB Progressivo", "Renda Fixa", 15, "110-120% CDI", "Muito Baixo"),
-                Ativo("Fundo Imobiliário Diversificado", "Renda Variável", 25, "5-10% a.a.", "Médio"),
-                Ativo("Ações Dividend Yield (Top 50)", "Renda Variável", 25, "8-12% a.a.", "Médio"),
-                Ativo("Fundo de Renda Fixa Balanceado", "Renda Fixa", 15, "100-110% CDI", "Baixo"),
-            ],
-            "aporte_mensal": "R$ 1.000 - R$ 3.000",
-            "tempo_para_renda": "2-4 meses"
-        },
-        "objetivo_crescimento": {
-            "descricao": "Carteira balanceada para crescimento patrimonial",
-            "estrategia": "60/40 Renda Fixa vs Renda Variável",
-            "ativos": [
-                Ativo("Tesouro IPCA+ 2035-2045", "Renda Fixa", 25, "IPCA + 4-5% a.a.", "Baixo"),
-                Ativo("CDB com Indexação", "Renda Fixa", 20, "115% CDI", "Muito Baixo"),
-                Ativo("ETF IBOVESPA (BOVA11)", "Renda Variável", 35, "8-15% a.a.", "Médio-Alto"),
-                Ativo("Ações com Dividendos", "Renda Variável", 15, "12-18% a.a.", "Médio-Alto"),
-                Ativo("Fundo Imobiliário", "Renda Variável", 5, "6-10% a.a.", "Médio"),
-            ],
-            "aporte_mensal": "R$ 2.000 - R$ 5.000",
-            "tempo_para_renda": "Longo prazo (5+ anos)"
-        }
-    },
-    "AGRESSIVO": {
-        "objetivo_crescimento_maximo": {
-            "descricao": "Carteira agressiva focada em crescimento máximo",
-            "estrategia": "70-80% Renda Variável com ênfase em crescimento",
-            "ativos": [
-                Ativo("ETF IBOVESPA (BOVA11)", "Renda Variável", 30, "10-18% a.a.", "Alto"),
-                Ativo("Ações de Crescimento", "Renda Variável", 25, "15-30% a.a.", "Muito Alto"),
-                Ativo("ETF Small Caps", "Renda Variável", 15, "15-25% a.a.", "Muito Alto"),
-                Ativo("Tesouro IPCA+ Longo Prazo", "Renda Fixa", 20, "IPCA + 5-6% a.a.", "Baixo"),
-                Ativo("Fundo de Ações Multiestrátégia", "Renda Variável", 10, "20-35% a.a.", "Muito Alto"),
-            ],
-            "aporte_mensal": "R$ 2.000 - R$ 10.000",
-            "tempo_para_renda": "Muito Longo Prazo (7-10 anos)"
-        },
-        "objetivo_especulacao": {
-            "descricao": "Carteira ultra-agressiva para perfis muito ousados",
-            "estrategia": "Foco em crescimento máximo com derivativos",
-            "ativos": [
-                Ativo("Ações de Crescimento Agressivo", "Renda Variável", 40, "20-50% a.a.", "Muito Alto"),
-                Ativo("ETF Small Caps", "Renda Variável", 25, "18-35% a.a.", "Muito Alto"),
-                Ativo("Opções e Mini Índices", "Derivativos", 20, "30-100%+ a.a.", "Crítico"),
-                Ativo("Fundo de Investimento em Ações", "Renda Variável", 10, "15-25% a.a.", "Muito Alto"),
-                Ativo("Reserva em CDB", "Renda Fixa", 5, "105% CDI", "Muito Baixo"),
-            ],
-            "aporte_mensal": "R$ 3.000 - R$ 15.000",
-            "tempo_para_renda": "Médio Prazo com alto risco"
-        }
-    }
+from questionario import PERGUNTAS_BASE, PERFIS, CARTEIRAS, RECOMENDACOES_IDADE  # Dados do questionário (também usados sem interface)
+from pontuacao import perfil_final, perfil_provisorio, perguntas_adicionais  # Regras de pontuação
+
+# Perfil -> texto exibido na tela de resultado
+TITULOS_PERFIL = {
+    "CONSERVADOR": "CONSERVADOR 🐢",
+    "MODERADO": "MODERADO ⚖️",
+    "AGRESSIVO": "AGRESSIVO (OU ARROJADO) 🚀",
 }
 
-# Recomendações por faixa etária
-RECOMENDACOES_IDADE = {
-    "20-30": {
-        "titulo": "20-30 anos - Tempo é seu maior ativo",
-        "recomendacao": "Invista agressivamente em ações e crescimento. O tempo permite recuperação de crises.",
-        "perfil_sugerido": "AGRESSIVO"
-    },
-    "31-40": {
-        "titulo": "31-40 anos - Equilíbrio entre Risco e Segurança",
-        "recomendacao": "Considere perfil MODERADO a AGRESSIVO. Comece a construir base de renda fixa.",
-        "perfil_sugerido": "MODERADO"
-    },
-    "41-50": {
-        "titulo": "41-50 anos - Foco em Renda e Preservação",
-        "recomendacao": "Perfil MODERADO é ideal. Aumente ponderação em renda fixa e fundos imobiliários.",
-        "perfil_sugerido": "MODERADO"
-    },
-    "51-60": {
-        "titulo": "51-60 anos - Segurança com Rentabilidade",
-        "recomendacao": "Perfil CONSERVADOR com até 30% em Renda Variável. Foco em renda mensal.",
-        "perfil_sugerido": "CONSERVADOR"
-    },
-    "60+": {
-        "titulo": "60+ anos - Preservação e Renda",
-        "recomendacao": "Perfil CONSERVADOR. 90-100% em Renda Fixa. Gere fluxo de caixa mensal.",
-        "perfil_sugerido": "CONSERVADOR"
-    }
+class Etapa(Enum):
+    """Telas de uma sessão do teste, na ordem em que o usuário passa por elas."""
+    QUIZ = "quiz"
+    RESULTADO = "resultado"
+    CARTEIRA = "carteira"
+
+# Transições permitidas entre as etapas: a sessão só volta ao quiz pelo botão Refazer Teste
+TRANSICOES = {
+    Etapa.QUIZ: {Etapa.RESULTADO},
+    Etapa.RESULTADO: {Etapa.CARTEIRA},
+    Etapa.CARTEIRA: {Etapa.QUIZ},
 }
 
+class PoolWidgets:
+    """Widgets criados uma vez e reaproveitados: a cada tela só muda o que é exibido.
+
+    criar() devolve um item novo (um widget, ou qualquer objeto com pack e
+    pack_forget); empacotar(item) o coloca na tela. Os itens visíveis são sempre
+    os primeiros da lista, então a ordem na tela se mantém ao mostrar mais ou
+    esconder os excedentes.
+    """
+
+    def __init__(self, criar, empacotar):
+        self._criar = criar
+        self._empacotar = empacotar
+        self.itens = []
+        self.visiveis = 0
+
+    def exibir(self, quantidade):
+        """Deixa exatamente `quantidade` itens na tela e devolve esses itens."""
+        while len(self.itens) < quantidade:
+            self.itens.append(self._criar())
+        for item in self.itens[self.visiveis:quantidade]:
+            self._empacotar(item)
+        for item in self.itens[quantidade:self.visiveis]:
+            item.pack_forget()
+        self.visiveis = quantidade
+        return self.itens[:quantidade]
+
+class LinhaAtivo:
+    """Linha de um ativo na tela da carteira (nome, classe/alocação, rentabilidade/risco)."""
+
+    def __init__(self, master):
+        self.frame = ttk.Frame(master)
+        self.nome = ttk.Label(self.frame, font=('Arial', 11, 'bold'), foreground='lightblue')
+        self.nome.pack(anchor='w')
+        self.alocacao = ttk.Label(self.frame, font=('Arial', 9))
+        self.alocacao.pack(anchor='w', padx=15)
+        self.risco = ttk.Label(self.frame, font=('Arial', 9), foreground='lightyellow')
+        self.risco.pack(anchor='w', padx=15)
+
+    def exibir(self, ativo):
+        self.nome.config(text=f"• {ativo.nome}")
+        self.alocacao.config(text=f"  Classe: {ativo.classe} | Alocação: {ativo.percentual}%")
+        self.risco.config(text=f"  Rentabilidade Est.: {ativo.rentabilidade_estimada} | Risco: {ativo.risco}")
+
+    def pack(self, **opcoes):
+        self.frame.pack(**opcoes)
+
+    def pack_forget(self):
+        self.frame.pack_forget()
+
 class TesteInvestidorApp:
     def __init__(self, master):
         self.master = master
@@ -237,13 +96,8 @@ class TesteInvestidorApp:
         self.style.configure('TRadiobutton', background='#00145f', foreground='white')
         
         # Variáveis de Estado
-        self.pontuacao_total = 0
-        self.pergunta_atual = 0
-        self.idade_usuario = 0
-        self.objetivo_usuario = ""
-        # Lista de perguntas que será montada dinamicamente: começar com as duas bases
-        self.questions = list(PERGUNTAS_BASE)
-        self.pontuacoes_por_pergunta = [0] * len(self.questions) # Lista para armazenar a pontuação de cada questão
+        self.etapa = Etapa.QUIZ
+        self._iniciar_sessao()
         
         # --- Configuração dos Frames ---
         self.frame_quiz = ttk.Frame(master, padding="10")
@@ -267,6 +121,11 @@ class TesteInvestidorApp:
         
         # Variável de controle para os RadioButtons
         self.resposta_selecionada = tk.IntVar() 
+        # RadioButtons reaproveitados entre as perguntas (só texto e valor mudam)
+        self.pool_opcoes = PoolWidgets(self._criar_opcao, lambda radio: radio.pack(anchor='w', pady=5, padx=10))
+        # Telas de resultado e da carteira: montadas na primeira vez e reconfiguradas depois
+        self.frame_resultado = None
+        self.frame_carteira = None
         
         # 4. Botão de Próxima Pergunta
         self.btn_proximo = ttk.Button(self.frame_quiz, text="Próxima Pergunta >", command=self.proxima_pergunta, state='disabled')
@@ -289,6 +148,9 @@ class TesteInvestidorApp:
             length=120,
             maximum=len(self.questions) # O máximo é o número total de perguntas (dinâmico)
         )
+        self._posicionar_barra()
+
+    def _posicionar_barra(self):
         # Posicionamento no canto inferior direito com place()
         self.pbar.place(
             relx=1.0,
@@ -297,6 +159,32 @@ class TesteInvestidorApp:
             x=-10,
             y=-10
         )
+
+    def _iniciar_sessao(self):
+        """Zera as respostas e volta à primeira pergunta (não mexe nos widgets)."""
+        self.pontuacao_total = 0
+        self.pergunta_atual = 0
+        self.idade_usuario = 0
+        self.objetivo_usuario = ""
+        # Lista de perguntas que será montada dinamicamente: começar com as duas bases
+        self.questions = list(PERGUNTAS_BASE)
+        self.pontuacoes_por_pergunta = [0] * len(self.questions) # Lista para armazenar a pontuação de cada questão
+
+    def _frame_da_etapa(self, etapa):
+        return {Etapa.QUIZ: self.frame_quiz, Etapa.RESULTADO: self.frame_resultado, Etapa.CARTEIRA: self.frame_carteira}[etapa]
+
+    def _ir_para(self, etapa):
+        """Troca a tela visível na mesma janela, seguindo TRANSICOES."""
+        if etapa not in TRANSICOES[self.etapa]:
+            raise RuntimeError(f"transição inválida: {self.etapa.value} -> {etapa.value}")
+        self._frame_da_etapa(self.etapa).pack_forget()
+        self.etapa = etapa
+        self._frame_da_etapa(etapa).pack(fill='both', expand=True)
+        # A barra de progresso só aparece durante o quiz
+        if etapa is Etapa.QUIZ:
+            self._posicionar_barra()
+        else:
+            self.pbar.place_forget()
         
     def carregar_pergunta(self):
         """Carrega a pergunta atual e suas opções na tela."""
@@ -309,42 +197,41 @@ class TesteInvestidorApp:
             question_text = re.sub(r'^\s*\d+\.\s*', '', pergunta_info[0])
             self.label_pergunta.config(text=question_text)
             
-            # Limpa opções antigas
-            for widget in self.frame_opcoes.winfo_children():
-                widget.destroy()
-            
             self.resposta_selecionada.set(-1) # Reseta a seleção
             self.btn_proximo.config(state='disabled') # Desabilita o botão até selecionar algo
             
-            # Cria os RadioButtons para cada opção
-            for idx, (texto_resposta, pontos) in enumerate(pergunta_info[1]):
-                # Usar tk.Radiobutton para suportar a propriedade `font` e cores personalizadas
-                radio = tk.Radiobutton(
-                    self.frame_opcoes,
-                    text=texto_resposta,
-                    value=pontos,  # O valor do RadioButton é a pontuação da resposta
-                    variable=self.resposta_selecionada,
-                    command=self.habilitar_proximo,
-                    font=('Arial', 14),
-                    bg='#00145f',
-                    fg='white',
-                    activebackground='#00145f',
-                    activeforeground='white',
-                    selectcolor='black',
-                    indicatoron=1,
-                    bd=0,
-                    highlightthickness=2,
-                    highlightcolor='white',
-                    highlightbackground='white',
-                    anchor='w',
-                    justify='left',
-                )
+            # Reaproveita os RadioButtons da pergunta anterior: cria só os que faltarem
+            # e esconde os que sobrarem, em vez de destruir e recriar todos
+            radios = self.pool_opcoes.exibir(len(pergunta_info[1]))
+            for radio, (texto_resposta, pontos) in zip(radios, pergunta_info[1]):
                 # O RadioButton recebe como valor a pontuação da resposta.
                 # Quando selecionado, ele atribui essa pontuação à variável self.resposta_selecionada
-                radio.pack(anchor='w', pady=5, padx=10)
+                radio.config(text=texto_resposta, value=pontos)
         else:
             self.finalizar_teste()
 
+    def _criar_opcao(self):
+        """Cria um RadioButton de resposta (texto e valor são definidos em carregar_pergunta)."""
+        # Usar tk.Radiobutton para suportar a propriedade `font` e cores personalizadas
+        return tk.Radiobutton(
+            self.frame_opcoes,
+            variable=self.resposta_selecionada,
+            command=self.habilitar_proximo,
+            font=('Arial', 14),
+            bg='#00145f',
+            fg='white',
+            activebackground='#00145f',
+            activeforeground='white',
+            selectcolor='black',
+            indicatoron=1,
+            bd=0,
+            highlightthickness=2,
+            highlightcolor='white',
+            highlightbackground='white',
+            anchor='w',
+            justify='left',
+        )
+
     def habilitar_proximo(self):
         """Habilita o botão 'Próxima Pergunta' ao selecionar uma opção."""
         if self.resposta_selecionada.get() != -1:
@@ -362,16 +249,9 @@ class TesteInvestidorApp:
             # definimos um perfil provisório e extendemos o conjunto de perguntas de acordo.
             if self.pergunta_atual == 2:
                 soma_duas_primeiras = sum(self.pontuacoes_por_pergunta[:2])
-                # Thresholds: 2/4 -> conservador, 6/8 -> moderado, 10 -> agressivo
-                if soma_duas_primeiras <= 4:
-                    perfil_prov = 'CONSERVADOR'
-                    adicionais = PERGUNTAS_CONSERVADOR
-                elif soma_duas_primeiras <= 8:
-                    perfil_prov = 'MODERADO'
-                    adicionais = PERGUNTAS_MODERADO
-                else:
-                    perfil_prov = 'AGRESSIVO'
-                    adicionais = PERGUNTAS_AGRESSIVO
+                # Thresholds (pontuacao.LIMITES_PROVISORIOS): 2/4 -> conservador, 6/8 -> moderado, 10 -> agressivo
+                perfil_prov = perfil_provisorio(soma_duas_primeiras)
+                adicionais = perguntas_adicionais(perfil_prov)
 
                 # Anexa perguntas adicionais e atualiza estruturas de apoio
                 self.questions.extend(adicionais)
@@ -392,77 +272,72 @@ class TesteInvestidorApp:
 
     def finalizar_teste(self):
         """Calcula o perfil final e exibe o resultado."""
-        self.frame_quiz.pack_forget() # Esconde o quiz
-        
-        # 1. Determina o Perfil
-        perfil_final = ""
-        descricao_perfil = ""
-        
-        if self.pontuacao_total <= PERFIS["CONSERVADOR"]["max_score"]:
-            perfil_final = "CONSERVADOR 🐢"
-            descricao_perfil = PERFIS["CONSERVADOR"]["descricao"]
-            self.perfil_detectado = "CONSERVADOR"
-        elif self.pontuacao_total <= PERFIS["MODERADO"]["max_score"]:
-            perfil_final = "MODERADO ⚖️"
-            descricao_perfil = PERFIS["MODERADO"]["descricao"]
-            self.perfil_detectado = "MODERADO"
-        else:
-            perfil_final = "AGRESSIVO (OU ARROJADO) 🚀"
-            descricao_perfil = PERFIS["AGRESSIVO"]["descricao"]
-            self.perfil_detectado = "AGRESSIVO"
+        # 1. Determina o Perfil (limites max_score de PERFIS, ver pontuacao.perfil_final)
+        self.perfil_detectado = perfil_final(self.pontuacao_total)
+        titulo_perfil = TITULOS_PERFIL[self.perfil_detectado]
+        descricao_perfil = PERFIS[self.perfil_detectado]["descricao"]
             
-        # 2. Exibe o Resultado em uma nova tela/Frame
-        frame_resultado = ttk.Frame(self.master, padding="20")
-        frame_resultado.pack(fill='both', expand=True)
+        # 2. Exibe o Resultado (a tela é montada uma vez e só os textos mudam)
+        if self.frame_resultado is None:
+            self._montar_resultado()
+        self.label_pontuacao.config(text=f"Sua Pontuação Total: {self.pontuacao_total} pontos")
+        self.label_titulo_perfil.config(text=titulo_perfil)
+        self.label_descricao_perfil.config(text=descricao_perfil)
+        
+        # 3. Agora pergunta Idade e Objetivo
+        self.spinbox_idade.set(40)
+        objetivos_opcoes = self._get_objetivos_para_perfil(self.perfil_detectado)
+        self.combo_objetivo.config(values=objetivos_opcoes)
+        if objetivos_opcoes:
+            self.combo_objetivo.current(0)
+        self._ir_para(Etapa.RESULTADO) # Esconde o quiz e a barra de progresso
+
+    def _montar_resultado(self):
+        """Cria a tela de resultado; finalizar_teste preenche pontuação, perfil e objetivos."""
+        self.frame_resultado = ttk.Frame(self.master, padding="20")
 
-        ttk.Label(frame_resultado, text="✅ TESTE CONCLUÍDO ✅", font=('Arial', 16, 'bold')).pack(pady=10)
-        ttk.Separator(frame_resultado, orient='horizontal').pack(fill='x', pady=5)
+        ttk.Label(self.frame_resultado, text="✅ TESTE CONCLUÍDO ✅", font=('Arial', 16, 'bold')).pack(pady=10)
+        ttk.Separator(self.frame_resultado, orient='horizontal').pack(fill='x', pady=5)
         
-        ttk.Label(frame_resultado, text=f"Sua Pontuação Total: {self.pontuacao_total} pontos", font=('Arial', 12)).pack(pady=5)
+        self.label_pontuacao = ttk.Label(self.frame_resultado, font=('Arial', 12))
+        self.label_pontuacao.pack(pady=5)
         
-        ttk.Label(frame_resultado, text="SEU PERFIL DE INVESTIDOR É:", font=('Arial', 18, 'bold'), foreground='darkgreen').pack(pady=15)
-        ttk.Label(frame_resultado, text=perfil_final, font=('Arial', 24, 'bold'), foreground='red').pack(pady=5)
+        ttk.Label(self.frame_resultado, text="SEU PERFIL DE INVESTIDOR É:", font=('Arial', 18, 'bold'), foreground='darkgreen').pack(pady=15)
+        self.label_titulo_perfil = ttk.Label(self.frame_resultado, font=('Arial', 24, 'bold'), foreground='red')
+        self.label_titulo_perfil.pack(pady=5)
         
-        ttk.Label(frame_resultado, text=descricao_perfil, wraplength=550, justify='center').pack(pady=20)
+        self.label_descricao_perfil = ttk.Label(self.frame_resultado, wraplength=550, justify='center')
+        self.label_descricao_perfil.pack(pady=20)
         
-        # 3. Agora pergunta Idade e Objetivo
-        ttk.Separator(frame_resultado, orient='horizontal').pack(fill='x', pady=10)
+        ttk.Separator(self.frame_resultado, orient='horizontal').pack(fill='x', pady=10)
         
-        ttk.Label(frame_resultado, text="Para personalizar a recomendação, informe:", font=('Arial', 12, 'bold')).pack(pady=10)
+        ttk.Label(self.frame_resultado, text="Para personalizar a recomendação, informe:", font=('Arial', 12, 'bold')).pack(pady=10)
         
         # Frame para Idade
-        frame_idade = ttk.Frame(frame_resultado)
+        frame_idade = ttk.Frame(self.frame_resultado)
         frame_idade.pack(pady=5)
         ttk.Label(frame_idade, text="Sua Idade:", font=('Arial', 11)).pack(side='left', padx=5)
-        spinbox_idade = ttk.Spinbox(frame_idade, from_=18, to=100, width=5, font=('Arial', 11))
-        spinbox_idade.set(40)
-        spinbox_idade.pack(side='left', padx=5)
+        self.spinbox_idade = ttk.Spinbox(frame_idade, from_=18, to=100, width=5, font=('Arial', 11))
+        self.spinbox_idade.pack(side='left', padx=5)
         
         # Frame para Objetivo
-        frame_objetivo = ttk.Frame(frame_resultado)
+        frame_objetivo = ttk.Frame(self.frame_resultado)
         frame_objetivo.pack(pady=5)
         ttk.Label(frame_objetivo, text="Seu Objetivo:", font=('Arial', 11)).pack(side='left', padx=5)
-        
-        objetivos_opcoes = self._get_objetivos_para_perfil(self.perfil_detectado)
-        combo_objetivo = ttk.Combobox(frame_objetivo, values=objetivos_opcoes, state='readonly', width=30, font=('Arial', 11))
-        if objetivos_opcoes:
-            combo_objetivo.current(0)
-        combo_objetivo.pack(side='left', padx=5)
+        self.combo_objetivo = ttk.Combobox(frame_objetivo, state='readonly', width=30, font=('Arial', 11))
+        self.combo_objetivo.pack(side='left', padx=5)
         
         # Botão para Gerar Carteira
-        def gerar_carteira():
-            idade = int(spinbox_idade.get())
-            objetivo_key = list(CARTEIRAS[self.perfil_detectado].keys())[combo_objetivo.current()]
-            self.idade_usuario = idade
-            self.objetivo_usuario = objetivo_key
-            
-            frame_resultado.pack_forget()
-            self.pbar.destroy()
-            self.mostrar_carteira_recomendada()
-        
-        ttk.Button(frame_resultado, text="Gerar Carteira Recomendada", command=gerar_carteira).pack(pady=15)
-        
-        self.pbar.destroy() # Remove a barra de progresso
+        ttk.Button(self.frame_resultado, text="Gerar Carteira Recomendada", command=self.gerar_carteira).pack(pady=15)
+
+    def gerar_carteira(self):
+        """Lê idade e objetivo da tela de resultado e exibe a carteira."""
+        idade = int(self.spinbox_idade.get())
+        objetivo_key = list(CARTEIRAS[self.perfil_detectado].keys())[self.combo_objetivo.current()]
+        self.idade_usuario = idade
+        self.objetivo_usuario = objetivo_key
+        
+        self.mostrar_carteira_recomendada()
     
     def _get_objetivos_para_perfil(self, perfil):
         """Retorna lista de objetivos disponíveis para um perfil"""
@@ -472,34 +347,76 @@ class TesteInvestidorApp:
     
     def mostrar_carteira_recomendada(self):
         """Exibe a carteira recomendada com base no perfil, idade e objetivo"""
-        frame_carteira = ttk.Frame(self.master, padding="20")
-        frame_carteira.pack(fill='both', expand=True)
-        
-        # Título
-        ttk.Label(frame_carteira, text="📊 SUA CARTEIRA RECOMENDADA 📊", font=('Arial', 18, 'bold')).pack(pady=10)
-        ttk.Separator(frame_carteira, orient='horizontal').pack(fill='x', pady=5)
+        if self.frame_carteira is None:
+            self._montar_carteira()
         
         # Informações do Usuário
         info_text = f"Perfil: {self.perfil_detectado} | Idade: {self.idade_usuario} anos | Objetivo: {self.objetivo_usuario.replace('_', ' ').title()}"
-        ttk.Label(frame_carteira, text=info_text, font=('Arial', 11), foreground='cyan').pack(pady=5)
+        self.label_info.config(text=info_text)
         
         # Recomendação por Idade
         faixa_idade = self._get_faixa_idade(self.idade_usuario)
         recomendacao_idade = RECOMENDACOES_IDADE.get(faixa_idade, {})
         
-        ttk.Label(frame_carteira, text=recomendacao_idade.get("titulo", ""), font=('Arial', 12, 'bold'), foreground='yellow').pack(pady=8)
-        ttk.Label(frame_carteira, text=recomendacao_idade.get("recomendacao", ""), wraplength=650, justify='left', font=('Arial', 10)).pack(pady=5)
-        
-        ttk.Separator(frame_carteira, orient='horizontal').pack(fill='x', pady=10)
+        self.label_titulo_idade.config(text=recomendacao_idade.get("titulo", ""))
+        self.label_recomendacao_idade.config(text=recomendacao_idade.get("recomendacao", ""))
         
         # Carteira de Ativos
         carteira_data = CARTEIRAS[self.perfil_detectado][self.objetivo_usuario]
         
-        ttk.Label(frame_carteira, text=f"Estratégia: {carteira_data['estrategia']}", font=('Arial', 11, 'bold'), foreground='lightgreen').pack(pady=5)
-        ttk.Label(frame_carteira, text=f"Descrição: {carteira_data['descricao']}", wraplength=650, justify='left', font=('Arial', 10)).pack(pady=5)
+        self.label_estrategia.config(text=f"Estratégia: {carteira_data['estrategia']}")
+        self.label_descricao_carteira.config(text=f"Descrição: {carteira_data['descricao']}")
+        
+        # Exibir cada ativo (as linhas são reaproveitadas entre carteiras)
+        for linha, ativo in zip(self.pool_ativos.exibir(len(carteira_data['ativos'])), carteira_data['ativos']):
+            linha.exibir(ativo)
+        
+        self.label_aporte.config(text=f"• Aporte Mensal Sugerido: {carteira_data['aporte_mensal']}")
+        self.label_tempo_renda.config(text=f"• Tempo para Gerar Renda: {carteira_data['tempo_para_renda']}")
+
+        # Mensagem final maior, centralizada e com quebra automática — dentro do scroll para continuidade
+        mensagem_final = (
+            "Resumo e próximos passos:\n\n"
+            f"Esta carteira foi sugerida com base no seu perfil '{self.perfil_detectado}', na sua idade ({self.idade_usuario} anos) e no objetivo escolhido. "
+            "Considere começar com aportes regulares, manter uma reserva de emergência e rebalancear conforme volatilidade do mercado.\n\n"
+            "Atenção: a diversificação não elimina riscos. As alocações apresentadas são apenas exemplos educacionais e não constituem consultoria financeira personalizada. "
+            "Para ajustar com precisão sua carteira, procure um profissional certificado (CFP) e valide produtos como CDBs, LCIs/LCAs, Tesouro Direto e Fundos Imobiliários antes de investir."
+        )
+
+        self.text_final.config(state='normal')
+        self.text_final.delete('1.0', 'end')
+        self.text_final.insert('1.0', mensagem_final)
+        self.text_final.tag_add('center', '1.0', 'end')
+        self.text_final.config(state='disabled')
+
+        self.canvas_ativos.yview_moveto(0) # Volta ao topo da lista
+        self._ir_para(Etapa.CARTEIRA)
+
+    def _montar_carteira(self):
+        """Cria a tela da carteira; mostrar_carteira_recomendada preenche os textos e os ativos."""
+        self.frame_carteira = ttk.Frame(self.master, padding="20")
+        
+        # Título
+        ttk.Label(self.frame_carteira, text="📊 SUA CARTEIRA RECOMENDADA 📊", font=('Arial', 18, 'bold')).pack(pady=10)
+        ttk.Separator(self.frame_carteira, orient='horizontal').pack(fill='x', pady=5)
+        
+        self.label_info = ttk.Label(self.frame_carteira, font=('Arial', 11), foreground='cyan')
+        self.label_info.pack(pady=5)
+        
+        self.label_titulo_idade = ttk.Label(self.frame_carteira, font=('Arial', 12, 'bold'), foreground='yellow')
+        self.label_titulo_idade.pack(pady=8)
+        self.label_recomendacao_idade = ttk.Label(self.frame_carteira, wraplength=650, justify='left', font=('Arial', 10))
+        self.label_recomendacao_idade.pack(pady=5)
+        
+        ttk.Separator(self.frame_carteira, orient='horizontal').pack(fill='x', pady=10)
+        
+        self.label_estrategia = ttk.Label(self.frame_carteira, font=('Arial', 11, 'bold'), foreground='lightgreen')
+        self.label_estrategia.pack(pady=5)
+        self.label_descricao_carteira = ttk.Label(self.frame_carteira, wraplength=650, justify='left', font=('Arial', 10))
+        self.label_descricao_carteira.pack(pady=5)
         
         # Frame com scroll para os ativos
-        frame_scroll = ttk.Frame(frame_carteira)
+        frame_scroll = ttk.Frame(self.frame_carteira)
         frame_scroll.pack(fill='both', expand=True, pady=10)
         
         canvas = tk.Canvas(frame_scroll, bg='#00145f', highlightthickness=0)
@@ -513,18 +430,10 @@ class TesteInvestidorApp:
         
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
+        self.canvas_ativos = canvas
         
-        # Exibir cada ativo
         ttk.Label(scrollable_frame, text="ALOCAÇÃO DE ATIVOS:", font=('Arial', 12, 'bold')).pack(pady=5)
         
-        for ativo in carteira_data['ativos']:
-            frame_ativo = ttk.Frame(scrollable_frame)
-            frame_ativo.pack(fill='x', padx=10, pady=8)
-            
-            ttk.Label(frame_ativo, text=f"• {ativo.nome}", font=('Arial', 11, 'bold'), foreground='lightblue').pack(anchor='w')
-            ttk.Label(frame_ativo, text=f"  Classe: {ativo.classe} | Alocação: {ativo.percentual}%", font=('Arial', 9)).pack(anchor='w', padx=15)
-            ttk.Label(frame_ativo, text=f"  Rentabilidade Est.: {ativo.rentabilidade_estimada} | Risco: {ativo.risco}", font=('Arial', 9), foreground='lightyellow').pack(anchor='w', padx=15)
-        
         canvas.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
 
@@ -537,35 +446,29 @@ class TesteInvestidorApp:
         canvas.bind("<Leave>", lambda e: canvas.unbind_all("<MouseWheel>"))
 
         # Recomendações Finais (movidas para dentro do scrollable_frame para poder rolar com o mouse)
-        ttk.Separator(scrollable_frame, orient='horizontal').pack(fill='x', pady=10)
+        separador = ttk.Separator(scrollable_frame, orient='horizontal')
+        separador.pack(fill='x', pady=10)
+        # Linhas dos ativos, sempre entre o título da alocação e o separador
+        self.pool_ativos = PoolWidgets(lambda: LinhaAtivo(scrollable_frame), lambda linha: linha.pack(fill='x', padx=10, pady=8, before=separador))
         
         ttk.Label(scrollable_frame, text="📌 RECOMENDAÇÕES FINAIS:", font=('Arial', 12, 'bold'), foreground='gold').pack(anchor='w', padx=10)
-        ttk.Label(scrollable_frame, text=f"• Aporte Mensal Sugerido: {carteira_data['aporte_mensal']}", font=('Arial', 10)).pack(anchor='w', padx=20, pady=2)
-        ttk.Label(scrollable_frame, text=f"• Tempo para Gerar Renda: {carteira_data['tempo_para_renda']}", font=('Arial', 10)).pack(anchor='w', padx=20, pady=2)
+        self.label_aporte = ttk.Label(scrollable_frame, font=('Arial', 10))
+        self.label_aporte.pack(anchor='w', padx=20, pady=2)
+        self.label_tempo_renda = ttk.Label(scrollable_frame, font=('Arial', 10))
+        self.label_tempo_renda.pack(anchor='w', padx=20, pady=2)
         ttk.Label(scrollable_frame, text="• Rebalanceie a carteira a cada 6-12 meses", font=('Arial', 10)).pack(anchor='w', padx=20, pady=2)
         ttk.Label(scrollable_frame, text="• Considere consultar um gestor patrimonial certificado (CFP)", font=('Arial', 10)).pack(anchor='w', padx=20, pady=2)
 
-        # Mensagem final maior, centralizada e com quebra automática — dentro do scroll para continuidade
-        mensagem_final = (
-            "Resumo e próximos passos:\n\n"
-            f"Esta carteira foi sugerida com base no seu perfil '{self.perfil_detectado}', na sua idade ({self.idade_usuario} anos) e no objetivo escolhido. "
-            "Considere começar com aportes regulares, manter uma reserva de emergência e rebalancear conforme volatilidade do mercado.\n\n"
-            "Atenção: a diversificação não elimina riscos. As alocações apresentadas são apenas exemplos educacionais e não constituem consultoria financeira personalizada. "
-            "Para ajustar com precisão sua carteira, procure um profissional certificado (CFP) e valide produtos como CDBs, LCIs/LCAs, Tesouro Direto e Fundos Imobiliários antes de investir."
-        )
-
-        text_final = tk.Text(scrollable_frame, height=8, wrap='word', bg='#00145f', fg='white', bd=0, highlightthickness=0, font=('Arial', 11))
-        text_final.tag_configure('center', justify='center')
-        text_final.insert('1.0', mensagem_final)
-        text_final.tag_add('center', '1.0', 'end')
-        text_final.config(state='disabled')
-        text_final.pack(fill='x', padx=10, pady=12)
+        self.text_final = tk.Text(scrollable_frame, height=8, wrap='word', bg='#00145f', fg='white', bd=0, highlightthickness=0, font=('Arial', 11))
+        self.text_final.tag_configure('center', justify='center')
+        self.text_final.pack(fill='x', padx=10, pady=12)
 
         # Botões finais
-        frame_botoes = ttk.Frame(frame_carteira)
+        frame_botoes = ttk.Frame(self.frame_carteira)
         frame_botoes.pack(fill='x', pady=15)
         
-        ttk.Button(frame_botoes, text="🔄 Refazer Teste", command=self.reiniciar_app).pack(side='left', padx=5)
+        self.btn_refazer = ttk.Button(frame_botoes, text="🔄 Refazer Teste", command=self.reiniciar_app)
+        self.btn_refazer.pack(side='left', padx=5)
         ttk.Button(frame_botoes, text="❌ Sair", command=self.master.quit).pack(side='left', padx=5)
     
     def _get_faixa_idade(self, idade):
@@ -582,13 +485,41 @@ class TesteInvestidorApp:
             return "60+"
     
     def reiniciar_app(self):
-        """Reinicia a aplicação"""
-        self.master.destroy()
-        root = tk.Tk()
-        app = TesteInvestidorApp(root)
-        root.mainloop()
+        """Reinicia o teste na mesma janela: zera a sessão e volta à primeira pergunta.
+
+        Nada é recriado (nem a janela nem um novo mainloop): as telas já montadas
+        são reaproveitadas na próxima sessão.
+        """
+        self._iniciar_sessao()
+        self.pbar.config(maximum=len(self.questions))
+        self.master.unbind_all("<MouseWheel>") # O <Leave> do canvas pode não chegar com a tela escondida
+        self._ir_para(Etapa.QUIZ)
+        self.carregar_pergunta()
+
+def main_lote(argv):
+    """Classificação em massa sem interface: python main.py --lote [arquivo] > saida"""
+    import argparse
+    import sys
+    from lote import TAMANHO_BLOCO, run_lote
+
+    parser = argparse.ArgumentParser(description="Classifica respostas exportadas (CSV ou JSONL), uma linha por cliente.")
+    parser.add_argument("--lote", action="store_true", help="modo sem interface (lê da entrada padrão ou de um arquivo)")
+    parser.add_argument("arquivo", nargs="?", default="-", help="arquivo de entrada ('-' para a entrada padrão)")
+    parser.add_argument("--formato", choices=("csv", "jsonl"), default=None, help="formato da entrada (padrão: pela extensão ou pela primeira linha)")
+    parser.add_argument("--workers", type=int, default=None, help="número de processos (padrão: CPUs)")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO, help="linhas por bloco")
+    args = parser.parse_args(argv)
+    if args.arquivo == "-":
+        run_lote(sys.stdin, sys.stdout, args.formato, args.workers, args.tamanho_bloco)
+    else:
+        with open(args.arquivo, encoding="utf-8", newline="") as entrada:
+            run_lote(entrada, sys.stdout, args.formato, args.workers, args.tamanho_bloco, nome_arquivo=args.arquivo)
+    return 0
 
 if __name__ == "__main__":
+    import sys
+    if "--lote" in sys.argv[1:]:
+        sys.exit(main_lote(sys.argv[1:]))
     root = tk.Tk()
     app = TesteInvestidorApp(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""Pontuação do teste de perfil, sem interface.
+
+Reproduz as regras de TesteInvestidorApp.proxima_pergunta e finalizar_teste:
+a soma das duas perguntas de PERGUNTAS_BASE escolhe o perfil provisório e,
+com ele, as duas perguntas seguintes (PERGUNTAS_CONSERVADOR, _MODERADO ou
+_AGRESSIVO); a pontuação total das quatro respostas é comparada com os
+max_score de PERFIS para chegar ao perfil final.
+
+As respostas são os índices das opções escolhidas (0 = primeira opção), na
+ordem em que as perguntas aparecem. O questionário é uma árvore pequena:
+compilar_tabela percorre todos os caminhos uma vez e classificar passa a ser
+uma consulta à tabela (TabelaDecisao). As perguntas, os pontos e os limites
+são observados (questionario.observar): alterá-los no lugar faz a próxima
+consulta recompilar a tabela. Só a troca de um nome do módulo por outro
+objeto (PERGUNTAS_BASE = [...]) passa despercebida; nesse caso, chame
+recompilar(). Para classificar muitos clientes de uma vez, veja
+pontuacao_vetorizada.classificar_lote.
+"""
+
+from dataclasses import dataclass
+from itertools import product
+from math import prod
+from typing import Tuple
+
+import questionario
+from questionario import PERFIS, PERGUNTAS_AGRESSIVO, PERGUNTAS_BASE, PERGUNTAS_CONSERVADOR, PERGUNTAS_MODERADO
+
+# Perfil provisório -> perguntas adicionais (após as duas primeiras)
+PERGUNTAS_POR_PERFIL = questionario.observar({
+    "CONSERVADOR": PERGUNTAS_CONSERVADOR,
+    "MODERADO": PERGUNTAS_MODERADO,
+    "AGRESSIVO": PERGUNTAS_AGRESSIVO,
+})
+# Maior soma das duas primeiras respostas em cada perfil provisório: 2/4 -> conservador, 6/8 -> moderado, 10 -> agressivo
+LIMITES_PROVISORIOS = questionario.observar({"CONSERVADOR": 4, "MODERADO": 8})
+
+
+@dataclass(frozen=True)
+class Classificacao:
+    perfil_provisorio: str
+    perfil: str
+    pontuacao: int
+    pontuacoes: Tuple[int, ...]  # Pontos de cada resposta
+
+
+def perfil_provisorio(soma_duas_primeiras):
+    """Perfil provisório a partir da soma das duas primeiras respostas."""
+    for perfil, limite in LIMITES_PROVISORIOS.items():
+        if soma_duas_primeiras <= limite:
+            return perfil
+    return "AGRESSIVO"
+
+
+def perguntas_adicionais(perfil):
+    """Perguntas feitas depois das duas primeiras para o perfil provisório."""
+    return PERGUNTAS_POR_PERFIL[perfil]
+
+
+def perfil_final(pontuacao_total):
+    """Perfil pela pontuação total: o primeiro de PERFIS cujo max_score a comporta."""
+    for perfil, dados in PERFIS.items():
+        if pontuacao_total <= dados["max_score"]:
+            return perfil
+    return "AGRESSIVO"  # Como no teste: acima de todos os limites continua agressivo
+
+
+def perguntas_do_teste(respostas_base):
+    """Lista completa de perguntas para quem deu essas duas primeiras respostas."""
+    soma = sum(_pontos(PERGUNTAS_BASE, posicao, resposta) for posicao, resposta in enumerate(respostas_base))
+    return list(PERGUNTAS_BASE) + list(perguntas_adicionais(perfil_provisorio(soma)))
+
+
+def aplicar_regras(respostas):
+    """Classifica seguindo as regras passo a passo, como o teste na tela (usado para montar a tabela)."""
+    respostas = tuple(respostas)
+    base = len(PERGUNTAS_BASE)
+    pontuacoes = [_pontos(PERGUNTAS_BASE, posicao, resposta) for posicao, resposta in enumerate(respostas[:base])]
+    if len(pontuacoes) < base:
+        raise ValueError(f"esperadas {base} respostas iniciais, recebidas {len(respostas)}")
+    provisorio = perfil_provisorio(sum(pontuacoes))
+    adicionais = perguntas_adicionais(provisorio)
+    if len(respostas) != base + len(adicionais):
+        raise ValueError(f"esperadas {base + len(adicionais)} respostas, recebidas {len(respostas)}")
+    pontuacoes += [_pontos(adicionais, posicao, resposta) for posicao, resposta in enumerate(respostas[base:])]
+    total = sum(pontuacoes)
+    return Classificacao(provisorio, perfil_final(total), total, tuple(pontuacoes))
+
+
+def classificar(respostas):
+    """Classifica um cliente pelas quatro respostas (índices das opções): uma consulta à tabela de decisão."""
+    tabela = _tabela if _versao == questionario.versao else recompilar()
+    return tabela.consultar(respostas)
+
+
+class TabelaDecisao:
+    """Todos os caminhos do questionário, compilados em uma lista indexada pelas respostas.
+
+    As respostas (r0, r1, r2, r3) viram um único índice em base mista,
+    r0 * passos[0] + r1 * passos[1] + ..., em que larguras[i] é o maior número
+    de opções da pergunta i entre os ramos. Cada posição guarda a Classificacao
+    do caminho, ou None se alguma resposta não existir na pergunta recebida.
+    O índice serve ao modo em lote (pontuacao_vetorizada), que o calcula para
+    todos os clientes de uma vez com um produto de matrizes. A consulta de um
+    cliente não usa o índice: usa caminhos, as mesmas entradas indexadas pela
+    tupla de respostas, porque em Python uma busca no dicionário sai mais
+    barata do que a soma r0 * passos[0] + ... seguida do acesso à lista.
+    """
+
+    def __init__(self, larguras, entradas, caminhos):
+        self.larguras = larguras
+        self.passos = tuple(_passos(larguras))
+        self.entradas = entradas
+        self.caminhos = caminhos  # Tupla de respostas -> Classificacao
+
+    def indice(self, respostas):
+        """Posição das respostas na tabela, ou None se alguma estiver fora das larguras (ValueError se o número de respostas não bater)."""
+        if len(respostas) != len(self.larguras):
+            raise ValueError(f"esperadas {len(self.larguras)} respostas, recebidas {len(respostas)}")
+        indice = 0
+        for resposta, largura, passo in zip(respostas, self.larguras, self.passos):
+            if not 0 <= resposta < largura:
+                return None
+            indice += resposta * passo
+        return indice
+
+    def consultar(self, respostas):
+        entrada = self.caminhos.get(tuple(respostas))
+        if entrada is None:
+            return aplicar_regras(respostas)  # Levanta o erro com a pergunta e a opção inválidas
+        return entrada
+
+    def __len__(self):
+        return len(self.caminhos)
+
+
+def compilar_tabela():
+    """Percorre todos os caminhos de resposta a partir das tabelas de perguntas."""
+    ramos = [perguntas_adicionais(perfil) for perfil in PERGUNTAS_POR_PERFIL]
+    if len({len(perguntas) for perguntas in ramos}) != 1:
+        raise ValueError("os perfis provisórios precisam ter o mesmo número de perguntas adicionais")
+    larguras = tuple(len(opcoes) for _, opcoes in PERGUNTAS_BASE) + tuple(
+        max(len(perguntas[posicao][1]) for perguntas in ramos) for posicao in range(len(ramos[0])))
+    entradas = [None] * prod(larguras)
+    caminhos = {}
+    tabela = TabelaDecisao(larguras, entradas, caminhos)
+    for respostas_base in product(*(range(len(opcoes)) for _, opcoes in PERGUNTAS_BASE)):
+        adicionais = perguntas_do_teste(respostas_base)[len(PERGUNTAS_BASE):]
+        for respostas_ramo in product(*(range(len(opcoes)) for _, opcoes in adicionais)):
+            respostas = respostas_base + respostas_ramo
+            entradas[tabela.indice(respostas)] = caminhos[respostas] = aplicar_regras(respostas)
+    return tabela
+
+
+def tabela_decisao():
+    """Tabela atual (compilada no primeiro uso e de novo quando os dados observados mudam)."""
+    return _tabela if _versao == questionario.versao else recompilar()
+
+
+def recompilar():
+    """Compila a tabela de novo (necessário só quando um nome do módulo é trocado por outro objeto)."""
+    global _tabela, _versao
+    versao = questionario.versao  # Lida antes: uma alteração durante a compilação força outra
+    _tabela = compilar_tabela()
+    _versao = versao
+    return _tabela
+
+
+_tabela = None
+_versao = None  # questionario.versao quando _tabela foi compilada
+
+
+def _passos(larguras):
+    """Passo de cada posição no índice em base mista (a última varia mais rápido)."""
+    passos = [1] * len(larguras)
+    for posicao in range(len(larguras) - 2, -1, -1):
+        passos[posicao] = passos[posicao + 1] * larguras[posicao + 1]
+    return passos
+
+
+def _pontos(perguntas, posicao, resposta):
+    opcoes = perguntas[posicao][1]
+    if not 0 <= resposta < len(opcoes):
+        raise ValueError(f"resposta {resposta} fora das {len(opcoes)} opções da pergunta {perguntas[posicao][0]!r}")
+    return opcoes[resposta][1]
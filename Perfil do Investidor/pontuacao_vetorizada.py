@@ -0,0 +1,72 @@
+"""Classificação em lote com NumPy, para reclassificar milhões de clientes.
+
+Mesmas regras de pontuacao.classificar, aplicadas a uma matriz de respostas
+(uma linha por cliente, uma coluna por pergunta, com os índices das opções)
+em uma única passada vetorizada: cada linha vira o índice do seu caminho na
+tabela de decisão (pontuacao.tabela_decisao) e os resultados saem de três
+arrays montados a partir dela, recriados quando a tabela é recompilada.
+"""
+
+from typing import NamedTuple
+
+import numpy as np  # Dependência opcional: só a classificação em lote precisa dela
+
+from pontuacao import tabela_decisao
+from questionario import PERFIS
+
+PERFIS_NOMES = tuple(PERFIS)  # Código (posição) -> nome do perfil, nos arrays de resultado
+SEM_CAMINHO = -1  # Pontuação das posições da tabela que não correspondem a um caminho
+
+
+class Lote(NamedTuple):
+    """Resultado de classificar_lote: códigos de perfil (índices de PERFIS_NOMES) e pontos."""
+    perfil_provisorio: np.ndarray
+    perfil: np.ndarray
+    pontuacao: np.ndarray
+
+
+_arrays = (None, None)  # (tabela de decisão, arrays montados a partir dela)
+
+
+def _tabelas():
+    """Larguras, passos e resultados por posição da tabela de decisão atual."""
+    global _arrays
+    tabela = tabela_decisao()
+    if _arrays[0] is not tabela:
+        codigos = {perfil: codigo for codigo, perfil in enumerate(PERFIS_NOMES)}
+        provisorio = np.zeros(len(tabela.entradas), dtype=np.uint8)
+        perfil = np.zeros(len(tabela.entradas), dtype=np.uint8)
+        pontuacao = np.full(len(tabela.entradas), SEM_CAMINHO, dtype=np.int16)
+        for indice, entrada in enumerate(tabela.entradas):
+            if entrada is not None:
+                provisorio[indice] = codigos[entrada.perfil_provisorio]
+                perfil[indice] = codigos[entrada.perfil]
+                pontuacao[indice] = entrada.pontuacao
+        _arrays = (tabela, (np.array(tabela.larguras), np.array(tabela.passos, dtype=np.intp), provisorio, perfil, pontuacao))
+    return _arrays[1]
+
+
+def classificar_lote(respostas):
+    """Classifica uma matriz (clientes x perguntas) de índices de opções.
+
+    Levanta ValueError se alguma resposta não existir na pergunta que o
+    cliente recebeu (ex.: opção 2 na segunda pergunta do ramo moderado).
+    """
+    larguras, passos, provisorio, perfil, pontuacao = _tabelas()
+    respostas = np.asarray(respostas)
+    if respostas.ndim != 2 or respostas.shape[1] != len(larguras):
+        raise ValueError(f"esperada uma matriz com {len(larguras)} colunas, recebido formato {respostas.shape}")
+    fora = ((respostas < 0) | (respostas >= larguras)).any(axis=1)
+    indices = respostas @ passos  # Posição de cada caminho na tabela (base mista)
+    indices[fora] = 0  # Consulta válida; a linha é rejeitada abaixo
+    pontos = pontuacao[indices]
+    invalidas = fora | (pontos == SEM_CAMINHO)
+    if invalidas.any():
+        linha = int(np.flatnonzero(invalidas)[0])
+        raise ValueError(f"resposta fora das opções na linha {linha}: {respostas[linha].tolist()}")
+    return Lote(provisorio[indices], perfil[indices], pontos)
+
+
+def nomes(codigos):
+    """Códigos de perfil -> array com os nomes (CONSERVADOR, MODERADO, AGRESSIVO)."""
+    return np.asarray(PERFIS_NOMES)[codigos]
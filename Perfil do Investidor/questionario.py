@@ -0,0 +1,263 @@
+"""Dados do questionário: perguntas, perfis, carteiras e recomendações por idade.
+
+Separados da interface (main.py) para que a pontuação (pontuacao.py) e o modo
+em lote rodem sem Tkinter. As perguntas e os perfis são listas e dicionários
+observados: qualquer alteração neles (pontos, opções, max_score) incrementa
+`versao`, e a pontuação recompila a tabela de decisão ao notar a mudança.
+"""
+
+from dataclasses import dataclass
+
+versao = 0  # Alterações feitas nos dados observados desde a importação
+
+
+def observar(valor):
+    """Cópia de listas e dicionários (também os aninhados) que conta as próprias alterações em `versao`."""
+    if type(valor) is list:
+        return _ListaObservada(observar(item) for item in valor)
+    if type(valor) is dict:
+        return _DicionarioObservado((chave, observar(item)) for chave, item in valor.items())
+    return valor  # Tuplas, textos e números não mudam; listas e dicionários já observados continuam os mesmos
+
+
+def _alteracao(metodo):
+    """Versão do método que observa os valores recebidos e incrementa `versao`."""
+    def alterar(self, *args, **kwargs):
+        global versao
+        resultado = metodo(self, *map(observar, args), **{nome: observar(valor) for nome, valor in kwargs.items()})
+        versao += 1
+        return resultado
+    return alterar
+
+
+class _ListaObservada(list):
+    pass
+
+
+class _DicionarioObservado(dict):
+    pass
+
+
+for _nome in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend", "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(_ListaObservada, _nome, _alteracao(getattr(list, _nome)))
+for _nome in ("__setitem__", "__delitem__", "__ior__", "clear", "pop", "popitem", "setdefault", "update"):
+    setattr(_DicionarioObservado, _nome, _alteracao(getattr(dict, _nome)))
+
+# --- Configuração das Perguntas e Pontuações ---
+# Estrutura: [Pergunta, [[Resposta A, Pontos], [Resposta B, Pontos], ...]]
+PERGUNTAS_BASE = [
+    [
+        "Qual é o seu nível de conhecimento e experiência em investimentos?",
+        [
+            ("Iniciante, com pouco ou nenhum conhecimento.", 1),
+            ("Intermediário, com algum conhecimento e experiência.", 3),
+            ("Avançado, com conhecimento profundo e experiência substancial.", 5)
+        ]
+    ],
+    [
+        "Como você reagiria a uma queda repentina no valor dos seus investimentos?",
+        [
+            ("Ficaria preocupado e consideraria vender para evitar maiores perdas.", 1),
+            ("Monitoraria a situação, mas manteria meus investimenos a longo prazo.", 3),
+            ("Aproveitaria a oportunidade para comprar mais, acreditando em uma recuperação futura", 5)
+        ]
+    ]
+]
+
+# Perguntas adicionais para cada perfil provisório (após as duas primeiras)
+PERGUNTAS_CONSERVADOR = [
+    [
+        "Como os valores investidos vão te ajudar no seu momento de vida?",
+        [
+            ("Preservação de patrimônio.", 1),
+            ("Combinação entre preservar e valorizar patrimônio, com certo risco.", 3),
+            ("Aumentar patrimônio, assumindo risco", 5)
+        ]
+    ],
+    [
+        "Onde está seu maior volume de investimento?",
+        [
+            ("Conta corrente com investimentos automáticos e Poupança", 1),
+            ("Tesouro Direto", 3),
+            ("Diversificado, com foco em renda fixa", 5)
+        ]
+    ]
+]
+
+PERGUNTAS_MODERADO = [
+    [
+        "Onde está seu maior volume de investimento?",
+        [
+            ("FIIs", 1),
+            ("Diversificado", 3),
+            ("Ações", 5)
+        ]
+    ],
+    [
+        "A quanto tempo você investe no mercado de ações?",
+        [
+            ("Menos de 1 ano", 1),
+            ("Mais de 1 ano", 5)
+        ]
+    ]
+]
+
+# Para perfil agressivo, manter um conjunto com as perguntas originais/mais aprofundadas
+PERGUNTAS_AGRESSIVO = [
+    [
+        "Como os valores investidos vão te ajudar no seu momento de vida?",
+        [
+            ("Preservação de patrimônio.", 1),
+            ("Combinação entre preservar e valorizar patrimônio, com certo risco.", 3),
+            ("Aumentar patrimônio, assumindo risco", 5)
+        ]
+    ],
+    [
+        "O que você busca dentro dos seus investimentos?",
+        [
+            ("Oportunidade de mercado com ganhos imediatos", 1),
+            ("Razoável. Conheço CDBs, LCIs, Fundos de Investimento.", 3),
+            ("Avançado. Já investi em Ações, Fundos Imobiliários e Derivativos.", 5)
+        ]
+    ]
+]
+
+# Definição dos perfis baseada na pontuação total
+# Máximo de pontos: 4 perguntas * 5 pontos = 20
+# Mínimo de pontos: 4 perguntas * 1 ponto = 4
+PERFIS = {
+    "CONSERVADOR": {"max_score": 10, "descricao": "Busca segurança e previsibilidade, preferindo produtos de baixo risco."},
+    "MODERADO": {"max_score": 15, "descricao": "Tolera um risco moderado em busca de retornos um pouco maiores."},
+    "AGRESSIVO": {"max_score": 20, "descricao": "Busca altos retornos, aceitando alta volatilidade e risco em Renda Variável."}
+}
+
+# --- Definição de Carteiras por Perfil e Objetivo ---
+@dataclass
+class Ativo:
+    nome: str
+    classe: str
+    percentual: int
+    rentabilidade_estimada: str
+    risco: str
+    
+CARTEIRAS = {
+    "CONSERVADOR": {
+        "objetivo_renda_mensal": {
+            "descricao": "Carteira focada em renda mensal com baixo risco",
+            "estrategia": "Maximizar fluxo de caixa mensal com segurança",
+            "ativos": [
+                Ativo("Tesouro IPCA+ 2035", "Renda Fixa", 25, "IPCA + 4-5% a.a.", "Muito Baixo"),
+                Ativo("CDB Liquidez Diária (Banco Top 5)", "Renda Fixa", 20, "105-110% CDI", "Muito Baixo"),
+                Ativo("LCI/LCA Operacional", "Renda Fixa", 20, "80-95% CDI", "Muito Baixo"),
+                Ativo("Fundo Imobiliário com Distribuição", "Renda Variável", 20, "4-8% a.a.", "Médio"),
+                Ativo("FIC Renda Fixa Curta Duração", "Renda Fixa", 15, "95-105% CDI", "Muito Baixo"),
+            ],
+            "aporte_mensal": "R$ 500 - R$ 2.000",
+            "tempo_para_renda": "3-6 meses"
+        },
+        "objetivo_seguranca": {
+            "descricao": "Carteira 100% Renda Fixa - Máxima Segurança",
+            "estrategia": "Preservar capital com retorno previsível",
+            "ativos": [
+                Ativo("Tesouro Selic", "Renda Fixa", 30, "Selic - 0.5% a.a.", "Nenhum"),
+                Ativo("CDB Liquidez Diária", "Renda Fixa", 35, "105-115% CDI", "Muito Baixo"),
+                Ativo("LCI/LCA com Garantia FGC", "Renda Fixa", 25, "85-100% CDI", "Muito Baixo"),
+                Ativo("Poupança (Manutenção)", "Renda Fixa", 10, "SELIC/2 + extra", "Nenhum"),
+            ],
+            "aporte_mensal": "R$ 1.000 - R$ 5.000",
+            "tempo_para_renda": "Imediato"
+        }
+    },
+    "MODERADO": {
+        "objetivo_renda_mensal": {
+            "descricao": "Carteira balanceada para renda com crescimento moderado",
+            "estrategia": "Combinar renda fixa com fundos imobiliários e ações selecionadas",
+            "ativos": [
+                Ativo("Tesouro IPCA+ 2035", "Renda Fixa", 20, "IPCA + 4-5% a.a.", "Baixo"),
+                Ativo("CDB Progressivo", "Renda Fixa", 15, "110-120% CDI", "Muito Baixo"),
+                Ativo("Fundo Imobiliário Diversificado", "Renda Variável", 25, "5-10% a.a.", "Médio"),
+                Ativo("Ações Dividend Yield (Top 50)", "Renda Variável", 25, "8-12% a.a.", "Médio"),
+                Ativo("Fundo de Renda Fixa Balanceado", "Renda Fixa", 15, "100-110% CDI", "Baixo"),
+            ],
+            "aporte_mensal": "R$ 1.000 - R$ 3.000",
+            "tempo_para_renda": "2-4 meses"
+        },
+        "objetivo_crescimento": {
+            "descricao": "Carteira balanceada para crescimento patrimonial",
+            "estrategia": "60/40 Renda Fixa vs Renda Variável",
+            "ativos": [
+                Ativo("Tesouro IPCA+ 2035-2045", "Renda Fixa", 25, "IPCA + 4-5% a.a.", "Baixo"),
+                Ativo("CDB com Indexação", "Renda Fixa", 20, "115% CDI", "Muito Baixo"),
+                Ativo("ETF IBOVESPA (BOVA11)", "Renda Variável", 35, "8-15% a.a.", "Médio-Alto"),
+                Ativo("Ações com Dividendos", "Renda Variável", 15, "12-18% a.a.", "Médio-Alto"),
+                Ativo("Fundo Imobiliário", "Renda Variável", 5, "6-10% a.a.", "Médio"),
+            ],
+            "aporte_mensal": "R$ 2.000 - R$ 5.000",
+            "tempo_para_renda": "Longo prazo (5+ anos)"
+        }
+    },
+    "AGRESSIVO": {
+        "objetivo_crescimento_maximo": {
+            "descricao": "Carteira agressiva focada em crescimento máximo",
+            "estrategia": "70-80% Renda Variável com ênfase em crescimento",
+            "ativos": [
+                Ativo("ETF IBOVESPA (BOVA11)", "Renda Variável", 30, "10-18% a.a.", "Alto"),
+                Ativo("Ações de Crescimento", "Renda Variável", 25, "15-30% a.a.", "Muito Alto"),
+                Ativo("ETF Small Caps", "Renda Variável", 15, "15-25% a.a.", "Muito Alto"),
+                Ativo("Tesouro IPCA+ Longo Prazo", "Renda Fixa", 20, "IPCA + 5-6% a.a.", "Baixo"),
+                Ativo("Fundo de Ações Multiestrátégia", "Renda Variável", 10, "20-35% a.a.", "Muito Alto"),
+            ],
+            "aporte_mensal": "R$ 2.000 - R$ 10.000",
+            "tempo_para_renda": "Muito Longo Prazo (7-10 anos)"
+        },
+        "objetivo_especulacao": {
+            "descricao": "Carteira ultra-agressiva para perfis muito ousados",
+            "estrategia": "Foco em crescimento máximo com derivativos",
+            "ativos": [
+                Ativo("Ações de Crescimento Agressivo", "Renda Variável", 40, "20-50% a.a.", "Muito Alto"),
+                Ativo("ETF Small Caps", "Renda Variável", 25, "18-35% a.a.", "Muito Alto"),
+                Ativo("Opções e Mini Índices", "Derivativos", 20, "30-100%+ a.a.", "Crítico"),
+                Ativo("Fundo de Investimento em Ações", "Renda Variável", 10, "15-25% a.a.", "Muito Alto"),
+                Ativo("Reserva em CDB", "Renda Fixa", 5, "105% CDI", "Muito Baixo"),
+            ],
+            "aporte_mensal": "R$ 3.000 - R$ 15.000",
+            "tempo_para_renda": "Médio Prazo com alto risco"
+        }
+    }
+}
+
+# Recomendações por faixa etária
+RECOMENDACOES_IDADE = {
+    "20-30": {
+        "titulo": "20-30 anos - Tempo é seu maior ativo",
+        "recomendacao": "Invista agressivamente em ações e crescimento. O tempo permite recuperação de crises.",
+        "perfil_sugerido": "AGRESSIVO"
+    },
+    "31-40": {
+        "titulo": "31-40 anos - Equilíbrio entre Risco e Segurança",
+        "recomendacao": "Considere perfil MODERADO a AGRESSIVO. Comece a construir base de renda fixa.",
+        "perfil_sugerido": "MODERADO"
+    },
+    "41-50": {
+        "titulo": "41-50 anos - Foco em Renda e Preservação",
+        "recomendacao": "Perfil MODERADO é ideal. Aumente ponderação em renda fixa e fundos imobiliários.",
+        "perfil_sugerido": "MODERADO"
+    },
+    "51-60": {
+        "titulo": "51-60 anos - Segurança com Rentabilidade",
+        "recomendacao": "Perfil CONSERVADOR com até 30% em Renda Variável. Foco em renda mensal.",
+        "perfil_sugerido": "CONSERVADOR"
+    },
+    "60+": {
+        "titulo": "60+ anos - Preservação e Renda",
+        "recomendacao": "Perfil CONSERVADOR. 90-100% em Renda Fixa. Gere fluxo de caixa mensal.",
+        "perfil_sugerido": "CONSERVADOR"
+    }
+}
+
+# Dados usados pela pontuação: alterações neles invalidam a tabela de decisão
+PERGUNTAS_BASE = observar(PERGUNTAS_BASE)
+PERGUNTAS_CONSERVADOR = observar(PERGUNTAS_CONSERVADOR)
+PERGUNTAS_MODERADO = observar(PERGUNTAS_MODERADO)
+PERGUNTAS_AGRESSIVO = observar(PERGUNTAS_AGRESSIVO)
+PERFIS = observar(PERFIS)